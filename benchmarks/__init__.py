@@ -0,0 +1,4 @@
+"""Performance benchmarks for the engine, data model and view layer.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,91 @@
+"""Runs the benchmark suites and optionally compares the results with a stored baseline."""
+import argparse
+import sys
+from collections.abc import Sequence
+
+from . import fake_blender
+
+SUITES = ('engine', 'datamodel', 'views')
+"""The names of the benchmark suites."""
+
+SIZES = (8, 32, 64, 128, 256)
+"""The default grid sides."""
+
+QUICK_SIZES = (8, 16)
+"""The grid sides for a quick run."""
+
+DENSITIES = (0.1, 0.3)
+"""The default initial densities."""
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Measure generations per second, step latency and peak memory.')
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help=f'the suites to run: {", ".join(SUITES)} (default: all)')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=None,
+                        help=f'the grid sides to run (default: {" ".join(map(str, SIZES))})')
+    parser.add_argument('-d', '--densities', type=float, nargs='+', default=DENSITIES,
+                        help='the initial densities to run (default: 0.1 0.3)')
+    parser.add_argument('-k', '--filter', default=None,
+                        help='only run cases whose key contains this text')
+    parser.add_argument('--quick', action='store_true',
+                        help=f'run small grids with few steps (sizes '
+                             f'{" ".join(map(str, QUICK_SIZES))})')
+    parser.add_argument('--steps', type=int, default=20,
+                        help='the most steps to time for each case (default: 20)')
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help='the most seconds to time each case for (default: 2)')
+    parser.add_argument('-o', '--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', default=None,
+                        help='compare the results with a JSON file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='the relative slowdown or memory growth that counts as a regression '
+                             '(default: 0.1)')
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f'unknown suite {suite!r} (choose from {", ".join(SUITES)})')
+
+    # The view layer keeps references to bpy.data, so the stand-ins must exist before it loads.
+    fake_blender.install()
+
+    from . import bench_datamodel, bench_engine, bench_views
+    from .harness import (compare, format_comparison, format_result, load, print_report,
+                          run_cases, save)
+
+    modules = {'engine': bench_engine, 'datamodel': bench_datamodel, 'views': bench_views}
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    steps, budget = (3, 0.2) if args.quick else (args.steps, args.budget)
+    cases = [
+        case
+        for suite in (args.suites or SUITES)
+        for case in modules[suite].cases(sizes, args.densities)
+        if args.filter is None or args.filter in case.key
+    ]
+
+    report = run_cases(cases, steps, budget, lambda result: print_report([format_result(result)]))
+
+    if args.output is not None:
+        save(report, args.output)
+
+    if args.compare is not None:
+        rows = compare(load(args.compare), report, args.threshold)
+        print_report(format_comparison(row) for row in rows)
+
+        if any(row['regressed'] for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Benchmarks for copying cell blocks and finding neighbors."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from conway3d.conway import ConwayCellState
+from conway3d.datamodel import (CellBlock, DenseCellBlock, PackedCellBlock, cubic_neighbor_model,
+                                simple_neighbor_model)
+from conway3d.engine import Boundary, NeighborTable, count_neighbors, digest_cells, neighbor_offsets
+
+from .bench_engine import GENERIC_LIMIT
+from .harness import Case
+
+BLOCKS = {'generic': CellBlock, 'dense': DenseCellBlock, 'packed': PackedCellBlock}
+"""The cell block types that are benchmarked."""
+
+MODELS = {'M': cubic_neighbor_model, 'N': simple_neighbor_model}
+"""The neighbor models that are benchmarked, by neighborhood code."""
+
+
+def make_block(block: str, size: int, density: float) -> CellBlock:
+    """Creates a cube cell block with random live cells."""
+    shape = (size, size, size)
+    alive = np.random.default_rng(1).random((size, size, size)) < density
+
+    if block == 'generic':
+        cells = CellBlock(shape)
+        states = (ConwayCellState.DEAD, ConwayCellState.ALIVE)
+        for (xyz, state) in zip(cells, alive.ravel().tolist()):
+            cells[xyz] = states[state]
+    elif block == 'packed':
+        cells = PackedCellBlock(shape, ConwayCellState)
+        cells.pack(alive)
+    else:
+        cells = DenseCellBlock(shape, ConwayCellState)
+        cells.array[...] = alive
+
+    return cells
+
+
+def copy_case(block: str, size: int, density: float) -> Case:
+    def setup():
+        return make_block(block, size, density).copy
+
+    return Case('datamodel', 'copy', {'block': block, 'size': size, 'density': density}, setup)
+
+
+def digest_case(block: str, size: int, density: float) -> Case:
+    def setup():
+        cells = make_block(block, size, density)
+        return lambda: digest_cells(cells)
+
+    return Case('datamodel', 'digest', {'block': block, 'size': size, 'density': density}, setup)
+
+
+def model_case(neighborhood: str, size: int) -> Case:
+    """Calls the neighbor model once for every cell of a block, as the per-cell driver does."""
+    def setup():
+        model = MODELS[neighborhood]
+        locations = list(CellBlock((size, size, size)))
+
+        def step():
+            for location in locations:
+                model(location)
+
+        return step
+
+    return Case('datamodel', 'neighbor_model', {'neighborhood': neighborhood, 'size': size}, setup)
+
+
+def table_case(neighborhood: str, size: int) -> Case:
+    def setup():
+        model = MODELS[neighborhood]
+        return lambda: NeighborTable.compile(model, (size, size, size), Boundary.FIXED)
+
+    return Case('datamodel', 'neighbor_table', {'neighborhood': neighborhood, 'size': size}, setup)
+
+
+def count_case(neighborhood: str, size: int, density: float) -> Case:
+    def setup():
+        occupied = np.random.default_rng(1).random((size, size, size)) < density
+        offsets = neighbor_offsets(MODELS[neighborhood])
+        return lambda: count_neighbors(occupied, offsets)
+
+    return Case('datamodel', 'count_neighbors', {
+        'neighborhood': neighborhood, 'size': size, 'density': density,
+    }, setup)
+
+
+def cases(sizes: Sequence[int], densities: Sequence[float]) -> Iterable[Case]:
+    for block in BLOCKS:
+        for size in sizes:
+            if block == 'generic' and size > GENERIC_LIMIT:
+                continue
+            yield copy_case(block, size, densities[0])
+            yield digest_case(block, size, densities[0])
+
+    for neighborhood in MODELS:
+        for size in sizes:
+            if size <= GENERIC_LIMIT:
+                yield model_case(neighborhood, size)
+            if size <= 64:
+                yield table_case(neighborhood, size)
+            for density in densities:
+                yield count_case(neighborhood, size, density)
@@ -0,0 +1,94 @@
+"""Benchmarks for stepping generations with each driver."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from conway3d.conway import (BasicConwayDriver, ConwayHashLife, ConwayRule, SparseConwayDriver,
+                            UncertainConwayDriver, cell_states)
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from conway3d.engine import Boundary
+
+from .harness import Case
+
+RULES = {'M': '4-6/6/2/M', 'N': '1-3/1-2/2/N'}
+"""A rule for each neighborhood, chosen so that random grids neither die out nor fill up at
+once."""
+
+DRIVERS = ('basic-dense', 'basic-packed', 'sparse', 'uncertain', 'generations', 'generic')
+"""The driver and cell block combinations that are benchmarked."""
+
+DECAY_STATES = 8
+"""The number of states of the rules run by the ``generations`` driver, whose cells decay through
+the states after ``ALIVE`` before they die."""
+
+GENERIC_LIMIT = 16
+"""The largest grid side that the per-cell ``CellBlock`` driver and HashLife, which gains nothing
+from random grids, are benchmarked on."""
+
+
+def make_driver(driver: str, size: int, density: float, neighborhood: str):
+    """Creates and populates a driver for a cube grid."""
+    shape = (size, size, size)
+    rule = ConwayRule.parse(RULES[neighborhood])
+    if driver == 'generations':
+        rule = ConwayRule(rule.survive, rule.birth, DECAY_STATES, rule.neighborhood)
+    options = dict(probability=density, rule=rule, seed=1)
+
+    if driver == 'generic':
+        cells = CellBlock(shape)
+    elif driver == 'basic-packed':
+        cells = PackedCellBlock(shape, cell_states(rule.states))
+    else:
+        cells = DenseCellBlock(shape, cell_states(rule.states))
+
+    if driver == 'sparse':
+        result = SparseConwayDriver(cells, boundary=Boundary.TOROIDAL, **options)
+    elif driver == 'uncertain':
+        result = UncertainConwayDriver(cells, uncertainty=0.05, **options)
+    else:
+        result = BasicConwayDriver(cells, **options)
+
+    result.detect_cycles(None)
+    result.populate()
+
+    return result
+
+
+def step_case(driver: str, size: int, density: float, neighborhood: str) -> Case:
+    def setup():
+        instance = make_driver(driver, size, density, neighborhood)
+        return instance.next_generation
+
+    return Case('engine', 'step', {
+        'driver': driver, 'size': size, 'density': density, 'neighborhood': neighborhood,
+    }, setup)
+
+
+def hashlife_case(size: int, density: float) -> Case:
+    def setup():
+        source = make_driver('basic-dense', size, density, 'M')
+        universe = ConwayHashLife(source.rule)
+        universe.load_cells(source.cells)
+
+        def step():
+            universe.advance(1)
+            return {'cached': universe.cached}
+
+        return step
+
+    return Case('engine', 'hashlife', {'size': size, 'density': density}, setup)
+
+
+def cases(sizes: Sequence[int], densities: Sequence[float]) -> Iterable[Case]:
+    for neighborhood in RULES:
+        for driver in DRIVERS:
+            for size in sizes:
+                if driver == 'generic' and size > GENERIC_LIMIT:
+                    continue
+                for density in densities:
+                    yield step_case(driver, size, density, neighborhood)
+
+    for size in sizes:
+        if size <= GENERIC_LIMIT:
+            for density in densities:
+                yield hashlife_case(size, density)
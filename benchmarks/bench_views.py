@@ -0,0 +1,113 @@
+"""Benchmarks for the view layer, run against ``fake_blender`` stand-ins.
+
+The times measure the Python work of the views. ``api_calls`` counts the Blender API calls each
+step makes, which is what dominates inside Blender.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from conway3d.conway import ConwayCellState, ConwayCellView, ConwayInstancedView
+from conway3d.visuals import StateTimeline
+
+from . import fake_blender
+from .bench_engine import make_driver
+from .harness import Case
+
+VIEW_LIMIT = 32
+"""The largest grid side that the object-per-cell view is benchmarked on."""
+
+FRAMES = 20
+"""The number of frames recorded into a timeline before it is baked."""
+
+
+def _counted(step):
+    def counted():
+        before = fake_blender.calls()
+        step()
+        return {'api_calls': fake_blender.calls() - before}
+
+    return counted
+
+
+def make_view_case(view: str, size: int) -> Case:
+    def setup():
+        driver = make_driver('basic-dense', size, 0.25, 'M')
+        view_type = ConwayCellView if view == 'objects' else ConwayInstancedView
+        return _counted(lambda: view_type(driver.cells, 'Bench', 1.0, 0.1))
+
+    return Case('views', 'make', {'view': view, 'size': size}, setup)
+
+
+def update_case(view: str, size: int, changed: bool) -> Case:
+    """Updates the view as the block alternates between two generations."""
+    def setup():
+        driver = make_driver('basic-dense', size, 0.25, 'M')
+        cells = driver.cells
+        view_type = ConwayCellView if view == 'objects' else ConwayInstancedView
+        cell_view = view_type(cells, 'Bench', 1.0, 0.1)
+
+        cell_view.update()
+        first = cells.array.copy()
+        driver.next_generation()
+        generations = (first, cells.array.copy())
+        indices = np.flatnonzero(generations[0] != generations[1]) if changed else None
+        scene = fake_blender.scene()
+
+        def step():
+            cells.array[...] = generations[scene.frame_current // 10 % 2]
+            scene.frame_current += 10
+            cell_view.update(indices)
+
+        return _counted(step)
+
+    return Case('views', 'update', {'view': view, 'size': size, 'changed': changed}, setup)
+
+
+def record_case(size: int) -> Case:
+    def setup():
+        driver = make_driver('basic-dense', size, 0.25, 'M')
+        timeline = StateTimeline(tuple(ConwayCellState))
+        frame = iter(range(0, 1 << 30, 10))
+
+        def step():
+            timeline.record(next(frame), driver.cells)
+            driver.next_generation()
+
+        return step
+
+    return Case('views', 'timeline_record', {'size': size}, setup)
+
+
+def cell_keys_case(size: int) -> Case:
+    def setup():
+        driver = make_driver('basic-dense', size, 0.25, 'M')
+        timeline = StateTimeline(tuple(ConwayCellState))
+        for frame in range(0, FRAMES * 10, 10):
+            timeline.record(frame, driver.cells)
+            driver.next_generation()
+
+        def step():
+            for _ in timeline.cell_keys():
+                pass
+
+        return step
+
+    return Case('views', 'timeline_cell_keys', {'size': size, 'frames': FRAMES}, setup)
+
+
+def cases(sizes: Sequence[int], densities: Sequence[float]) -> Iterable[Case]:
+    for size in sizes:
+        for view in ('objects', 'instanced'):
+            if view == 'objects' and size > VIEW_LIMIT:
+                continue
+            yield make_view_case(view, size)
+            yield update_case(view, size, False)
+            if view == 'objects':
+                yield update_case(view, size, True)
+
+        yield record_case(size)
+        if size <= 64:
+            yield cell_keys_case(size)
@@ -0,0 +1,84 @@
+"""In-memory stand-ins for the Blender data that ``fake-bpy-module`` leaves empty.
+
+``fake-bpy-module`` provides Blender's modules so the view layer can be imported outside Blender,
+but ``bpy.data`` and ``bpy.context`` are ``None``. ``install`` replaces them with objects that
+accept any attribute, item or call and count the calls, so the benchmarks measure the Python
+overhead of the view layer and the number of Blender API calls it makes, which is what a real
+Blender session would spend most of its time on.
+
+``install`` must run before ``conway3d`` is imported, because its modules keep references to
+``bpy.data`` and ``bpy.context``.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+
+class Stub:
+    """Accepts any attribute, item or call. Attributes and items keep the values assigned to them,
+    and compare equal to anything so that lookups by name succeed."""
+    __slots__ = ('_attributes',)
+
+    calls = 0
+    """The number of calls made on every stub."""
+
+    def __init__(self):
+        object.__setattr__(self, '_attributes', {})
+
+    def __getattr__(self, name: str) -> Any:
+        attributes = self._attributes
+
+        if name not in attributes:
+            attributes[name] = Stub()
+
+        return attributes[name]
+
+    def __setattr__(self, name: str, value: Any):
+        self._attributes[name] = value
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__getattr__(f'[{key}]')
+
+    def __setitem__(self, key: Any, value: Any):
+        self.__setattr__(f'[{key}]', value)
+
+    def __delitem__(self, key: Any):
+        del self._attributes[f'[{key}]']
+
+    def __contains__(self, key: Any) -> bool:
+        return f'[{key}]' in self._attributes
+
+    def __call__(self, *args, **kwargs) -> Stub:
+        Stub.calls += 1
+        return Stub()
+
+    def __iter__(self):
+        yield Stub()
+
+    def __eq__(self, other):
+        return True
+
+    __hash__ = object.__hash__
+
+
+def install() -> None:
+    """Replaces ``bpy.data``, ``bpy.context`` and the frame change handlers with stand-ins."""
+    import bpy
+
+    bpy.data = Stub()
+    bpy.context = Stub()
+    bpy.context.scene.frame_current = 0
+    bpy.app.handlers.frame_change_pre = []
+    bpy.app.handlers.persistent = lambda handler: handler
+
+
+def calls() -> int:
+    """Returns the number of Blender API calls made so far."""
+    return Stub.calls
+
+
+def scene() -> Any:
+    """Returns the stand-in for ``bpy.context.scene``."""
+    import bpy
+
+    return bpy.context.scene
@@ -0,0 +1,222 @@
+"""Measures benchmark cases and compares results with a stored baseline."""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+Step = Callable[[], Any]
+"""Runs one step of a benchmark. It may return a dict of extra metrics for the step."""
+
+
+class Case:
+    """A benchmark with fixed parameters.
+
+    ``setup`` builds everything the benchmark needs and returns the function that runs one step.
+    Setup is not timed.
+    """
+    __slots__ = ('_suite', '_name', '_params', '_setup')
+
+    def __init__(self, suite: str, name: str, params: dict[str, Any], setup: Callable[[], Step]):
+        """
+        Args:
+            suite: The suite the case belongs to, such as ``engine``.
+            name: The name of the benchmark within the suite.
+            params: The parameters of the case. They must be JSON serializable.
+            setup: Builds the benchmark and returns the function that runs one step.
+        """
+        self._suite = suite
+        self._name = name
+        self._params = params
+        self._setup = setup
+
+    def __repr__(self):
+        return f'Case({self.key!r})'
+
+    @property
+    def suite(self) -> str:
+        return self._suite
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return self._params
+
+    @property
+    def key(self) -> str:
+        """A unique, readable identifier for the case, such as ``engine.step[size=8]``."""
+        params = ','.join(f'{k}={v}' for (k, v) in self._params.items())
+        return f'{self._suite}.{self._name}[{params}]'
+
+    def setup(self) -> Step:
+        return self._setup()
+
+
+def machine_info() -> dict[str, Any]:
+    """Returns a description of the machine and software the benchmarks ran on."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def measure(case: Case, steps: int = 20, budget: float = 2.0, memory_steps: int = 2
+            ) -> dict[str, Any]:
+    """Runs a case and measures its throughput, step latency and peak memory.
+
+    The case is set up, warmed up with one step, then stepped until ``steps`` steps have run or
+    ``budget`` seconds have passed, with at least 3 steps. Peak memory is measured on a fresh setup
+    with ``tracemalloc``, which NumPy reports its buffers to, so tracing does not slow the timed
+    steps. It covers the memory allocated by setup and by the first ``memory_steps`` steps.
+
+    Returns:
+        The case's key, suite, name and parameters, plus ``steps``, ``seconds``, ``rate`` in steps
+        per second, step latency percentiles in milliseconds, ``peak_memory`` in bytes, and the
+        mean of any extra metrics returned by the steps.
+    """
+    step = case.setup()
+    step()
+    latencies = []
+    extras: dict[str, list[float]] = {}
+    gc.collect()
+    start = time.perf_counter()
+
+    while len(latencies) < 3 or (len(latencies) < steps and time.perf_counter() - start < budget):
+        begin = time.perf_counter_ns()
+        metrics = step()
+        latencies.append(time.perf_counter_ns() - begin)
+
+        if isinstance(metrics, dict):
+            for (name, value) in metrics.items():
+                extras.setdefault(name, []).append(value)
+
+    del step
+    gc.collect()
+    tracemalloc.start()
+    try:
+        step = case.setup()
+        for _ in range(memory_steps):
+            step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del step
+
+    latency = np.array(latencies, dtype=np.float64) / 1e6
+    seconds = float(latency.sum() / 1e3)
+    p50, p90, p99 = np.percentile(latency, (50, 90, 99)).tolist()
+
+    return {
+        'key': case.key,
+        'suite': case.suite,
+        'name': case.name,
+        'params': case.params,
+        'steps': len(latencies),
+        'seconds': seconds,
+        'rate': len(latencies) / seconds if seconds else float('inf'),
+        'p50_ms': p50,
+        'p90_ms': p90,
+        'p99_ms': p99,
+        'max_ms': float(latency.max()),
+        'peak_memory': peak,
+        **{name: float(np.mean(values)) for (name, values) in extras.items()},
+    }
+
+
+def run_cases(cases: Iterable[Case], steps: int = 20, budget: float = 2.0,
+              report: Callable[[dict[str, Any]], None] | None = None) -> dict[str, Any]:
+    """Measures every case.
+
+    Args:
+        cases: The cases to run.
+        steps: Optional. The most steps to time for each case.
+        budget: Optional. The most seconds to spend timing each case.
+        report: Optional. Called with each result as soon as it is measured.
+
+    Returns:
+        A report with ``machine`` information and the ``results`` of every case.
+    """
+    results = []
+
+    for case in cases:
+        result = measure(case, steps, budget)
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    return {'machine': machine_info(), 'results': results}
+
+
+def save(report: dict[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2) + '\n')
+
+
+def load(path: str | Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1
+            ) -> list[dict[str, Any]]:
+    """Compares the throughput and memory of each case in ``current`` with the same case in
+    ``baseline``.
+
+    Args:
+        baseline: A report from ``run_cases`` to compare against.
+        current: A report from ``run_cases``.
+        threshold: Optional. The relative change beyond which a case counts as a regression.
+            Defaults to 0.1, or 10%.
+
+    Returns:
+        A row for each case found in both reports, with the ``rate`` and ``peak_memory`` ratios of
+        current to baseline, and ``regressed`` set when the rate fell or the peak memory grew by
+        more than ``threshold``.
+    """
+    before = {result['key']: result for result in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        old = before.get(result['key'])
+        if old is None:
+            continue
+
+        rate = result['rate'] / old['rate'] if old['rate'] else float('inf')
+        memory = (result['peak_memory'] / old['peak_memory']) if old['peak_memory'] else 1.0
+        rows.append({
+            'key': result['key'],
+            'rate': rate,
+            'peak_memory': memory,
+            'regressed': rate < 1 - threshold or memory > 1 + threshold,
+        })
+
+    return rows
+
+
+def format_result(result: dict[str, Any]) -> str:
+    return (f'{result["key"]:<60} {result["rate"]:>10.2f}/s  p50 {result["p50_ms"]:>9.3f} ms  '
+            f'p99 {result["p99_ms"]:>9.3f} ms  peak {result["peak_memory"] / 2**20:>8.2f} MiB')
+
+
+def format_comparison(row: dict[str, Any]) -> str:
+    flag = 'REGRESSED' if row['regressed'] else ''
+    return (f'{row["key"]:<60} rate x{row["rate"]:.3f}  memory x{row["peak_memory"]:.3f}  '
+            f'{flag}').rstrip()
+
+
+def print_report(lines: Iterable[str]) -> None:
+    for line in lines:
+        print(line, file=sys.stderr)
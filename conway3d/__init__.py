@@ -1,7 +1,22 @@
-from .blendutil import get_child_by_name, set_active_layer_collection
+from .checkpoint import Checkpointer, load_checkpoint, save_checkpoint
 from .config import ConfigType, Configuration
-from .conway import BasicConwayDriver, ConwayCellState, ConwayCellView, UncertainConwayDriver
-from .datamodel import CellBlock, IVector, T_state, cubic_neighbor_model, simple_neighbor_model
-from .engine import CellDriver
-from .stage import create_animation
-from .visuals import CellBlockView
+from .conway import (BASIC_RULE, BasicConwayDriver, ConwayCellState, ConwayHashLife, ConwayRule,
+                     SparseConwayDriver, UncertainConwayDriver, cell_states)
+from .datamodel import (CellBlock, DenseCellBlock, IVector, T_state, cubic_neighbor_model,
+                        moore_neighbor_model, PackedCellBlock, simple_neighbor_model,
+                        stencil_neighbor_model, von_neumann_neighbor_model)
+from .engine import (Boundary, CellDriver, CounterRandom, HashLife, NeighborTable,
+                     SlabExecutor)
+from .profiling import Profiler, profile
+from .trajectory import TrajectoryReader, TrajectoryWriter
+from .visuals import StateTimeline, stream_cell_keys
+
+try:
+    from .blendutil import get_child_by_name, set_active_layer_collection
+    from .conway import ConwayCellView, ConwayInstancedView
+    from .stage import create_animation, import_animation
+    from .visuals import BlockView, CellBlockView, InstancedCellBlockView
+except ModuleNotFoundError as error:
+    # Blender's modules are only available inside Blender. The simulation runs without them.
+    if error.name not in ('bpy', 'mathutils'):
+        raise
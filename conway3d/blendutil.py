@@ -2,13 +2,50 @@ from collections.abc import Iterable
 from typing import Any
 
 import bpy
+import numpy as np
 
 C = bpy.context
 D = bpy.data
 
+CUBE_FACES = (
+    (0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)
+)
+"""The faces of a cube whose eight corners are numbered by ``(x << 2) | (y << 1) | z``, each
+with outward facing normals."""
+
+
+INTERPOLATION = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+"""The values ``foreach_set`` expects for each keyframe interpolation mode."""
+
+
 def deselect_all() -> None:
     bpy.ops.object.select_all(action='DESELECT')
 
+
+def make_cube_mesh(name: str, size: float) -> Any:
+    """Creates a cube mesh datablock centered on its origin.
+
+    Unlike ``bpy.ops.mesh.primitive_cube_add``, this does not add an object to the scene or update
+    the dependency graph, so one mesh can be created and shared by many objects.
+
+    Args:
+        name: The name of the new mesh.
+        size: The length of each edge of the cube in Blender units.
+
+    Returns:
+        A reference to the new mesh.
+    """
+    half = size / 2
+    vertices = [
+        (x * size - half, y * size - half, z * size - half)
+        for x in (0, 1) for y in (0, 1) for z in (0, 1)
+    ]
+    mesh = D.meshes.new(name)
+    mesh.from_pydata(vertices, [], CUBE_FACES)
+    mesh.update()
+
+    return mesh
+
 def find_3d_view() -> Any:
     """Returns the first screen area with type 'VIEW_3D'
 
@@ -79,3 +116,46 @@ def set_active_layer_collection(name: str) -> Any:
         C.view_layer.active_layer_collection = layer_collection
 
     return layer_collection
+
+
+def bake_fcurves(
+    target: Any,
+    data_path: str,
+    frames: np.ndarray,
+    values: np.ndarray,
+    interpolation: str = 'BEZIER'
+) -> None:
+    """Creates an F-curve for each channel of a property with all of its keyframes at once.
+
+    This writes the keyframes straight into the F-curves with ``foreach_set``, which is far faster
+    than calling ``keyframe_insert`` for each frame.
+
+    Args:
+        target: The ID (such as an object) that owns the property.
+        data_path: The path of the property, such as ``scale``.
+        frames: The frame of each keyframe, in ascending order.
+        values: An (n, channels) array with the value of each channel on each frame.
+        interpolation: Optional. The interpolation mode of every keyframe. Defaults to ``BEZIER``.
+    """
+    animation = target.animation_data or target.animation_data_create()
+
+    if animation.action is None:
+        animation.action = D.actions.new(f'{target.name}Action')
+
+    fcurves = animation.action.fcurves
+    count = len(frames)
+    co = np.empty((count, 2), dtype=np.float32)
+    co[:, 0] = frames
+    modes = np.full(count, INTERPOLATION[interpolation], dtype=np.int32)
+
+    for channel in range(values.shape[1]):
+        fcurve = fcurves.find(data_path, index=channel)
+        if fcurve is not None:
+            fcurves.remove(fcurve)
+
+        fcurve = fcurves.new(data_path, index=channel)
+        fcurve.keyframe_points.add(count)
+        co[:, 1] = values[:, channel]
+        fcurve.keyframe_points.foreach_set('co', co.ravel())
+        fcurve.keyframe_points.foreach_set('interpolation', modes)
+        fcurve.update()
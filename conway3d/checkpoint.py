@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .engine import CellDriver
+from .engine.cycles import DIGEST_SIZE
+
+VERSION = 1
+"""The version of the checkpoint format written by ``save_checkpoint``."""
+
+
+def save_checkpoint(path: str | Path, snapshot: dict[str, Any]) -> None:
+    """Writes a driver snapshot to a checkpoint file.
+
+    The cells, history and digests are stored as compressed arrays, and everything else as a JSON
+    header. The file is written next to ``path`` under a temporary name and then moved over it, so
+    a crash while writing leaves the previous checkpoint intact.
+
+    Args:
+        path: The file to write. It is replaced if it exists.
+        snapshot: A snapshot returned by ``CellDriver.snapshot``.
+    """
+    path = Path(path)
+    digests = snapshot['digests']
+    header = {
+        'version': VERSION,
+        'driver': snapshot['driver'],
+        'generation': snapshot['generation'],
+        'size': list(snapshot['size']),
+        'population': snapshot['population'],
+        'cycle': snapshot['cycle'],
+        'parameters': snapshot['parameters'],
+    }
+    ordinals = snapshot['cells']
+    # Two-state blocks are stored one bit per cell.
+    packed = int(ordinals.max(initial=0)) < 2
+
+    file = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'.{path.name}.', delete=False)
+    try:
+        with file:
+            np.savez_compressed(
+                file,
+                header=np.frombuffer(json.dumps(header).encode(), dtype=np.uint8),
+                cells=np.packbits(ordinals.ravel()) if packed else ordinals.ravel(),
+                packed=np.array(packed),
+                history=snapshot['history'],
+                digest_generations=np.array([g for (g, _) in digests], dtype=np.int64),
+                digests=np.frombuffer(b''.join(d for (_, d) in digests), dtype=np.uint8).reshape(
+                    (len(digests), DIGEST_SIZE)))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(file.name, path)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+
+def load_checkpoint(path: str | Path) -> dict[str, Any]:
+    """Reads a checkpoint file written by ``save_checkpoint``.
+
+    Returns:
+        A snapshot that can be passed to ``CellDriver.restore``.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(data['header'].tobytes())
+
+        if header['version'] != VERSION:
+            raise ValueError(f'Unsupported checkpoint version {header["version"]}.')
+
+        sx, sy, sz = header['size']
+        cells = data['cells']
+        if data['packed']:
+            cells = np.unpackbits(cells, count=sx * sy * sz)
+
+        return {
+            'driver': header['driver'],
+            'generation': header['generation'],
+            'size': tuple(header['size']),
+            'cells': cells.reshape((sz, sy, sx)),
+            'population': header['population'],
+            'history': data['history'],
+            'digests': [
+                (generation, digest.tobytes())
+                for (generation, digest) in zip(data['digest_generations'].tolist(),
+                                                data['digests'])
+            ],
+            'cycle': None if header['cycle'] is None else tuple(header['cycle']),
+            'parameters': header['parameters'],
+        }
+
+
+class Checkpointer:
+    """Saves checkpoints of a driver every ``interval`` generations on a background thread.
+
+    The snapshot is taken on the thread that calls ``update``, which only copies the cells.
+    Compressing and writing it happens on a background thread, so the simulation does not wait
+    for the disk. If the writer falls behind, a snapshot that has not been started yet is replaced
+    by the newer one.
+
+    Errors from the background thread are raised by the next call to ``update``, ``flush`` or
+    ``close``.
+    """
+    __slots__ = ('_driver', '_path', '_interval', '_condition', '_pending', '_busy', '_closed',
+                 '_error', '_written', '_thread')
+
+    def __init__(self, driver: CellDriver, path: str | Path, interval: int = 100):
+        """
+        Args:
+            driver: The driver to save.
+            path: The checkpoint file. Each checkpoint replaces the one before it.
+            interval: Optional. The number of generations between checkpoints. Defaults to 100.
+        """
+        if interval < 1:
+            raise ValueError('The checkpoint interval must be at least 1.')
+
+        self._driver = driver
+        self._path = Path(path)
+        self._interval = interval
+        self._condition = threading.Condition()
+        self._pending: dict[str, Any] | None = None
+        self._busy = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self._written: int | None = None
+        self._thread = threading.Thread(target=self._run, name='Checkpointer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        """The checkpoint file."""
+        return self._path
+
+    @property
+    def interval(self) -> int:
+        """The number of generations between checkpoints."""
+        return self._interval
+
+    @property
+    def written(self) -> int | None:
+        """The generation of the last checkpoint written, or ``None`` if none has been."""
+        return self._written
+
+    def update(self) -> bool:
+        """Saves a checkpoint if the driver's generation is a multiple of ``interval``.
+
+        Call this after each generation.
+
+        Returns:
+            Whether a checkpoint was started.
+        """
+        if self._driver.generation % self._interval:
+            self._raise_error()
+            return False
+
+        self.save()
+        return True
+
+    def save(self) -> None:
+        """Saves a checkpoint of the driver's current generation."""
+        snapshot = self._driver.snapshot()
+
+        with self._condition:
+            self._raise_error()
+            if self._closed:
+                raise ValueError('The checkpointer is closed.')
+
+            self._pending = snapshot
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Waits until every checkpoint that was started has been written."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending is None and not self._busy)
+            self._raise_error()
+
+    def close(self) -> None:
+        """Writes any pending checkpoint and stops the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+
+        with self._condition:
+            self._raise_error()
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        condition = self._condition
+
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._pending is not None or self._closed)
+                snapshot, self._pending = self._pending, None
+
+                if snapshot is None:
+                    return
+
+                self._busy = True
+
+            try:
+                save_checkpoint(self._path, snapshot)
+            except BaseException as error:
+                with condition:
+                    self._error = error
+            else:
+                self._written = snapshot['generation']
+            finally:
+                with condition:
+                    self._busy = False
+                    condition.notify_all()
@@ -0,0 +1,201 @@
+"""Runs a simulation without Blender and streams its generations to a trajectory file.
+
+The file can be loaded into Blender later with ``stage.import_animation``, so the simulation can
+run ahead of, and apart from, building the scene.
+"""
+import argparse
+import sys
+from collections.abc import Sequence
+
+from . import profiling
+from .checkpoint import Checkpointer, load_checkpoint
+from .conway import (BASIC_RULE, BasicConwayDriver, ConwayRule, SparseConwayDriver,
+                     UncertainConwayDriver, cell_states)
+from .datamodel import DenseCellBlock, IVector, PackedCellBlock
+from .engine import (Boundary, CellDriver, Generation, SlabExecutor, neighbor_offsets,
+                     neighbor_radius, tap)
+from .trajectory import KEYFRAME_INTERVAL, TrajectoryWriter
+
+DRIVERS = ('basic', 'sparse', 'uncertain')
+"""The names of the drivers the CLI can run."""
+
+BLOCKS = ('dense', 'packed')
+"""The names of the cell blocks the CLI can use."""
+
+
+def parse_size(text: str) -> IVector:
+    """Parses a grid size given as one number for a cube, or as ``XxYxZ``."""
+    try:
+        values = tuple(int(value) for value in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid grid size {text!r}.') from None
+
+    if len(values) == 1:
+        values *= 3
+
+    if len(values) != 3 or min(values) < 1:
+        raise argparse.ArgumentTypeError(f'Invalid grid size {text!r}.')
+
+    return values
+
+
+def parse_rule(text: str) -> ConwayRule:
+    """Parses a rule given in ``S/B/states/neighborhood`` notation."""
+    try:
+        return ConwayRule.parse(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m conway3d',
+        description='Run a 3D Conway simulation and write its generations to a trajectory file.')
+    parser.add_argument('output', help='the trajectory file to write')
+    parser.add_argument('-s', '--size', type=parse_size, default=(8, 8, 8),
+                        help='the grid size, as N for a cube or XxYxZ (default: 8)')
+    parser.add_argument('-r', '--rule', type=parse_rule, default=str(BASIC_RULE),
+                        help='the rule in S/B/states/neighborhood notation '
+                             f'(default: {BASIC_RULE})')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='the seed for random numbers (default: random)')
+    parser.add_argument('-g', '--generations', type=int, default=20,
+                        help='the generation to run until, counting the first as 0 (default: 20)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='the number of threads to step each generation with (default: 1)')
+    parser.add_argument('--driver', choices=DRIVERS, default='basic',
+                        help='the driver to run (default: basic)')
+    parser.add_argument('--block', choices=BLOCKS, default='dense',
+                        help='the cell block to use (default: dense)')
+    parser.add_argument('--boundary', choices=('fixed', 'toroidal'), default='fixed',
+                        help='the boundary policy (default: fixed)')
+    parser.add_argument('--probability', type=float, default=0.25,
+                        help='the chance that each cell starts alive (default: 0.25)')
+    parser.add_argument('--uncertainty', type=float, default=0.05,
+                        help='the chance of rule fluctuations for the uncertain driver '
+                             '(default: 0.05)')
+    parser.add_argument('--stop-on-cycle', action='store_true',
+                        help='stop once the grid dies out, freezes or repeats')
+    parser.add_argument('-k', '--keyframe-interval', type=int, default=KEYFRAME_INTERVAL,
+                        help='the number of generations between full snapshots in the file '
+                             f'(default: {KEYFRAME_INTERVAL})')
+    parser.add_argument('--checkpoint', metavar='PATH', default=None,
+                        help='save a checkpoint of the run to this file')
+    parser.add_argument('--checkpoint-interval', type=int, default=100,
+                        help='the number of generations between checkpoints (default: 100)')
+    parser.add_argument('--resume', metavar='PATH', default=None,
+                        help='continue the run saved in this checkpoint instead of starting a new '
+                             'one; the trajectory starts at the saved generation')
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='write a profile of where the run spent its time to this file')
+    parser.add_argument('--profile-format', choices=('chrome', 'json', 'csv'), default='chrome',
+                        help='the format of the profile: a Chrome trace event file, JSON or CSV '
+                             '(default: chrome)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not report progress')
+
+    return parser
+
+
+def make_driver(args: argparse.Namespace, executor: SlabExecutor | None) -> CellDriver:
+    """Creates the driver described by parsed command line arguments."""
+    block_type = PackedCellBlock if args.block == 'packed' else DenseCellBlock
+    cells = block_type(args.size, cell_states(args.rule.states))
+    options = dict(probability=args.probability, rule=args.rule,
+                   boundary=Boundary(args.boundary), executor=executor, seed=args.seed)
+
+    if args.driver == 'uncertain':
+        return UncertainConwayDriver(cells, uncertainty=args.uncertainty, **options)
+
+    driver_type = SparseConwayDriver if args.driver == 'sparse' else BasicConwayDriver
+    return driver_type(cells, **options)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    if args.rule.states > 2:
+        # Packed blocks hold one bit per cell, and the sparse driver tracks only live cells.
+        if args.block == 'packed':
+            parser.error(f'--block packed only supports two-state rules, not {args.rule}.')
+        if args.driver == 'sparse':
+            parser.error(f'--driver sparse only supports two-state rules, not {args.rule}.')
+
+    if args.boundary == 'toroidal':
+        width = 2 * neighbor_radius(neighbor_offsets(args.rule.neighbors)) + 1
+        if min(args.size) < width:
+            parser.error(f'--boundary toroidal needs a grid at least {width} cells wide for '
+                         f'{args.rule}.')
+
+    if args.profile is None:
+        return run(args)
+
+    with profiling.profile() as profiler:
+        status = run(args)
+
+    profiler.write(args.profile, args.profile_format)
+    return status
+
+
+def run(args: argparse.Namespace) -> int:
+    """Runs the simulation described by parsed command line arguments."""
+    executor = SlabExecutor(args.workers) if args.workers > 1 else None
+    checkpointer = None
+
+    try:
+        driver = make_driver(args, executor)
+
+        if args.resume is not None:
+            try:
+                driver.restore(load_checkpoint(args.resume))
+            except (OSError, ValueError) as error:
+                print(f'python -m conway3d: error: cannot resume from {args.resume}: {error}',
+                      file=sys.stderr)
+                return 2
+        else:
+            driver.populate()
+
+        metadata = {
+            'rule': str(driver.rule), 'seed': driver.seed, 'driver': args.driver,
+            'boundary': args.boundary, 'probability': driver.parameters()['probability'],
+            'first_generation': driver.generation,
+        }
+        if args.driver == 'uncertain':
+            metadata['uncertainty'] = driver.parameters()['uncertainty']
+
+        start = driver.generation
+        generations = driver.run(max(0, args.generations - start))
+        if args.checkpoint is not None:
+            checkpointer = Checkpointer(driver, args.checkpoint, args.checkpoint_interval)
+
+            def checkpoint(generation: Generation) -> None:
+                # The starting generation is new or was just loaded, so it is not saved again.
+                if generation.number > start:
+                    checkpointer.update()
+
+            generations = tap(generations, checkpoint)
+
+        with TrajectoryWriter(args.output, driver.cells.size, driver.rule.states,
+                              metadata, args.keyframe_interval) as writer:
+            for generation in generations:
+                with profiling.span('cli.write'):
+                    writer.write(generation.ordinals())
+
+                if not args.quiet:
+                    print(f'generation {generation.number}: population {generation.population}',
+                          file=sys.stderr)
+
+                if args.stop_on_cycle and generation.cycle is not None:
+                    break
+    finally:
+        if checkpointer is not None:
+            checkpointer.close()
+        if executor is not None:
+            executor.close()
+
+    if not args.quiet and driver.cycle is not None:
+        cycle = driver.cycle
+        print(f'settled into a cycle of period {cycle.period} at generation {cycle.start}',
+              file=sys.stderr)
+
+    return 0
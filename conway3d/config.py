@@ -5,8 +5,23 @@ class Configuration:
     grid_size = (8, 8, 8)
     """The size of the Conway grid measured in number of cells."""
 
-    uncertainty = 0.1
-    """The uncertainty factor to use for drivers that support rule fluctuations"""
+    rule = '4-6/6/2/M'
+    """The rule for the Conway driver in ``S/B/states/neighborhood`` notation."""
+
+    boundary = 'fixed'
+    """The boundary policy for the grid: ``fixed`` or ``toroidal``. Unbounded grids are not
+    supported, since the views are built for a grid that keeps its size."""
+
+    workers = 1
+    """The number of threads used to step each generation. Values above 1 split the grid into z
+    slabs that are stepped in parallel."""
+
+    seed = None
+    """The seed for the driver's random numbers. ``None`` picks a new seed for every run."""
+
+    uncertainty = 0.05
+    """The probability (0.0 to 1.0) that rule fluctuations are applied to a cell. 0 makes the
+    simulation deterministic, so it stops as soon as the grid settles into a cycle."""
 
     cell_size = 1.0
     """The size of each rendered cell in Blender units."""
@@ -21,5 +36,19 @@ class Configuration:
     block_name = 'CellBlock001'
     """The name of the Blender collection that will contain the cells."""
 
+    instanced = False
+    """Whether to show the whole grid as one object with an instanced cube per cell, rather than
+    one object per cell. Instancing is needed for grids of more than about 50,000 cells."""
+
+    bake = False
+    """Whether to run the whole simulation before animating the cells, then write all of their
+    keyframes at once, rather than keyframing them one frame at a time."""
+
+    profile = None
+    """A file to write a profile of ``create_animation`` to, or ``None`` to not profile it."""
+
+    profile_format = 'chrome'
+    """The format of the profile: ``chrome`` for a Chrome trace event file, ``json`` or ``csv``."""
+
 
 ConfigType = Type[Configuration]
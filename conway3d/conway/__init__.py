@@ -1,2 +1,11 @@
-from .conway_driver import BasicConwayDriver, ConwayCellState, UncertainConwayDriver
-from .conway_view import ConwayCellView
+from .conway_driver import (BasicConwayDriver, ConwayCellState, SparseConwayDriver,
+                            UncertainConwayDriver, cell_states)
+from .hashlife import ConwayHashLife
+from .rules import BASIC_RULE, ConwayRule
+
+try:
+    from .conway_view import ConwayCellView, ConwayInstancedView
+except ModuleNotFoundError as error:
+    # Blender's modules are only available inside Blender. The simulation runs without them.
+    if error.name not in ('bpy', 'mathutils'):
+        raise
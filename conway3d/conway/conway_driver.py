@@ -1,34 +1,152 @@
 from enum import Enum
-from random import random
+from functools import cache
+from hashlib import blake2b
+from typing import Any
 
+import numpy as np
+
+from .rules import BASIC_RULE, ConwayRule
+from ..engine.bitwise import popcount, step_packed
+from ..engine.boundary import Boundary
+from ..engine.cycles import DIGEST_SIZE
 from ..engine.driver import CellDriver
-from ..datamodel import CellBlock, IVector, cubic_neighbor_model
+from ..engine.kernels import neighbor_radius, scatter_counts
+from ..engine.parallel import SlabExecutor, halo_slab
+from ..engine.rng import CounterRandom
+from ..profiling import instrumented, span
+from ..datamodel import (CellBlock, DenseCellBlock, IVector, PackedCellBlock, pack_bits,
+                         unpack_bits)
 
 
 class ConwayCellState(Enum):
+    # The values match the ordinals that DenseCellBlock stores for each member.
     DEAD = 0
     ALIVE = 1
 
 
+@cache
+def cell_states(count: int) -> type[Enum]:
+    """Returns the cell states for a rule with ``count`` states.
+
+    Two-state rules use ``ConwayCellState``. Rules with more states get an ``Enum`` with ``DEAD``,
+    ``ALIVE`` and ``DECAY_1`` to ``DECAY_{count - 2}``, whose values are their ordinals, so a
+    ``DenseCellBlock`` stores each cell as a single ``uint8``. The same class is returned for the
+    same count.
+    """
+    if count == 2:
+        return ConwayCellState
+
+    if not 2 < count <= 256:
+        raise ValueError('Cell states must number from 2 to 256.')
+
+    members = ['DEAD', 'ALIVE'] + [f'DECAY_{i}' for i in range(1, count - 1)]
+    return Enum(f'ConwayCellState{count}', [(name, i) for (i, name) in enumerate(members)],
+                module=__name__)
+
+
+POPULATE_STREAM = 0
+"""The ``CounterRandom`` stream used for initial populations."""
+
+FLUCTUATE_STREAM = 1
+"""The ``CounterRandom`` stream used for rule fluctuations."""
+
+_POPULATE_CHUNK = 1 << 22
+
+
+def _flat_index(location: IVector, size: IVector) -> int:
+    x, y, z = location
+    sx, sy, _ = size
+    return (z * sy + y) * sx + x
+
+
 class BasicConwayDriver(CellDriver[ConwayCellState]):
-    """Provides a basic implementation of Conway's rules expanded for a three-dimensional grid.
+    """Provides an implementation of Conway's rules expanded for a three-dimensional grid.
 
-    The rules for this driver are:
+    The rules for this driver are given by a ``ConwayRule``. The default rule, ``4-6/6/2/M``, is:
       - An alive cell with 4 to 6 neighbors stays alive.
       - A dead cell with 6 neighbors becomes alive.
       - All other cells die or remain dead.
+
+    When the driver controls a ``DenseCellBlock``, ``next_generation`` counts the neighbors of every
+    cell at once and applies the rules to the whole block with ``next_states``.
+
+    Rules with more than two states decay cells that do not survive through ``DECAY`` states before
+    they die. Their cells are ``cell_states(rule.states)`` rather than ``ConwayCellState``, and
+    decaying cells count towards the population but not as neighbors.
+
+    Random numbers come from a ``CounterRandom`` keyed by the driver's seed, so a run can be
+    repeated exactly, and the same seed gives the same results on every kind of cell block.
     """
 
-    __slots__ = ('_probability',)
+    __slots__ = ('_probability', '_rule', '_random', '_state_type')
 
-    def __init__(self, cells: CellBlock[ConwayCellState], probability: float = 0.25):
+    def __init__(self,
+        cells: CellBlock[ConwayCellState],
+        probability: float = 0.25,
+        rule: ConwayRule | str = BASIC_RULE,
+        boundary: Boundary = Boundary.FIXED,
+        executor: SlabExecutor | None = None,
+        seed: int | None = None
+    ):
         """
         Args:
             probability: Optional. The probability that a cell at any given location will
                 be ``ALIVE`` when ``first_state`` is invoked.
+            rule: Optional. The rule to apply, either as a ``ConwayRule`` or in
+                ``S/B/states/neighborhood`` notation. Defaults to ``BASIC_RULE``.
+            boundary: Optional. The policy for neighbors that fall outside the cell block. Defaults
+                to ``Boundary.FIXED``.
+            executor: Optional. Splits whole-block steps into slabs that run in parallel.
+            seed: Optional. The seed for the driver's random numbers. Defaults to a random seed.
         """
-        super().__init__(cells, cubic_neighbor_model, ConwayCellState.DEAD)
+        rule = ConwayRule.parse(rule) if isinstance(rule, str) else rule
+        state_type = cell_states(rule.states)
+
+        if isinstance(cells, (DenseCellBlock, PackedCellBlock)):
+            if len(cells.states) != rule.states:
+                raise ValueError(
+                    f'The cell block has {len(cells.states)} states but the rule has '
+                    f'{rule.states}.')
+
+        super().__init__(cells, rule.neighbors, state_type.DEAD, boundary, executor)
+        self._state_type = state_type
         self._probability = probability
+        self._rule = rule
+        self._random = CounterRandom(seed)
+
+    @property
+    def rule(self) -> ConwayRule:
+        """The rule this driver applies."""
+        return self._rule
+
+    @property
+    def state_type(self) -> type[Enum]:
+        """The cell states for this driver's rule, from ``cell_states``."""
+        return self._state_type
+
+    @property
+    def random(self) -> CounterRandom:
+        """The source of this driver's random numbers."""
+        return self._random
+
+    @property
+    def seed(self) -> int:
+        """The seed for this driver's random numbers."""
+        return self._random.seed
+
+    def parameters(self) -> dict[str, Any]:
+        """Returns the rule, seed and probability of the driver."""
+        return {'rule': str(self._rule), 'seed': self._random.seed,
+                'probability': self._probability}
+
+    def set_parameters(self, parameters: dict[str, Any]) -> None:
+        """Applies the seed and probability from ``parameters``. The rule must match the driver's
+        own."""
+        if ConwayRule.parse(parameters['rule']) != self._rule:
+            raise ValueError(f'The rule {parameters["rule"]} does not match {self._rule}.')
+
+        self._random = CounterRandom(parameters['seed'])
+        self._probability = parameters['probability']
 
     def first_state(self, location: IVector, cells: CellBlock[ConwayCellState]) -> ConwayCellState:
         """Returns an initial state for the given location.
@@ -36,7 +154,43 @@ class BasicConwayDriver(CellDriver[ConwayCellState]):
         The initial state is determined by random based on the ``probability`` value passed to the
         constructor.
         """
-        return ConwayCellState.ALIVE if random() < self._probability else ConwayCellState.DEAD
+        chance = self._random.random_at(
+            self._generation, _flat_index(location, cells.size), POPULATE_STREAM)
+
+        return self._state_type.ALIVE if chance < self._probability else self._state_type.DEAD
+
+    @instrumented('driver.populate')
+    def populate(self) -> None:
+        """Populates the cell block at random based on the ``probability`` value passed to the
+        constructor.
+
+        ``DenseCellBlock`` and ``PackedCellBlock`` instances are populated with one draw for the
+        whole block, other cell blocks fall back to calling ``first_state`` for each cell. Both
+        give the same result for the same seed.
+        """
+        cells = self._cells
+
+        if not isinstance(cells, (DenseCellBlock, PackedCellBlock)):
+            return super().populate()
+
+        sx, sy, sz = cells.size
+        plane = sx * sy
+        # Draw a few z rows at a time to bound the size of the temporary arrays.
+        rows = max(1, _POPULATE_CHUNK // plane)
+
+        for start in range(0, sz, rows):
+            stop = min(sz, start + rows)
+            chance = self._random.random(
+                self._generation, np.arange(start * plane, stop * plane), POPULATE_STREAM)
+            alive = (chance < self._probability).reshape((stop - start, sy, sx))
+
+            if isinstance(cells, PackedCellBlock):
+                cells.words[start:stop] = pack_bits(alive)
+            else:
+                cells.array[start:stop] = alive
+
+        self.recount()
+        self.start_history()
 
     def next_state(self, location: IVector, cells: CellBlock[ConwayCellState]) -> ConwayCellState:
         """Determine the next cell state for the given parameters.
@@ -48,15 +202,265 @@ class BasicConwayDriver(CellDriver[ConwayCellState]):
         Returns:
             The next cell state.
         """
+        state_type = self._state_type
         state = cells[location]
-        neighbor_count = self.get_neighbor_count(location)
+        # Cells of a block that has not been populated hold ``None``, which is dead.
+        ordinal = state_type.DEAD.value if state is None else state.value
+
+        if ordinal > state_type.ALIVE.value:
+            # Decaying cells advance whatever their neighbors.
+            return state_type(self._rule.transition_table[ordinal, 0].item())
+
+        neighbor_count = self._count_live(location, cells)
+
+        return state_type(self._rule.transition_table[ordinal, neighbor_count].item())
+
+    def next_states(self, counts: np.ndarray, states: np.ndarray, start: int = 0) -> np.ndarray:
+        """Determine the next state ordinals for a whole block, or a slab of one, at once.
+
+        Survival, birth and decay are applied together with one lookup in the rule's
+        ``transition_table``.
+
+        Args:
+            counts: The neighbor count of each cell.
+            states: The current state ordinal of each cell, as stored by ``DenseCellBlock``.
+            start: Optional. The flat index of the first cell in ``states`` when it is a slab of
+                the block.
+
+        Returns:
+            The next state ordinal of each cell.
+        """
+        table = self._rule.transition_table
+        # A single take from the flattened table is several times faster than indexing the table
+        # with two arrays.
+        index = np.multiply(states, table.shape[1], dtype=np.uint16)
+        np.add(index, counts, out=index, casting='unsafe')
+
+        return table.ravel().take(index)
+
+    def occupied(self, states: np.ndarray) -> np.ndarray:
+        """Returns a boolean array that is ``True`` for live cells, which are the only ones counted
+        as neighbors."""
+        return states == self._state_type.ALIVE.value
+
+    def _count_live(self, location: IVector, cells: CellBlock[ConwayCellState]) -> int:
+        alive = self._state_type.ALIVE
+        return sum(1 for state in self.get_neighbors(location, cells).values() if state == alive)
+
+    @instrumented('driver.next_generation')
+    def next_generation(self):
+        """Progress this block to its next generation.
+
+        ``DenseCellBlock`` instances are updated with ``next_states``. ``PackedCellBlock``
+        instances are updated with bit-sliced arithmetic on their packed words, unless a subclass
+        overrides ``next_states``, in which case they are unpacked and updated with it. Other cell
+        blocks fall back to evaluating ``next_state`` for each cell.
+        """
+        self.begin_generation()
+        cells = self._cells
+
+        if (isinstance(cells, PackedCellBlock)
+                and type(self).next_states is BasicConwayDriver.next_states):
+            words = cells.words
+            with span('driver.step_packed'):
+                result = self._step_packed(words)
+            self.tally(popcount(result & ~words), popcount(words & ~result))
+            self.mark_changed(np.flatnonzero(unpack_bits(words ^ result, cells.size[0])))
+            words[...] = result
+            self.end_generation()
+        else:
+            super().next_generation()
+
+    def _step_packed(self, words: np.ndarray) -> np.ndarray:
+        sx = self._cells.size[0]
+        survive_table = self._rule.survive_table
+        birth_table = self._rule.birth_table
+
+        if self._executor is None:
+            return step_packed(
+                words, sx, self._offsets, survive_table, birth_table, self._boundary)
+
+        toroidal = self._boundary == Boundary.TOROIDAL
+        result = np.empty_like(words)
+
+        def step_slab(start: int, stop: int):
+            halo, row = halo_slab(words, start, stop, 1, toroidal)
+            stepped = step_packed(
+                halo, sx, self._offsets, survive_table, birth_table, self._boundary)
+            result[start:stop] = stepped[row:row + stop - start]
+
+        self._executor.map(step_slab, len(words))
+        return result
+
+
+class SparseConwayDriver(BasicConwayDriver):
+    """A Conway driver that only evaluates live cells and the neighbors of live cells.
+
+    The driver keeps the flat indices (in ``__iter__`` order) of the live cells. Each generation,
+    neighbor counts are accumulated by scattering from the live cells, so the cost of a generation
+    grows with the population rather than with the capacity of the cell block. This suits large,
+    mostly empty blocks.
+
+    The live set is rebuilt by ``populate``, ``reset`` and ``start_history``. Changes made to the
+    cell block by anything other than this driver must be followed by a call to ``sync``.
+
+    With an ``UNBOUNDED`` boundary the cell block is resized whenever a live cell comes within
+    reach of its edge, and ``origin`` tracks where the block's original (0, 0, 0) has moved to.
+
+    Rules where a dead cell with no neighbors becomes alive, and rules with more than two states,
+    are not supported.
+    """
+
+    __slots__ = ('_live', '_origin')
+
+    boundaries = (Boundary.FIXED, Boundary.TOROIDAL, Boundary.UNBOUNDED)
+
+    def __init__(self,
+        cells: CellBlock[ConwayCellState],
+        probability: float = 0.25,
+        rule: ConwayRule | str = BASIC_RULE,
+        boundary: Boundary = Boundary.FIXED,
+        executor: SlabExecutor | None = None,
+        seed: int | None = None
+    ):
+        super().__init__(cells, probability, rule, boundary, executor, seed)
+
+        if self._rule.states != 2:
+            raise ValueError('SparseConwayDriver only supports two-state rules.')
+
+        if 0 in self._rule.birth:
+            raise ValueError('SparseConwayDriver does not support rules with birth on 0 neighbors.')
+
+        self._live = np.empty(0, dtype=np.intp)
+        self._origin = (0, 0, 0)
+        self.sync()
+
+    def digest(self) -> bytes:
+        """Returns a digest of the size of the cell block and the indices of its live cells."""
+        digest = blake2b(np.asarray(self._cells.size, dtype=np.int64).tobytes(),
+                         digest_size=DIGEST_SIZE)
+        digest.update(self._live.astype(np.int64).tobytes())
+
+        return digest.digest()
+
+    @property
+    def live(self) -> np.ndarray:
+        """The sorted flat indices of the live cells."""
+        return self._live
+
+    @property
+    def origin(self) -> IVector:
+        """The location within the cell block of the block's original (0, 0, 0) location.
+
+        This only moves when an ``UNBOUNDED`` block grows below 0 on any axis.
+        """
+        return self._origin
 
-        if (state == ConwayCellState.ALIVE) and (3 < neighbor_count < 7):
-            return ConwayCellState.ALIVE
-        elif (state == ConwayCellState.DEAD) and (neighbor_count == 6):
-            return ConwayCellState.ALIVE
+    def sync(self) -> None:
+        """Rebuilds the live set and the population count from the states in the cell block."""
+        cells = self._cells
+        self.recount()
+
+        if isinstance(cells, DenseCellBlock):
+            self._live = np.flatnonzero(cells.array == ConwayCellState.ALIVE.value)
+        else:
+            self._live = np.array([
+                i for (i, state) in enumerate(cells.values()) if state == ConwayCellState.ALIVE
+            ], dtype=np.intp)
+
+    def start_history(self) -> None:
+        self.sync()
+        super().start_history()
+
+    def parameters(self) -> dict[str, Any]:
+        return {**super().parameters(), 'origin': list(self._origin)}
+
+    def set_parameters(self, parameters: dict[str, Any]) -> None:
+        super().set_parameters(parameters)
+        self._origin = tuple(parameters['origin'])
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        super().restore(snapshot)
+        self.sync()
+
+    @instrumented('driver.next_generation')
+    def next_generation(self):
+        """Progress this block to its next generation by evaluating only the live cells and their
+        neighbors."""
+        self.begin_generation()
+
+        if self._boundary == Boundary.UNBOUNDED:
+            self._grow()
+
+        sx, sy, sz = self._cells.size
+        live = self._live
+        survive_table = self._rule.survive_table
+        birth_table = self._rule.birth_table
+
+        with span('driver.scatter_counts'):
+            candidates, counts = scatter_counts(
+                live, self._offsets, (sz, sy, sx), self._boundary)
+        alive = np.isin(candidates, live, assume_unique=True)
+        survivors = candidates[alive & survive_table[counts]]
+        born = candidates[~alive & birth_table[counts]]
+
+        if survive_table[0]:
+            isolated = np.setdiff1d(live, candidates, assume_unique=True)
+            survivors = np.union1d(survivors, isolated)
+
+        next_live = np.union1d(survivors, born)
+        died = np.setdiff1d(live, next_live, assume_unique=True)
+
+        self._write(died, ConwayCellState.DEAD)
+        self._write(born, ConwayCellState.ALIVE)
+        self._live = next_live
+        self.end_generation()
+
+    def _grow(self) -> None:
+        """Resizes the cell block so that no live cell is within reach of its edge.
+
+        Each axis that needs to grow is grown by at least half its size, so the number of resizes
+        stays logarithmic in the extent of the pattern.
+        """
+        if not len(self._live):
+            return
+
+        radius = neighbor_radius(self._offsets)
+        size = self._cells.size
+        sx, sy, sz = size
+        z, y, x = np.unravel_index(self._live, (sz, sy, sx))
+        below = []
+        above = []
+
+        for (coords, length) in zip((x, y, z), size):
+            margin = max(radius, length // 2)
+            below.append(margin if coords.min() < radius else 0)
+            above.append(margin if coords.max() >= length - radius else 0)
+
+        if not any(below) and not any(above):
+            return
+
+        bx, by, bz = below
+        new_size = tuple(length + lo + hi for (length, lo, hi) in zip(size, below, above))
+        self._cells.resize(new_size, (bx, by, bz), ConwayCellState.DEAD)
+        nx, ny, nz = new_size
+        self._live = np.ravel_multi_index((z + bz, y + by, x + bx), (nz, ny, nx))
+        ox, oy, oz = self._origin
+        self._origin = (ox + bx, oy + by, oz + bz)
+
+    def _write(self, indices: np.ndarray, state: ConwayCellState) -> None:
+        cells = self._cells
+
+        if isinstance(cells, DenseCellBlock):
+            cells.array.reshape(-1)[indices] = state.value
+            alive = state != ConwayCellState.DEAD
+            self.tally(len(indices) if alive else 0, 0 if alive else len(indices))
+            self.mark_changed(indices)
         else:
-            return ConwayCellState.DEAD
+            sx, sy, sz = cells.size
+            z, y, x = np.unravel_index(indices, (sz, sy, sx))
+            for xyz in zip(x.tolist(), y.tolist(), z.tolist()):
+                cells[xyz] = state
 
 
 class UncertainConwayDriver(BasicConwayDriver):
@@ -72,23 +476,57 @@ class UncertainConwayDriver(BasicConwayDriver):
     def __init__(self,
         cells: CellBlock[ConwayCellState],
         probability: float = 0.25,
-        uncertainty: float = 0
+        uncertainty: float = 0,
+        rule: ConwayRule | str = BASIC_RULE,
+        boundary: Boundary = Boundary.FIXED,
+        executor: SlabExecutor | None = None,
+        seed: int | None = None
     ):
         """
         Args:
             uncertainty: The probability (0.0 to 1.0) that rule fluctuations will be applied.
         """
-        super().__init__(cells, probability)
+        super().__init__(cells, probability, rule, boundary, executor, seed)
         self._uncertainty = uncertainty
 
+    def parameters(self) -> dict[str, Any]:
+        return {**super().parameters(), 'uncertainty': self._uncertainty}
+
+    def set_parameters(self, parameters: dict[str, Any]) -> None:
+        super().set_parameters(parameters)
+        self._uncertainty = parameters['uncertainty']
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether the driver has no uncertainty, which makes each generation depend only on the
+        one before it."""
+        return self._uncertainty == 0
+
     def next_state(self, location: IVector, cells: CellBlock[ConwayCellState]) -> ConwayCellState:
         state = cells[location]
-        neighbor_count = self.get_neighbor_count(location)
+        if state is None:
+            state = self._state_type.DEAD
+        neighbor_count = self._count_live(location, cells)
+        chance = self._random.random_at(
+            self._generation, _flat_index(location, cells.size), FLUCTUATE_STREAM)
 
-        if random() <= self._uncertainty:
+        if chance <= self._uncertainty:
             if (state == self.empty_state) and (neighbor_count < 3):
-                return ConwayCellState.ALIVE
+                return self._state_type.ALIVE
             else:
                 return state
         else:
             return super().next_state(location, cells)
+
+    def next_states(self, counts: np.ndarray, states: np.ndarray, start: int = 0) -> np.ndarray:
+        result = super().next_states(counts, states, start)
+
+        if self._uncertainty > 0:
+            indices = np.arange(start, start + states.size).reshape(states.shape)
+            chance = self._random.random(self._generation, indices, FLUCTUATE_STREAM)
+            fluctuate = chance <= self._uncertainty
+            dead = states == self._state_type.DEAD.value
+            kept = np.where(dead & (counts < 3), self._state_type.ALIVE.value, states)
+            result = np.where(fluctuate, kept, result).astype(np.uint8)
+
+        return result
@@ -1,22 +1,127 @@
+from collections.abc import Iterable, Sequence
+from enum import Enum
+from functools import cache
 from typing import Any
 
-import bpy
+import numpy as np
 from mathutils import Vector
 
 from .conway_driver import ConwayCellState
-from ..visuals import CellBlockView
+from ..blendutil import bake_fcurves, make_cube_mesh
+from ..datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from ..profiling import instrumented
+from ..visuals import CellBlockView, InstancedCellBlockView
 
-ALIVE_SCALE = Vector((1.0, 1.0, 1.0))
-DEAD_SCALE = Vector((0.01, 0.01, 0.01))
+ALIVE_SIZE = 1.0
+"""The scale of the cube of a live cell."""
+
+DEAD_SIZE = 0.01
+"""The scale of the cube of a dead cell."""
+
+ALIVE_SCALE = Vector((ALIVE_SIZE, ALIVE_SIZE, ALIVE_SIZE))
+DEAD_SCALE = Vector((DEAD_SIZE, DEAD_SIZE, DEAD_SIZE))
+
+
+@cache
+def decay_scales(count: int) -> np.ndarray:
+    """Returns the scale of a cell's cube for each state ordinal of a rule with ``count`` states.
+
+    Dead cells are ``DEAD_SIZE`` and live cells ``ALIVE_SIZE``. Decaying cells shrink in even
+    steps from alive towards dead. The array is read-only.
+    """
+    scales = np.empty(count, dtype=np.float32)
+    scales[0] = DEAD_SIZE
+    scales[1:] = np.linspace(ALIVE_SIZE, DEAD_SIZE, count, dtype=np.float32)[:-1]
+    scales.flags.writeable = False
+
+    return scales
+
+
+def _sizes(states: Sequence[Enum]) -> np.ndarray:
+    """Returns the scale of the cube for each of ``states``, which are ``ConwayCellState`` or
+    ``cell_states`` members."""
+    if not states:
+        return np.empty(0, dtype=np.float32)
+
+    ordinals = np.fromiter((state.value for state in states), dtype=np.intp, count=len(states))
+    return decay_scales(len(type(states[0])))[ordinals]
 
 
 class ConwayCellView(CellBlockView[ConwayCellState]):
+    """Shows each cell as a cube, scaled by its state.
+
+    Cells of rules with more than two states shrink as they decay.
+    """
+
+    def make_cell_mesh(self, size: float) -> Any:
+        """Creates a cube of ``size``."""
+        return make_cube_mesh(f'{self.name}-Cell', size)
 
-    def add_cell_view(self, size: float, location: Vector) -> None:
-        """Adds a cube of ``size`` at ``location``."""
-        bpy.ops.mesh.primitive_cube_add(size=size, location=location)
+    def hold_cell_view(self, cell_view: Any, frame: int) -> None:
+        """Keyframes the current scale of the cube."""
+        cell_view.keyframe_insert(data_path='scale', frame=frame)
 
     def update_cell_view(self, cell_view: Any, state: ConwayCellState) -> None:
         """Changes the scale of the cube depending on the state."""
-        cell_view.scale = DEAD_SCALE if state == ConwayCellState.DEAD else ALIVE_SCALE
+        size = decay_scales(len(type(state)))[state.value].item()
+        cell_view.scale = Vector((size, size, size))
         cell_view.keyframe_insert(data_path='scale')
+
+    @instrumented('view.bake')
+    def bake_keys(
+        self,
+        states: Sequence[ConwayCellState],
+        keys: Iterable[tuple[int, np.ndarray, np.ndarray]]
+    ) -> None:
+        """Animates every cell from the keys of ``StateTimeline.cell_keys`` or
+        ``stream_cell_keys``.
+
+        The scale for every state code is looked up once, and each cell's keys are mapped to
+        scales in bulk rather than a state at a time.
+        """
+        sizes = _sizes(states)
+        scales = np.repeat(sizes[:, np.newaxis], 3, axis=1)
+        meshes = list(self._meshes.values())
+
+        for (cell, frames, codes) in keys:
+            bake_fcurves(meshes[cell], 'scale', frames, scales[codes])
+
+    def bake_cell_view(
+        self,
+        cell_view: Any,
+        frames: np.ndarray,
+        states: list[ConwayCellState]
+    ) -> None:
+        """Keyframes the scale of the cube for each state."""
+        scales = np.repeat(_sizes(states)[:, np.newaxis], 3, axis=1)
+        bake_fcurves(cell_view, 'scale', frames, scales)
+
+
+class ConwayInstancedView(InstancedCellBlockView[ConwayCellState]):
+    """Shows a whole Conway cell block as one object with an instanced cube for each cell.
+
+    Cells of rules with more than two states shrink as they decay.
+    """
+
+    def __init__(self,
+        cells: CellBlock[ConwayCellState],
+        block_name: str,
+        size: float,
+        padding: float
+    ):
+        """
+        Args:
+            cells: The cell block. The states of ``DenseCellBlock`` and ``PackedCellBlock``
+                instances are taken from the block, other blocks hold ``ConwayCellState``.
+        """
+        if isinstance(cells, (DenseCellBlock, PackedCellBlock)):
+            states = cells.states
+        else:
+            states = tuple(ConwayCellState)
+
+        super().__init__(cells, block_name, size, padding,
+                         dict(zip(states, _sizes(states).tolist())))
+
+    def make_cell_mesh(self, size: float) -> Any:
+        """Creates a cube of ``size``."""
+        return make_cube_mesh(f'{self.name}-Cell', size)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from ..datamodel import NeighborModel, cubic_neighbor_model, simple_neighbor_model
+
+NEIGHBORHOODS: dict[str, NeighborModel] = {
+    'M': cubic_neighbor_model,
+    'N': simple_neighbor_model,
+}
+"""The neighbor models for each neighborhood code: ``M`` (Moore) and ``N`` (von Neumann)."""
+
+
+class ConwayRule:
+    """An outer-totalistic rule for a three-dimensional cellular automaton.
+
+    Rules are written in the common ``S/B/states/neighborhood`` notation, for example
+    ``4-6/6/2/M``:
+      - ``S`` lists the neighbor counts that let a live cell survive.
+      - ``B`` lists the neighbor counts that bring a dead cell to life.
+      - ``states`` is the number of cell states, including dead and alive.
+      - ``neighborhood`` is ``M`` (Moore, 26 neighbors) or ``N`` (von Neumann, 6 neighbors).
+
+    Counts are comma separated values or inclusive ranges such as ``2,5-7``; an empty list means no
+    count applies. The four digit Bays notation (for example ``4555``, survive on 4-5 and birth on
+    5-5) is accepted as well.
+
+    Rules with more than two states are "Generations" rules. State 0 is dead and state 1 is alive.
+    A live cell that does not survive decays through states 2 to ``states - 1``, one a generation,
+    before it dies. Decaying cells are not counted as neighbors and cannot be born into.
+
+    The rule is compiled once into survive and birth lookup tables indexed by neighbor count, and a
+    transition table indexed by state and neighbor count.
+    """
+    __slots__ = ('_survive', '_birth', '_states', '_neighborhood', '_survive_table',
+                 '_birth_table', '_transition_table')
+
+    def __init__(self,
+        survive: Iterable[int],
+        birth: Iterable[int],
+        states: int = 2,
+        neighborhood: str = 'M'
+    ):
+        """
+        Args:
+            survive: The neighbor counts that let a live cell survive.
+            birth: The neighbor counts that bring a dead cell to life.
+            states: Optional. The number of cell states, including dead and alive, up to 256.
+                Defaults to 2.
+            neighborhood: Optional. The neighborhood code, ``M`` or ``N``. Defaults to ``M``.
+        """
+        if neighborhood not in NEIGHBORHOODS:
+            raise ValueError(f'Unknown neighborhood {neighborhood!r}.')
+
+        if states < 2:
+            raise ValueError('A rule needs at least two states.')
+
+        if states > 256:
+            raise ValueError('A rule may have at most 256 states.')
+
+        self._survive = frozenset(survive)
+        self._birth = frozenset(birth)
+        self._states = states
+        self._neighborhood = neighborhood
+
+        max_count = len(NEIGHBORHOODS[neighborhood]((0, 0, 0)))
+        for count in self._survive | self._birth:
+            if not 0 <= count <= max_count:
+                raise ValueError(f'Neighbor count {count} is outside 0-{max_count}.')
+
+        self._survive_table = np.zeros(max_count + 1, dtype=bool)
+        self._survive_table[list(self._survive)] = True
+        self._birth_table = np.zeros(max_count + 1, dtype=bool)
+        self._birth_table[list(self._birth)] = True
+
+        # Every state decays to the next one; the last state and dead cells decay to dead.
+        decay = ((np.arange(states) + 1) % states).astype(np.uint8)
+        decay[0] = 0
+        table = np.repeat(decay[:, np.newaxis], max_count + 1, axis=1)
+        table[0, self._birth_table] = 1
+        table[1, self._survive_table] = 1
+        table.flags.writeable = False
+        self._transition_table = table
+
+    @classmethod
+    def parse(cls, notation: str) -> ConwayRule:
+        """Creates a rule from ``S/B/states/neighborhood`` or four digit Bays notation.
+
+        Raises:
+            ValueError: If ``notation`` cannot be parsed.
+        """
+        text = notation.strip()
+
+        if len(text) == 4 and text.isdigit():
+            el, eu, fl, fu = (int(c) for c in text)
+            return cls(range(el, eu + 1), range(fl, fu + 1))
+
+        fields = text.split('/')
+        if len(fields) != 4:
+            raise ValueError(f'Rule {notation!r} is not in S/B/states/neighborhood notation.')
+
+        survive, birth, states, neighborhood = fields
+
+        try:
+            return cls(_parse_counts(survive), _parse_counts(birth), int(states),
+                       neighborhood.strip().upper())
+        except ValueError as e:
+            raise ValueError(f'Invalid rule {notation!r}: {e}') from e
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConwayRule):
+            return NotImplemented
+
+        return (self._survive, self._birth, self._states, self._neighborhood) == (
+            other._survive, other._birth, other._states, other._neighborhood)
+
+    def __hash__(self) -> int:
+        return hash((self._survive, self._birth, self._states, self._neighborhood))
+
+    def __repr__(self) -> str:
+        return f'ConwayRule.parse({str(self)!r})'
+
+    def __str__(self) -> str:
+        return '/'.join((
+            _format_counts(self._survive),
+            _format_counts(self._birth),
+            str(self._states),
+            self._neighborhood
+        ))
+
+    @property
+    def survive(self) -> frozenset[int]:
+        """The neighbor counts that let a live cell survive."""
+        return self._survive
+
+    @property
+    def birth(self) -> frozenset[int]:
+        """The neighbor counts that bring a dead cell to life."""
+        return self._birth
+
+    @property
+    def states(self) -> int:
+        """The number of cell states, including dead and alive."""
+        return self._states
+
+    @property
+    def neighborhood(self) -> str:
+        """The neighborhood code, ``M`` or ``N``."""
+        return self._neighborhood
+
+    @property
+    def neighbors(self) -> NeighborModel:
+        """The neighbor model for this rule's neighborhood."""
+        return NEIGHBORHOODS[self._neighborhood]
+
+    @property
+    def survive_table(self) -> np.ndarray:
+        """A boolean array, indexed by neighbor count, that is ``True`` where a live cell survives.
+        """
+        return self._survive_table
+
+    @property
+    def birth_table(self) -> np.ndarray:
+        """A boolean array, indexed by neighbor count, that is ``True`` where a dead cell is born.
+        """
+        return self._birth_table
+
+    @property
+    def transition_table(self) -> np.ndarray:
+        """A read-only ``uint8`` array, indexed by state and neighbor count, with the next state of
+        a cell.
+
+        A whole block of states can be advanced with ``transition_table[states, counts]``.
+        """
+        return self._transition_table
+
+
+def _parse_counts(text: str) -> set[int]:
+    counts = set()
+
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        low, _, high = item.partition('-')
+        counts.update(range(int(low), int(high or low) + 1))
+
+    return counts
+
+
+def _format_counts(counts: frozenset[int]) -> str:
+    ranges = []
+
+    for count in sorted(counts):
+        if ranges and ranges[-1][1] == count - 1:
+            ranges[-1][1] = count
+        else:
+            ranges.append([count, count])
+
+    return ','.join(str(lo) if lo == hi else f'{lo}-{hi}' for (lo, hi) in ranges)
+
+
+BASIC_RULE = ConwayRule.parse('4-6/6/2/M')
+"""The rule used by ``BasicConwayDriver`` unless another is given."""
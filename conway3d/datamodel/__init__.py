@@ -1,3 +1,6 @@
-from .cell_block import CellBlock
-from .neighbors import NeighborModel, cubic_neighbor_model, simple_neighbor_model
+from .cell_block import CellBlock, CellObserver
+from .dense_block import DenseCellBlock
+from .neighbors import (NeighborModel, cubic_neighbor_model, moore_neighbor_model,
+                        simple_neighbor_model, stencil_neighbor_model, von_neumann_neighbor_model)
+from .packed_block import PackedCellBlock, pack_bits, unpack_bits
 from .types import IVector, T_state
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-from typing import Any, Generator, Generic
+from typing import Any, Callable, Generator, Generic
 
 from .types import IVector, T_state
 
 CELL_NAME = 'Cell-{:02d}{:02d}{:02d}'
 """The template for canonical name of a cell at a given location."""
 
+CellObserver = Callable[[IVector, Any, Any], None]
+"""Defines the signature for a function that is told about every cell changed through
+``CellBlock.__setitem__``.
+
+Args:
+    IVector: The cell location
+    T_state | None: The state the cell had before the change
+    T_state: The state the cell has after the change
+"""
+
 
 class CellBlock(Generic[T_state]):
-    __slots__ = ('_size', '_neighbors', '_empty', '_capacity', '_cells', '_cell_name')
+    __slots__ = ('_size', '_neighbors', '_empty', '_capacity', '_cells', '_cell_name', '_observer',
+                 '_back')
 
     def __init__(self,
         size: IVector,
@@ -26,6 +37,8 @@ class CellBlock(Generic[T_state]):
         self._capacity = size[0] * size[1] * size[2]
         self._cell_name = cell_name
         self._cells = {xyz: None for xyz in self}
+        self._observer: CellObserver | None = None
+        self._back: dict[IVector, T_state | None] | None = None
 
     def __len__(self) -> int:
         return self.capacity
@@ -46,6 +59,9 @@ class CellBlock(Generic[T_state]):
 
     def __setitem__(self, location: IVector, state: T_state):
         if location in self:
+            if self._observer is not None:
+                self._observer(location, self._cells[location], state)
+
             self._cells[location] = state
         else:
             raise KeyError
@@ -71,6 +87,55 @@ class CellBlock(Generic[T_state]):
 
         return other
 
+    def observe(self, observer: CellObserver | None) -> None:
+        """Sets the function to call whenever a cell is changed through ``__setitem__`` or
+        ``swap``.
+
+        Only one observer is kept; passing ``None`` removes it. Changes that bypass
+        ``__setitem__``, such as ``CellBlock.update``, ``resize`` or writes to the arrays of
+        array-backed blocks, are not observed.
+        """
+        self._observer = observer
+
+    def stage(self, location: IVector, state: T_state) -> None:
+        """Writes the next state of a cell to the back buffer, leaving the block unchanged until
+        ``swap`` is called.
+
+        This lets a generation be computed from the block while it is being written, without
+        copying the block first. The back buffer is allocated on first use and reused after that.
+        Every cell should be staged before each ``swap``: cells that were not keep whatever state
+        the back buffer last held.
+        """
+        if location in self:
+            back = self._back
+            if back is None:
+                back = self._back = dict(self._cells)
+
+            back[location] = state
+        else:
+            raise KeyError
+
+    def swap(self) -> None:
+        """Makes the staged states the current states of the block.
+
+        The observer is told about each cell whose state changed. The old states become the back
+        buffer, so swapping allocates nothing. Does nothing if no state has been staged.
+        """
+        back = self._back
+        if back is None:
+            return
+
+        front = self._cells
+        observer = self._observer
+
+        if observer is not None:
+            for (xyz, state) in back.items():
+                old = front[xyz]
+                if old != state:
+                    observer(xyz, old, state)
+
+        self._cells, self._back = back, front
+
     def get(self, location, default: Any) -> T_state | None:
         if location in self:
             return self[location]
@@ -91,6 +156,29 @@ class CellBlock(Generic[T_state]):
 
         return None
 
+    def resize(self, size: IVector, offset: IVector = (0, 0, 0), fill: T_state | None = None):
+        """Changes the size of this block in place.
+
+        Existing cells are moved by ``offset``, and any that then fall outside the new size are
+        discarded. New cells are set to ``fill``.
+
+        Args:
+            size: The new (x, y, z) dimensions of the cell block.
+            offset: Optional. The (x, y, z) amount to move existing cells by.
+            fill: Optional. The state for cells that did not exist before. Defaults to ``None``.
+        """
+        ox, oy, oz = offset
+        cells = self._cells
+        self._back = None
+        self._size = size
+        self._capacity = size[0] * size[1] * size[2]
+        self._cells = {xyz: fill for xyz in self}
+
+        for ((x, y, z), state) in cells.items():
+            xyz = (x + ox, y + oy, z + oz)
+            if xyz in self:
+                self._cells[xyz] = state
+
     @property
     def size(self) -> IVector:
         """The size of this block as an (x, y, z) tuple."""
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Generator
+
+import numpy as np
+
+from .cell_block import CELL_NAME, CellBlock
+from .types import IVector, T_state
+
+
+class DenseCellBlock(CellBlock[T_state]):
+    """A cell block that stores its states in a contiguous ``uint8`` NumPy array.
+
+    Each cell holds the ordinal (the position within ``state_type``) of its state rather than a
+    reference to the ``Enum`` member itself. The array is indexed in (z, y, x) order so that a flat
+    traversal of it matches the order of ``__iter__``.
+
+    Unlike ``CellBlock``, which starts every cell at ``None``, a new dense block starts every cell
+    at the first member of ``state_type``.
+    """
+    __slots__ = ('_state_type', '_states', '_ordinals')
+
+    def __init__(self,
+        size: IVector,
+        state_type: type[T_state],
+        cell_name: str = CELL_NAME
+    ):
+        """
+        Args:
+            size: The (x, y, z) dimensions of the cell block.
+            state_type: The ``Enum`` class whose members are stored in this block. It may have at
+                most 256 members.
+            cell_name: Optional. The template for canonical name of a cell at a given location.
+                This should accept three integer values: z, y, and x grid space coordinates.
+                Defaults to ``CELL_NAME``.
+        """
+        states = tuple(state_type)
+
+        if len(states) > 256:
+            raise ValueError('DenseCellBlock supports at most 256 states.')
+
+        sx, sy, sz = size
+        self._size = size
+        self._capacity = sx * sy * sz
+        self._cell_name = cell_name
+        self._state_type = state_type
+        self._states = states
+        self._ordinals = {state: i for (i, state) in enumerate(states)}
+        self._observer = None
+        self._back = None
+        self._cells = np.zeros((sz, sy, sx), dtype=np.uint8)
+
+    def __getitem__(self, location: IVector) -> T_state:
+        if location in self:
+            x, y, z = location
+            return self._states[self._cells[z, y, x]]
+
+        raise KeyError
+
+    def __setitem__(self, location: IVector, state: T_state):
+        if location in self:
+            x, y, z = location
+            if self._observer is not None:
+                self._observer(location, self._states[self._cells[z, y, x]], state)
+
+            self._cells[z, y, x] = self._ordinals[state]
+        else:
+            raise KeyError
+
+    def stage(self, location: IVector, state: T_state) -> None:
+        if location in self:
+            back = self._back
+            if back is None:
+                back = self._back = self._cells.copy()
+
+            x, y, z = location
+            back[z, y, x] = self._ordinals[state]
+        else:
+            raise KeyError
+
+    def swap(self) -> None:
+        """Makes the staged states the current states of the block.
+
+        The staged ordinals are copied into ``array`` rather than replacing it, so that the array
+        and views of it stay current. The observer is told about each cell whose state changed.
+        Does nothing if no state has been staged.
+        """
+        back = self._back
+        if back is None:
+            return
+
+        front = self._cells
+        observer = self._observer
+
+        if observer is not None:
+            states = self._states
+            (zs, ys, xs) = np.nonzero(front != back)
+            for (x, y, z, old, new) in zip(xs.tolist(), ys.tolist(), zs.tolist(),
+                                           front[zs, ys, xs].tolist(), back[zs, ys, xs].tolist()):
+                observer((x, y, z), states[old], states[new])
+
+        np.copyto(front, back)
+
+    def copy(self) -> DenseCellBlock[T_state]:
+        other = DenseCellBlock(self._size, self._state_type, self._cell_name)
+        np.copyto(other._cells, self._cells)
+
+        return other
+
+    def keys(self) -> Generator[IVector]:
+        return iter(self)
+
+    def values(self) -> Iterable[T_state]:
+        states = self._states
+        return (states[i] for i in self._cells.ravel().tolist())
+
+    def update(self, other: CellBlock[T_state]) -> None:
+        if self.size != other.size:
+            raise ValueError('CellBlock sizes do not match.')
+
+        if isinstance(other, DenseCellBlock) and other._states == self._states:
+            np.copyto(self._cells, other._cells)
+        else:
+            for (xyz, state) in zip(other.keys(), other.values()):
+                self[xyz] = state
+
+        return None
+
+    def resize(self, size: IVector, offset: IVector = (0, 0, 0), fill: T_state | None = None):
+        ordinal = 0 if fill is None else self._ordinals[fill]
+        sx, sy, sz = size
+        cells = np.full((sz, sy, sx), ordinal, dtype=np.uint8)
+        src = []
+        dst = []
+
+        # Reverse the (x, y, z) inputs to match the (z, y, x) axes of the array.
+        for (old, new, shift) in zip(self._cells.shape, (sz, sy, sx), reversed(offset)):
+            start = max(0, shift)
+            stop = min(new, old + shift)
+            dst.append(slice(start, max(start, stop)))
+            src.append(slice(start - shift, max(start, stop) - shift))
+
+        cells[tuple(dst)] = self._cells[tuple(src)]
+        self._size = size
+        self._capacity = sx * sy * sz
+        self._back = None
+        self._cells = cells
+
+    @property
+    def array(self) -> np.ndarray:
+        """The (z, y, x) ``uint8`` array of state ordinals backing this block.
+
+        Changes made to the array are immediately visible through the rest of this block's
+        interface, which lets hot paths avoid the per-cell overhead of ``__getitem__`` and
+        ``__setitem__``. The array is replaced when the block is resized.
+        """
+        return self._cells
+
+    @property
+    def state_type(self) -> type[T_state]:
+        """The ``Enum`` class whose members are stored in this block."""
+        return self._state_type
+
+    @property
+    def states(self) -> tuple[T_state, ...]:
+        """The members of ``state_type`` indexed by their ordinal."""
+        return self._states
+
+    def ordinal_of(self, state: T_state) -> int:
+        """Returns the ordinal stored in ``array`` for the given state."""
+        return self._ordinals[state]
+
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+from itertools import product
 from typing import Callable
 
 from conway3d.datamodel.types import IVector
@@ -17,6 +19,10 @@ Args:
 
 Returns:
     list[IVector]: The locations of cells that are considered neighbors to the given cell.
+
+Models that place neighbors at the same offsets from every cell may expose those offsets as an
+``offsets`` attribute (see ``stencil_neighbor_model``). Drivers use it to count the neighbors of a
+whole block by shifting it instead of looking up the neighbors of each cell.
 """
 
 
@@ -56,3 +62,50 @@ def cubic_neighbor_model(location: IVector) -> list[IVector]:
     coords.remove(location)
 
     return coords
+
+
+simple_neighbor_model.offsets = tuple(simple_neighbor_model((0, 0, 0)))
+cubic_neighbor_model.offsets = tuple(cubic_neighbor_model((0, 0, 0)))
+
+
+def stencil_neighbor_model(offsets: Iterable[IVector]) -> NeighborModel:
+    """Creates a neighbor model that places neighbors at the same offsets from every cell.
+
+    Args:
+        offsets: The (x, y, z) offsets from a cell to each of its neighbors.
+
+    Returns:
+        The neighbor model, with the given offsets available as its ``offsets`` attribute.
+    """
+    offsets = tuple(offsets)
+
+    if (0, 0, 0) in offsets:
+        raise ValueError('A cell cannot be its own neighbor.')
+
+    def model(location: IVector) -> list[IVector]:
+        x, y, z = location
+        return [(x + dx, y + dy, z + dz) for (dx, dy, dz) in offsets]
+
+    model.offsets = offsets
+    return model
+
+
+def von_neumann_neighbor_model(radius: int) -> NeighborModel:
+    """Creates a neighbor model for the cells within ``radius`` steps along the axes of a cell.
+
+    A radius of 1 gives the same neighbors as ``simple_neighbor_model``.
+    """
+    span = range(-radius, radius + 1)
+    return stencil_neighbor_model(
+        xyz for xyz in product(span, span, span)
+        if 0 < sum(map(abs, xyz)) <= radius
+    )
+
+
+def moore_neighbor_model(radius: int) -> NeighborModel:
+    """Creates a neighbor model for the cells within a cube of ``radius`` around a cell.
+
+    A radius of 1 gives the same neighbors as ``cubic_neighbor_model``.
+    """
+    span = range(-radius, radius + 1)
+    return stencil_neighbor_model(xyz for xyz in product(span, span, span) if xyz != (0, 0, 0))
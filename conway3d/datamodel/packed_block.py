@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Generator
+
+import numpy as np
+
+from .cell_block import CELL_NAME, CellBlock
+from .types import IVector, T_state
+
+WORD_BITS = 64
+"""The number of cells packed into each word of a ``PackedCellBlock``."""
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """Packs a (z, y, x) boolean array into a (z, y, words) ``uint64`` array.
+
+    Cell ``x`` is stored in bit ``x % 64`` of word ``x // 64``. Bits past the end of the x axis are
+    always 0.
+    """
+    sz, sy, sx = bits.shape
+    nw = -(-sx // WORD_BITS)
+    padded = np.zeros((sz, sy, nw * WORD_BITS), dtype=np.uint8)
+    padded[:, :, :sx] = bits
+    packed = np.packbits(padded, axis=2, bitorder='little')
+
+    return packed.view('<u8').astype(np.uint64)
+
+
+def unpack_bits(words: np.ndarray, sx: int) -> np.ndarray:
+    """Unpacks a (z, y, words) ``uint64`` array into a (z, y, x) ``uint8`` array of 0s and 1s."""
+    as_bytes = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+    return np.unpackbits(as_bytes, axis=2, count=sx, bitorder='little')
+
+
+class PackedCellBlock(CellBlock[T_state]):
+    """A cell block for two-state cells that stores one bit per cell.
+
+    Cells are packed into ``uint64`` words along the x axis, giving a (z, y, words) array. A cell
+    is 0 for the first member of ``state_type`` and 1 for the second. A new block starts every cell
+    at the first member.
+    """
+    __slots__ = ('_state_type', '_states', '_ordinals')
+
+    def __init__(self,
+        size: IVector,
+        state_type: type[T_state],
+        cell_name: str = CELL_NAME
+    ):
+        """
+        Args:
+            size: The (x, y, z) dimensions of the cell block.
+            state_type: The ``Enum`` class whose members are stored in this block. It must have
+                exactly two members.
+            cell_name: Optional. The template for canonical name of a cell at a given location.
+                This should accept three integer values: z, y, and x grid space coordinates.
+                Defaults to ``CELL_NAME``.
+        """
+        states = tuple(state_type)
+
+        if len(states) != 2:
+            raise ValueError('PackedCellBlock requires exactly two states.')
+
+        sx, sy, sz = size
+        self._size = size
+        self._capacity = sx * sy * sz
+        self._cell_name = cell_name
+        self._state_type = state_type
+        self._states = states
+        self._ordinals = {state: i for (i, state) in enumerate(states)}
+        self._observer = None
+        self._back = None
+        self._cells = np.zeros((sz, sy, -(-sx // WORD_BITS)), dtype=np.uint64)
+
+    def __getitem__(self, location: IVector) -> T_state:
+        if location in self:
+            x, y, z = location
+            word = int(self._cells[z, y, x // WORD_BITS])
+            return self._states[(word >> (x % WORD_BITS)) & 1]
+
+        raise KeyError
+
+    def __setitem__(self, location: IVector, state: T_state):
+        if location in self:
+            if self._observer is not None:
+                self._observer(location, self[location], state)
+
+            x, y, z = location
+            bit = np.uint64(1 << (x % WORD_BITS))
+            if self._ordinals[state]:
+                self._cells[z, y, x // WORD_BITS] |= bit
+            else:
+                self._cells[z, y, x // WORD_BITS] &= ~bit
+        else:
+            raise KeyError
+
+    def stage(self, location: IVector, state: T_state) -> None:
+        if location in self:
+            back = self._back
+            if back is None:
+                back = self._back = self._cells.copy()
+
+            x, y, z = location
+            bit = np.uint64(1 << (x % WORD_BITS))
+            if self._ordinals[state]:
+                back[z, y, x // WORD_BITS] |= bit
+            else:
+                back[z, y, x // WORD_BITS] &= ~bit
+        else:
+            raise KeyError
+
+    def swap(self) -> None:
+        """Makes the staged states the current states of the block.
+
+        The staged words are copied into ``words`` rather than replacing it, so that the array and
+        views of it stay current. The observer is told about each cell whose state changed. Does
+        nothing if no state has been staged.
+        """
+        back = self._back
+        if back is None:
+            return
+
+        front = self._cells
+        observer = self._observer
+
+        if observer is not None:
+            states = self._states
+            (zs, ys, xs) = np.nonzero(unpack_bits(front ^ back, self._size[0]))
+            new = unpack_bits(back, self._size[0])[zs, ys, xs].tolist()
+            for (x, y, z, bit) in zip(xs.tolist(), ys.tolist(), zs.tolist(), new):
+                observer((x, y, z), states[1 - bit], states[bit])
+
+        np.copyto(front, back)
+
+    def copy(self) -> PackedCellBlock[T_state]:
+        other = PackedCellBlock(self._size, self._state_type, self._cell_name)
+        np.copyto(other._cells, self._cells)
+
+        return other
+
+    def keys(self) -> Generator[IVector]:
+        return iter(self)
+
+    def values(self) -> Iterable[T_state]:
+        states = self._states
+        return (states[i] for i in self.unpack().ravel().tolist())
+
+    def update(self, other: CellBlock[T_state]) -> None:
+        if self.size != other.size:
+            raise ValueError('CellBlock sizes do not match.')
+
+        if isinstance(other, PackedCellBlock) and other._states == self._states:
+            np.copyto(self._cells, other._cells)
+        else:
+            for (xyz, state) in zip(other.keys(), other.values()):
+                self[xyz] = state
+
+        return None
+
+    def resize(self, size: IVector, offset: IVector = (0, 0, 0), fill: T_state | None = None):
+        ordinal = 0 if fill is None else self._ordinals[fill]
+        sx, sy, sz = size
+        bits = np.full((sz, sy, sx), ordinal, dtype=np.uint8)
+        src = []
+        dst = []
+
+        for (old, new, shift) in zip((*self._cells.shape[:2], self._size[0]), (sz, sy, sx),
+                                     reversed(offset)):
+            start = max(0, shift)
+            stop = min(new, old + shift)
+            dst.append(slice(start, max(start, stop)))
+            src.append(slice(start - shift, max(start, stop) - shift))
+
+        bits[tuple(dst)] = self.unpack()[tuple(src)]
+        self._size = size
+        self._capacity = sx * sy * sz
+        self._back = None
+        self._cells = pack_bits(bits)
+
+    @property
+    def words(self) -> np.ndarray:
+        """The (z, y, words) ``uint64`` array of packed cells backing this block.
+
+        Bits past the end of the x axis must remain 0. The array is replaced when the block is
+        resized.
+        """
+        return self._cells
+
+    @property
+    def state_type(self) -> type[T_state]:
+        """The ``Enum`` class whose members are stored in this block."""
+        return self._state_type
+
+    @property
+    def states(self) -> tuple[T_state, ...]:
+        """The members of ``state_type`` indexed by their ordinal."""
+        return self._states
+
+    def ordinal_of(self, state: T_state) -> int:
+        """Returns the bit stored for the given state."""
+        return self._ordinals[state]
+
+    def pack(self, ordinals: np.ndarray) -> None:
+        """Replaces every cell from a (z, y, x) array of ordinals (0 or 1)."""
+        np.copyto(self._cells, pack_bits(ordinals))
+
+    def unpack(self) -> np.ndarray:
+        """Returns a (z, y, x) ``uint8`` array with the ordinal (0 or 1) of every cell."""
+        return unpack_bits(self._cells, self._size[0])
@@ -1 +1,11 @@
+from .bitwise import bit_sum, popcount, step_packed
+from .boundary import Boundary
+from .cycles import Cycle, CycleDetector, digest_cells
 from .driver import CellDriver
+from .hashlife import HashLife
+from .history import PopulationHistory
+from .kernels import count_neighbors, neighbor_offsets, neighbor_radius, scatter_counts
+from .neighbor_table import NeighborTable
+from .parallel import SlabExecutor, halo_slab
+from .rng import CounterRandom
+from .stream import Generation, Stage, drain, pipeline, prefetch, tap
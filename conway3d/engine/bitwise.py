@@ -0,0 +1,185 @@
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from .boundary import Boundary
+from ..datamodel import IVector
+from ..datamodel.packed_block import WORD_BITS
+
+_ONE = np.uint64(1)
+_LAST = np.uint64(WORD_BITS - 1)
+
+
+def popcount(words: np.ndarray) -> int:
+    """Returns the number of set bits in a ``uint64`` array."""
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum(dtype=np.int64))
+
+
+def _shift_axis(words: np.ndarray, d: int, axis: int, toroidal: bool) -> np.ndarray:
+    """Returns ``words`` moved so that index ``i`` along ``axis`` holds what was at ``i + d``."""
+    if d == 0:
+        return words
+
+    if toroidal:
+        return np.roll(words, -d, axis)
+
+    n = words.shape[axis]
+    shifted = np.zeros_like(words)
+    src = [slice(None)] * 3
+    dst = [slice(None)] * 3
+    src[axis] = slice(d, n) if d > 0 else slice(0, n + d)
+    dst[axis] = slice(0, n - d) if d > 0 else slice(-d, n)
+    shifted[tuple(dst)] = words[tuple(src)]
+
+    return shifted
+
+
+def _shift_x(words: np.ndarray, dx: int, sx: int, toroidal: bool) -> np.ndarray:
+    """Returns ``words`` moved so that the bit for cell ``x`` holds cell ``x + dx``, for ``dx`` of
+    -1, 0 or 1."""
+    if dx == 0:
+        return words
+
+    last = np.uint64((sx - 1) % WORD_BITS)
+
+    if dx < 0:
+        # Bit x takes bit x - 1, carrying the top bit of the previous word into bit 0.
+        carry = _shift_axis(words, -1, 2, False) >> _LAST
+        shifted = (words << _ONE) | carry
+        if toroidal:
+            shifted[:, :, 0] |= (words[:, :, -1] >> last) & _ONE
+    else:
+        # Bit x takes bit x + 1, carrying bit 0 of the next word into the top bit.
+        carry = _shift_axis(words, 1, 2, False) << _LAST
+        shifted = (words >> _ONE) | carry
+        if toroidal:
+            shifted[:, :, -1] |= (words[:, :, 0] & _ONE) << last
+
+    return shifted
+
+
+def _full_add(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def bit_sum(planes: Iterator[np.ndarray]) -> list[np.ndarray]:
+    """Adds one-bit planes together, 64 cells per word at a time.
+
+    The planes are reduced with a tree of bit-sliced full adders as they arrive, so at most two
+    planes of each weight are held at once.
+
+    Returns:
+        The bits of the sum for every cell, least significant first.
+    """
+    weights: list[list[np.ndarray]] = []
+
+    def push(plane: np.ndarray, weight: int):
+        while True:
+            if weight == len(weights):
+                weights.append([])
+
+            bucket = weights[weight]
+            bucket.append(plane)
+
+            if len(bucket) < 3:
+                return
+
+            total, plane = _full_add(*bucket)
+            bucket[:] = [total]
+            weight += 1
+
+    for plane in planes:
+        push(plane, 0)
+
+    bits = []
+    carry = None
+    for bucket in weights:
+        if carry is not None:
+            bucket = bucket + [carry]
+            carry = None
+
+        if len(bucket) == 3:
+            total, carry = _full_add(*bucket)
+        elif len(bucket) == 2:
+            total, carry = bucket[0] ^ bucket[1], bucket[0] & bucket[1]
+        else:
+            total = bucket[0]
+
+        bits.append(total)
+
+    if carry is not None:
+        bits.append(carry)
+
+    return bits
+
+
+def _count_equals(bits: list[np.ndarray], count: int) -> np.ndarray:
+    if count >> len(bits):
+        return np.zeros_like(bits[0])
+
+    matches = None
+    for (i, bit) in enumerate(bits):
+        term = bit if (count >> i) & 1 else ~bit
+        matches = term if matches is None else matches & term
+
+    return matches
+
+
+def _rule_mask(bits: list[np.ndarray], table: np.ndarray) -> np.ndarray:
+    mask = np.zeros_like(bits[0])
+
+    for count in np.flatnonzero(table).tolist():
+        mask |= _count_equals(bits, count)
+
+    return mask
+
+
+def step_packed(
+    words: np.ndarray,
+    sx: int,
+    offsets: Sequence[IVector],
+    survive_table: np.ndarray,
+    birth_table: np.ndarray,
+    boundary: Boundary = Boundary.FIXED
+) -> np.ndarray:
+    """Advances a bit-packed two-state grid by one generation.
+
+    Neighbor counts are computed with bit-sliced adders over shifted copies of the grid, so each
+    machine word counts the neighbors of 64 cells at once.
+
+    Args:
+        words: The (z, y, words) ``uint64`` array of a ``PackedCellBlock``.
+        sx: The size of the grid along the x axis.
+        offsets: The (x, y, z) offsets from a cell to each of its neighbors. They must all be
+            within 1 cell on each axis.
+        survive_table: A boolean array, indexed by neighbor count, for cells that stay alive.
+        birth_table: A boolean array, indexed by neighbor count, for cells that become alive.
+        boundary: Optional. ``TOROIDAL`` wraps the grid around on every axis, any other value
+            treats cells outside the grid as dead. Defaults to ``FIXED``.
+
+    Returns:
+        The (z, y, words) array for the next generation.
+    """
+    if any(abs(c) > 1 for offset in offsets for c in offset):
+        raise ValueError('Packed grids only support neighbors within 1 cell on each axis.')
+
+    toroidal = boundary == Boundary.TOROIDAL
+    rows = {dx: _shift_x(words, dx, sx, toroidal) for dx in {dx for (dx, _, _) in offsets}}
+
+    def planes():
+        for (dx, dy, dz) in offsets:
+            yield _shift_axis(_shift_axis(rows[dx], dy, 1, toroidal), dz, 0, toroidal)
+
+    bits = bit_sum(planes())
+    result = (words & _rule_mask(bits, survive_table)) | (~words & _rule_mask(bits, birth_table))
+
+    # Clear the bits past the end of the x axis.
+    tail = sx % WORD_BITS
+    if tail:
+        result[:, :, -1] &= np.uint64((1 << tail) - 1)
+
+    return result
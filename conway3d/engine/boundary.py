@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class Boundary(Enum):
+    """The policies for neighbors that fall outside a cell block."""
+
+    FIXED = 'fixed'
+    """Cells outside the block are always empty."""
+
+    TOROIDAL = 'toroidal'
+    """The block wraps around on every axis, so opposite faces are neighbors."""
+
+    UNBOUNDED = 'unbounded'
+    """The block grows whenever live cells come near its edge. Only supported by sparse drivers."""
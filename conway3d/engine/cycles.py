@@ -0,0 +1,153 @@
+from collections import deque
+from hashlib import blake2b
+
+import numpy as np
+
+from ..datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+
+DIGEST_SIZE = 16
+"""The size in bytes of a generation digest."""
+
+
+def digest_cells(cells: CellBlock) -> bytes:
+    """Returns a digest of the size and states of a cell block.
+
+    ``DenseCellBlock`` and ``PackedCellBlock`` instances are digested straight from their arrays.
+    Other cell blocks are digested from the names of their states, so two blocks with the same
+    states have the same digest.
+    """
+    digest = blake2b(np.asarray(cells.size, dtype=np.int64).tobytes(), digest_size=DIGEST_SIZE)
+
+    if isinstance(cells, DenseCellBlock):
+        digest.update(np.ascontiguousarray(cells.array).tobytes())
+    elif isinstance(cells, PackedCellBlock):
+        digest.update(np.ascontiguousarray(cells.words).tobytes())
+    else:
+        digest.update('\0'.join(str(state) for state in cells.values()).encode())
+
+    return digest.digest()
+
+
+class Cycle:
+    """A generation that repeats an earlier one.
+
+    Once a deterministic driver repeats a generation, every later generation repeats as well, so
+    the block loops through the generations from ``start`` onwards every ``period`` generations.
+    """
+    __slots__ = ('_start', '_period', '_population')
+
+    def __init__(self, start: int, period: int, population: int):
+        """
+        Args:
+            start: The first generation of the cycle.
+            period: The number of generations before the block repeats.
+            population: The population of the generation that was repeated.
+        """
+        self._start = start
+        self._period = period
+        self._population = population
+
+    def __eq__(self, other):
+        return isinstance(other, Cycle) and (
+            (self._start, self._period, self._population) ==
+            (other._start, other._period, other._population))
+
+    def __hash__(self):
+        return hash((self._start, self._period, self._population))
+
+    def __repr__(self):
+        return f'Cycle(start={self._start}, period={self._period}, population={self._population})'
+
+    @property
+    def start(self) -> int:
+        """The first generation of the cycle."""
+        return self._start
+
+    @property
+    def period(self) -> int:
+        """The number of generations before the block repeats."""
+        return self._period
+
+    @property
+    def population(self) -> int:
+        """The population of the generation that was repeated."""
+        return self._population
+
+    @property
+    def extinct(self) -> bool:
+        """Whether every cell in the block is empty."""
+        return self._population == 0
+
+    @property
+    def still_life(self) -> bool:
+        """Whether the block no longer changes at all. This includes extinct blocks."""
+        return self._period == 1
+
+    def phase_of(self, generation: int) -> int:
+        """Returns the generation within the first period of the cycle that ``generation`` is a
+        repeat of."""
+        if generation < self._start:
+            return generation
+
+        return self._start + (generation - self._start) % self._period
+
+
+class CycleDetector:
+    """Finds repeated generations from a bounded table of recent generation digests.
+
+    Cycles with a period no longer than ``window`` generations are found as soon as the first
+    repeat occurs.
+    """
+    __slots__ = ('_window', '_seen', '_order')
+
+    def __init__(self, window: int = 64):
+        """
+        Args:
+            window: Optional. The number of recent generations to remember. Defaults to 64.
+        """
+        if window < 1:
+            raise ValueError('A CycleDetector needs a window of at least one generation.')
+
+        self._window = window
+        self._seen: dict[bytes, int] = {}
+        self._order: deque[bytes] = deque()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def window(self) -> int:
+        """The number of recent generations remembered."""
+        return self._window
+
+    @property
+    def entries(self) -> list[tuple[int, bytes]]:
+        """The generation and digest of each remembered generation, oldest first."""
+        return [(self._seen[digest], digest) for digest in self._order]
+
+    def record(self, generation: int, digest: bytes) -> int | None:
+        """Remembers the digest of a generation.
+
+        Generations must be recorded in order.
+
+        Returns:
+            The earlier generation with the same digest, or ``None`` if there is none within the
+            window.
+        """
+        earlier = self._seen.get(digest)
+
+        if earlier is not None:
+            return earlier
+
+        if len(self._order) == self._window:
+            del self._seen[self._order.popleft()]
+
+        self._seen[digest] = generation
+        self._order.append(digest)
+
+        return None
+
+    def clear(self) -> None:
+        """Forgets every generation."""
+        self._seen.clear()
+        self._order.clear()
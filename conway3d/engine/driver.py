@@ -1,28 +1,111 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Generator
 from functools import reduce
-from typing import Generic
+from typing import Any, Generic
 
-from ..datamodel import CellBlock, IVector, NeighborModel, T_state
+import numpy as np
+
+from .bitwise import popcount
+from .boundary import Boundary
+from .cycles import Cycle, CycleDetector, digest_cells
+from .history import PopulationHistory
+from .kernels import count_neighbors, neighbor_offsets, neighbor_radius
+from .neighbor_table import NeighborTable
+from .parallel import SlabExecutor, halo_slab
+from .stream import Generation
+from ..datamodel import CellBlock, DenseCellBlock, IVector, NeighborModel, PackedCellBlock, T_state
+from ..profiling import count, instrumented, set_generation, span
 
 
 class CellDriver(ABC, Generic[T_state]):
     """A cell driver provides the rules that determines what the next state of any given cell
     within a block should be.
+
+    The driver keeps the population of its block up to date as cells change, and records the
+    population, births and deaths of every generation in ``history``. It observes cells changed
+    through ``CellBlock.__setitem__``; code that writes to the arrays of array-backed blocks
+    directly must call ``recount`` afterwards.
+
+    Implementations provide ``next_state`` for a single cell, and may also provide
+    ``next_states`` to step array-backed blocks a whole block at a time.
+
+    Deterministic drivers also remember a digest of each recent generation, so that ``cycle``
+    reports extinction, a still life or a repeating cycle as soon as one occurs.
+    """
+    __slots__ = (
+        '_generation', '_cells', '_neighbors', '_empty', '_boundary', '_offsets', '_table',
+        '_executor', '_population', '_births', '_deaths', '_history', '_cycles', '_cycle',
+        '_dirty', '_dirty_cells', '_changed')
+
+    boundaries: tuple[Boundary, ...] = (Boundary.FIXED, Boundary.TOROIDAL)
+    """The boundary policies that this driver supports."""
+
+    cycle_window: int = 64
+    """The number of recent generations remembered to find cycles."""
+
+    next_states: Callable[[np.ndarray, np.ndarray, int], np.ndarray] | None = None
+    """Optional. Determines the next state ordinals for a whole block, or a slab of one, at once.
+
+    Drivers that implement it as a method, ``next_states(counts, states, start=0)``, are stepped a
+    whole block at a time when they control a ``DenseCellBlock`` or ``PackedCellBlock``, which is
+    much faster than calling ``next_state`` for each cell. Other cell blocks still use
+    ``next_state``, so the two must agree.
+
+    ``counts`` is the (z, y, x) array with the number of neighbors of each cell that are not empty,
+    ``states`` the (z, y, x) ``uint8`` array with the ordinal of each cell's current state, as
+    stored by ``DenseCellBlock``, and ``start`` the flat index of the first cell in ``states`` when
+    it is a slab of the block. It returns a ``uint8`` array of the same shape with the ordinal of
+    each cell's next state. Each cell must depend only on its own count and state, so that slabs
+    can run in parallel.
     """
-    __slots__ = ('_generation', '_cells', '_neighbors', '_empty',)
 
-    def __init__(self, cells: CellBlock[T_state], neighbors: NeighborModel, empty_state: T_state):
+    def __init__(self,
+        cells: CellBlock[T_state],
+        neighbors: NeighborModel,
+        empty_state: T_state,
+        boundary: Boundary = Boundary.FIXED,
+        executor: SlabExecutor | None = None
+    ):
         """
         Args:
             neighbors: The function this driver should use to determine how many neighbors a cell
                 has.
             empty_state: The state that indicates that a cell is empty and should not be counted in
                 the population.
+            boundary: Optional. The policy for neighbors that fall outside the cell block. Defaults
+                to ``Boundary.FIXED``.
+            executor: Optional. Splits whole-block steps into slabs that run in parallel. Defaults
+                to ``None``, which runs them serially.
         """
+        if boundary not in self.boundaries:
+            raise ValueError(f'{type(self).__name__} does not support {boundary} boundaries.')
+
+        offsets = neighbor_offsets(neighbors)
+
+        if boundary == Boundary.TOROIDAL and offsets is not None:
+            width = 2 * neighbor_radius(offsets) + 1
+            if min(cells.size) < width:
+                raise ValueError(f'Toroidal cell blocks must be at least {width} cells wide.')
+
         self._generation = 0
         self._cells = cells
         self._neighbors = neighbors
         self._empty = empty_state
+        self._boundary = boundary
+        self._offsets = offsets
+        self._table: NeighborTable | None = None
+        self._executor = executor
+        self._births = 0
+        self._deaths = 0
+        self._history = PopulationHistory()
+        self._population = self.count_population()
+        self._cycles: CycleDetector | None = CycleDetector(self.cycle_window)
+        self._cycle: Cycle | None = None
+        self._dirty: list[np.ndarray] = []
+        self._dirty_cells: list[int] = []
+        self._changed: np.ndarray | None = None
+
+        cells.observe(self._cell_changed)
 
     @property
     def generation(self) -> int:
@@ -49,46 +132,164 @@ class CellDriver(ABC, Generic[T_state]):
         """The function this driver should use to determine how many neighbors a cell has."""
         return self._neighbors
 
+    @property
+    def boundary(self) -> Boundary:
+        """The policy for neighbors that fall outside the cell block."""
+        return self._boundary
+
+    @property
+    def executor(self) -> SlabExecutor | None:
+        """Splits whole-block steps into slabs that run in parallel, if set."""
+        return self._executor
+
+    @property
+    def neighbor_table(self) -> NeighborTable:
+        """The neighbors of every cell in the block, compiled from ``neighbors``.
+
+        The table is compiled the first time it is needed and again whenever the block changes
+        size.
+        """
+        if self._table is None or self._table.size != self._cells.size:
+            self._table = NeighborTable.compile(self._neighbors, self._cells.size, self._boundary)
+
+        return self._table
+
     def get_neighbor_locations(self, location: IVector) -> list[IVector]:
         """Returns the grid coordinates of the neighbors of the given ``location``.
 
-        Coordinates that fall outside the cell block's boundary are filtered out.
+        Coordinates that fall outside the cell block's boundary are wrapped around for a
+        ``TOROIDAL`` boundary and filtered out otherwise.
+
+        Neighbor models that declare their ``offsets`` are applied to the cell directly. Other
+        models are read from ``neighbor_table`` once it has been compiled for the block, and are
+        called for the cell otherwise.
 
         Args:
             location: The location of the cell to inspect.
         """
-        if location not in self._cells:
+        cells = self._cells
+
+        if location not in cells:
             raise ValueError('Given location is not inside cell block boundaries.')
 
-        # Filter out invalid locations.
-        neighbors = filter(
-            lambda xyz: xyz in self._cells,
-            self._neighbors(location)
-        )
+        x, y, z = location
+        sx, sy, sz = cells.size
+        table = self._table
+
+        if self._offsets is None and table is not None and table.size == cells.size:
+            sxy = sx * sy
+            return [
+                (i % sx, (i // sx) % sy, i // sxy)
+                for i in table.neighbors_of((z * sy + y) * sx + x).tolist()
+            ]
+
+        if self._offsets is not None:
+            candidates = [(x + dx, y + dy, z + dz) for (dx, dy, dz) in self._offsets]
+        else:
+            candidates = self._neighbors(location)
+
+        if self._boundary == Boundary.TOROIDAL:
+            # Duplicates are dropped, as they are from ``neighbor_table``.
+            return list(dict.fromkeys((nx % sx, ny % sy, nz % sz) for (nx, ny, nz) in candidates))
+
+        return list(dict.fromkeys(
+            (nx, ny, nz) for (nx, ny, nz) in candidates
+            if 0 <= nx < sx and 0 <= ny < sy and 0 <= nz < sz
+        ))
+
+    def count_neighbors(self, occupied: np.ndarray) -> np.ndarray:
+        """Counts the occupied neighbors of every cell in the block at once.
+
+        Neighbor models that declare their ``offsets`` are counted by shifting the whole grid,
+        any other model is counted with ``neighbor_table``.
+
+        Args:
+            occupied: A (z, y, x) boolean array that is ``True`` for cells that should be counted.
+
+        Returns:
+            A (z, y, x) array with the neighbor count for each cell.
+        """
+        if self._offsets is not None:
+            return count_neighbors(occupied, self._offsets, self._boundary)
+
+        return self.neighbor_table.count(occupied)
 
-        return list(neighbors)
+    def step_states(
+        self,
+        states: np.ndarray,
+        occupied: np.ndarray,
+        next_states: Callable[[np.ndarray, np.ndarray, int], np.ndarray]
+    ) -> np.ndarray:
+        """Counts neighbors and determines the next states for every cell in the block at once.
 
-    def get_neighbors(self, location: IVector) -> dict[IVector, T_state]:
+        When the driver has an ``executor`` and its neighbor model declares ``offsets``, the block
+        is split into z slabs, each counted with a halo of neighboring rows, and the slabs run in
+        parallel. The result is identical to a serial step.
+
+        Args:
+            states: The (z, y, x) array of current states.
+            occupied: A (z, y, x) boolean array that is ``True`` for cells that should be counted.
+            next_states: Returns the next states of a slab from its neighbor counts, its current
+                states and the flat index of its first cell. It must treat each cell independently.
+
+        Returns:
+            A new (z, y, x) array of next states.
+        """
+        if self._executor is None or self._offsets is None:
+            with span('driver.count_neighbors'):
+                counts = self.count_neighbors(occupied)
+            with span('driver.next_states'):
+                return next_states(counts, states, 0)
+
+        offsets = self._offsets
+        radius = neighbor_radius(offsets)
+        toroidal = self._boundary == Boundary.TOROIDAL
+        plane = states.shape[1] * states.shape[2]
+        result = np.empty_like(states)
+
+        def step_slab(start: int, stop: int):
+            halo, row = halo_slab(occupied, start, stop, radius, toroidal)
+            counts = count_neighbors(halo, offsets, self._boundary)[row:row + stop - start]
+            result[start:stop] = next_states(counts, states[start:stop], start * plane)
+
+        with span('driver.step_slabs'):
+            self._executor.map(step_slab, len(states))
+        return result
+
+    def get_neighbors(
+        self,
+        location: IVector,
+        cells: CellBlock[T_state] | None = None
+    ) -> dict[IVector, T_state]:
         """Get a cell's neighboring cells.
 
         Args:
             location: The location of the cell to inspect.
+            cells: Optional. The cell block to read neighbor states from. Defaults to the block
+                this driver is controlling.
 
         Returns:
             A dictionary with neighbor locations (``IVector``) as keys and the cell states
             (``T_state``) as values. This will also include cells that are empty.
         """
+        cells = self._cells if cells is None else cells
+
         return {
-            loc: self._cells[loc]
+            loc: cells[loc]
             for loc in self.get_neighbor_locations(location)
         }
 
-    def get_neighbor_count(self, location: IVector) -> int:
+    def get_neighbor_count(self, location: IVector, cells: CellBlock[T_state] | None = None) -> int:
         """Returns the number of non-empty cells that are neighbors to the given location.
+
+        Args:
+            location: The location of the cell to inspect.
+            cells: Optional. The cell block to read neighbor states from. Defaults to the block
+                this driver is controlling.
         """
         return reduce(
             lambda x, state: x + (0 if state == self._empty else 1),
-            self.get_neighbors(location).values(), 0
+            self.get_neighbors(location, cells).values(), 0
         )
 
     @property
@@ -96,16 +297,13 @@ class CellDriver(ABC, Generic[T_state]):
         """The number of cells in the block that are not "empty."
 
         A cell is considered empty if its state is equal to the state returned by the driver's
-        ``empty_state()`` method. Subclasses may override this method to customize how the
-        population is counted.
+        ``empty_state()`` method. The count is maintained as cells change, so reading it does not
+        scan the block.
 
         Returns:
             The population count.
         """
-        return reduce(
-            lambda p, c: p + (1 if c != self._empty else 0),
-            self._cells.values(), 0
-        )
+        return self._population
 
     @property
     def density(self) -> float:
@@ -115,29 +313,409 @@ class CellDriver(ABC, Generic[T_state]):
             A value from 0 to 1 representing the ratio of populated (not "empty") cells to the cell
             block's capacity.
         """
-        return self.population / self._cells.capacity
+        return self._population / self._cells.capacity
+
+    @property
+    def history(self) -> PopulationHistory:
+        """The population, births and deaths recorded for every generation since the block was
+        last populated."""
+        return self._history
+
+    @property
+    def changed(self) -> np.ndarray | None:
+        """The sorted flat indices, in the order the cell block iterates over its cells, of the
+        cells whose state changed in the last generation.
+
+        This is ``None`` until the first generation after the block is populated, when every cell
+        should be treated as changed.
+        """
+        return self._changed
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether each generation depends only on the one before it.
+
+        Cycles are only detected for deterministic drivers. Subclasses that add randomness to
+        ``next_generation`` must return ``False``.
+        """
+        return True
+
+    @property
+    def cycle(self) -> Cycle | None:
+        """The cycle the block has settled into, or ``None`` if no generation since the block was
+        last populated has repeated an earlier one within ``cycle_window`` generations."""
+        return self._cycle
+
+    def detect_cycles(self, window: int | None) -> None:
+        """Sets the number of recent generations remembered to find cycles.
+
+        Args:
+            window: The number of generations to remember, or ``None`` to stop detecting cycles.
+        """
+        self._cycles = None if window is None else CycleDetector(window)
+        self._cycle = None
+
+    def digest(self) -> bytes:
+        """Returns a digest of the current generation used to find cycles.
+
+        Subclasses may override this method when they can digest the block more cheaply.
+        """
+        return digest_cells(self._cells)
+
+    def cycle_states(self) -> list[CellBlock[T_state]]:
+        """Returns a copy of the cell block for each generation of ``cycle``, starting with the
+        current one.
+
+        The driver is stepped through one period to collect them, which leaves the block in the
+        state it started in.
+        """
+        if self._cycle is None:
+            raise ValueError('No cycle has been detected.')
+
+        states = []
+        for _ in range(self._cycle.period):
+            states.append(self._cells.copy())
+            self.next_generation()
+
+        return states
+
+    def _record_digest(self) -> None:
+        if self._cycles is None or self._cycle is not None or not self.deterministic:
+            return
+
+        with span('driver.digest'):
+            earlier = self._cycles.record(self._generation, self.digest())
+        if earlier is not None:
+            self._cycle = Cycle(earlier, self._generation - earlier, self._population)
+
+    def parameters(self) -> dict[str, Any]:
+        """Returns the settings of the driver that ``snapshot`` should keep, as JSON serializable
+        values.
+
+        Subclasses with settings of their own extend this method and ``set_parameters``.
+        """
+        return {}
+
+    def set_parameters(self, parameters: dict[str, Any]) -> None:
+        """Applies settings returned by ``parameters``. Settings that cannot be changed once the
+        driver exists must match the driver's own, or a ``ValueError`` is raised."""
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns a copy of everything needed to ``restore`` the driver to its current generation.
+
+        The snapshot holds the state ordinal of every cell, the generation count, the population,
+        ``history``, the digests of recent generations, ``cycle`` and ``parameters``. Random
+        numbers are a function of the seed and generation, so they need no state of their own.
+        Only ``DenseCellBlock`` and ``PackedCellBlock`` instances can be snapshotted.
+
+        It should be taken between generations. Copying the cells is the only work proportional to
+        the size of the block.
+        """
+        cells = self._cells
+
+        if isinstance(cells, DenseCellBlock):
+            ordinals = cells.array.copy()
+        elif isinstance(cells, PackedCellBlock):
+            ordinals = cells.unpack()
+        else:
+            raise TypeError('Only DenseCellBlock and PackedCellBlock can be snapshotted.')
+
+        cycle = self._cycle
+
+        return {
+            'driver': type(self).__name__,
+            'generation': self._generation,
+            'size': cells.size,
+            'cells': ordinals,
+            'population': self._population,
+            'history': self._history.rows.copy(),
+            'digests': [] if self._cycles is None else self._cycles.entries,
+            'cycle': None if cycle is None else (cycle.start, cycle.period, cycle.population),
+            'parameters': self.parameters(),
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        """Returns the driver to the generation a ``snapshot`` was taken of.
+
+        The snapshot must come from a driver of the same type. The cell block is resized to the
+        size it had, and every cell counts as changed in the next generation.
+        """
+        if snapshot['driver'] != type(self).__name__:
+            raise ValueError(f'Cannot restore a {snapshot["driver"]} snapshot into a '
+                             f'{type(self).__name__}.')
+
+        self.set_parameters(snapshot['parameters'])
+
+        cells = self._cells
+        size = tuple(snapshot['size'])
+        if cells.size != size:
+            cells.resize(size, fill=self._empty)
+
+        if isinstance(cells, DenseCellBlock):
+            cells.array[...] = snapshot['cells']
+        elif isinstance(cells, PackedCellBlock):
+            cells.pack(snapshot['cells'])
+        else:
+            raise TypeError('Only DenseCellBlock and PackedCellBlock can be restored.')
+
+        self._generation = snapshot['generation']
+        self._population = snapshot['population']
+        self._births = 0
+        self._deaths = 0
+        self._history.clear()
+        self._history.extend(snapshot['history'])
+        self._dirty = []
+        self._dirty_cells = []
+        self._changed = None
+
+        cycle = snapshot['cycle']
+        self._cycle = None if cycle is None else Cycle(*cycle)
+
+        if self._cycles is not None:
+            self._cycles.clear()
+            for (generation, digest) in snapshot['digests']:
+                self._cycles.record(generation, digest)
+
+    def count_population(self) -> int:
+        """Counts the cells in the block that are not "empty" by scanning the whole block.
+
+        Subclasses may override this method to customize how the population is counted.
+        """
+        cells = self._cells
+
+        if isinstance(cells, DenseCellBlock):
+            return int(np.count_nonzero(cells.array != cells.ordinal_of(self._empty)))
+
+        if isinstance(cells, PackedCellBlock):
+            full = popcount(cells.words)
+            return full if cells.ordinal_of(self._empty) == 0 else cells.capacity - full
+
+        return reduce(
+            lambda p, c: p + (1 if c != self._empty else 0),
+            cells.values(), 0
+        )
+
+    def recount(self) -> None:
+        """Rescans the block to correct the population after changes that the driver could not
+        observe."""
+        self._population = self.count_population()
+
+    def _cell_changed(self, location: IVector, old: T_state | None, new: T_state) -> None:
+        if old != new:
+            x, y, z = location
+            sx, sy, _ = self._cells.size
+            self._dirty_cells.append((z * sy + y) * sx + x)
+
+        was_empty = old == self._empty
+        is_empty = new == self._empty
+
+        if was_empty and not is_empty:
+            self._births += 1
+            self._population += 1
+        elif is_empty and not was_empty:
+            self._deaths += 1
+            self._population -= 1
+
+    def tally(self, births: int, deaths: int) -> None:
+        """Records cells that changed without passing through ``CellBlock.__setitem__``.
+
+        Drivers that write generations straight into the arrays of array-backed blocks call this
+        with the number of cells that became populated and that became empty.
+        """
+        self._births += births
+        self._deaths += deaths
+        self._population += births - deaths
+
+    def mark_changed(self, indices: np.ndarray) -> None:
+        """Records cells whose state changed without passing through ``CellBlock.__setitem__``.
+
+        Args:
+            indices: The sorted flat indices of the changed cells.
+        """
+        self._dirty.append(np.asarray(indices, dtype=np.intp))
+
+    def begin_generation(self) -> None:
+        """Tags the spans and counters recorded from now on with the generation that is about to
+        be computed.
+
+        Implementations of ``next_generation`` call this before they compute anything, so that
+        the spans inside a step are tagged with the same generation as the step itself.
+        """
+        set_generation(self._generation + 1)
 
+    def end_generation(self) -> None:
+        """Advances the generation count and records the generation in ``history``.
+
+        Changes made to the block since the previous generation are counted as births, deaths and
+        ``changed`` cells of this one.
+        """
+        self._generation += 1
+        set_generation(self._generation)
+        self._history.append(self._generation, self._population, self._births, self._deaths)
+        self._births = 0
+        self._deaths = 0
+
+        dirty = self._dirty
+        if self._dirty_cells:
+            dirty.append(np.array(self._dirty_cells, dtype=np.intp))
+            self._changed = np.unique(np.concatenate(dirty))
+        elif len(dirty) == 1:
+            # A single batch from mark_changed is already sorted and unique.
+            self._changed = dirty[0]
+        else:
+            self._changed = np.unique(np.concatenate(dirty)) if dirty else np.empty(0, np.intp)
+
+        self._dirty = []
+        self._dirty_cells = []
+        count('driver.changed', len(self._changed))
+        self._record_digest()
+
+    def start_history(self) -> None:
+        """Clears ``history`` and ``cycle`` and records the current generation as the first of
+        both."""
+        set_generation(self._generation)
+        self._births = 0
+        self._deaths = 0
+        self._history.clear()
+        self._history.append(self._generation, self._population, 0, 0)
+        self._cycle = None
+        self._dirty = []
+        self._dirty_cells = []
+        self._changed = None
+
+        if self._cycles is not None:
+            self._cycles.clear()
+            self._record_digest()
+
+    @instrumented('driver.populate')
     def populate(self) -> None:
         """Populates each cell in the cell block with an initial state determined by the
         implementation.
 
-        Implementations may override this method to customize the initial population.
+        Implementations may override this method to customize the initial population. They must
+        leave ``population`` correct and call ``start_history`` when they are done.
         """
         for xyz in self._cells:
             self._cells[xyz] = self.first_state(xyz, self._cells)
 
+        self.start_history()
+
+    @instrumented('driver.next_generation')
     def next_generation(self):
         """Progress this block to its next generation.
 
         The existing cell block will be updated in-place with new cell states. This means that
         existing references to the cell block will have access to the most current state.
+
+        Drivers that implement ``next_states`` have ``DenseCellBlock`` and ``PackedCellBlock``
+        instances updated with it, a whole block at a time. Otherwise, next states are read from
+        the block and staged in its back buffer, which is swapped in once every cell has been
+        computed, so no copy of the block is made.
         """
-        current = self._cells.copy()
+        self.begin_generation()
+        cells = self._cells
 
-        for xyz in self._cells:
-            self._cells[xyz] = self.next_state(xyz, current)
+        if (self.next_states is not None
+                and isinstance(cells, (DenseCellBlock, PackedCellBlock))):
+            self.step_block()
+            return self.end_generation()
 
-        self._generation += 1
+        count('driver.next_state', cells.capacity)
+
+        if self._offsets is None:
+            # Every cell is about to look up its neighbors, so the model is compiled once for all.
+            self.neighbor_table
+
+        for xyz in cells:
+            cells.stage(xyz, self.next_state(xyz, cells))
+
+        with span('driver.swap'):
+            cells.swap()
+
+        self.end_generation()
+
+    def step_block(self) -> None:
+        """Updates a ``DenseCellBlock`` or ``PackedCellBlock`` with ``next_states``, and tallies
+        the cells that were born, died and changed.
+
+        This does not end the generation.
+        """
+        cells = self._cells
+        packed = isinstance(cells, PackedCellBlock)
+        states = cells.unpack() if packed else cells.array
+        self.write_states(states, self.step_states(states, self.occupied(states), self.next_states))
+
+        if packed:
+            cells.pack(states)
+
+    def occupied(self, states: np.ndarray) -> np.ndarray:
+        """Returns a boolean array that is ``True`` for the cells that ``step_block`` counts as
+        neighbors.
+
+        Every cell that is not empty is counted. Drivers whose rules count only some states may
+        override this.
+
+        Args:
+            states: A (z, y, x) array of state ordinals.
+        """
+        return states != self._cells.ordinal_of(self._empty)
+
+    def write_states(self, states: np.ndarray, result: np.ndarray) -> None:
+        """Copies ``result`` into ``states`` and tallies the cells that were born, died and
+        changed.
+
+        Args:
+            states: The (z, y, x) array of state ordinals to update, such as
+                ``DenseCellBlock.array``.
+            result: The (z, y, x) array of next state ordinals.
+        """
+        empty = self._cells.ordinal_of(self._empty)
+        alive = states != empty
+        now_alive = result != empty
+        self.tally(int(np.count_nonzero(now_alive & ~alive)),
+                   int(np.count_nonzero(alive & ~now_alive)))
+        self.mark_changed(np.flatnonzero(states != result))
+        states[...] = result
+
+    def current(self) -> Generation:
+        """Returns a read-only view of the current generation.
+
+        The view shares the cell block's arrays, so it is only valid until the block changes.
+        """
+        history = self._history
+        births, deaths = (0, 0)
+        if len(history) and history.generations[-1] == self._generation:
+            births, deaths = history.births[-1].item(), history.deaths[-1].item()
+
+        return Generation(self._generation, self._population, births, deaths, self._changed,
+                          self._cycle, self._cells)
+
+    def iter_generations(self, count: int | None = None) -> Generator[Generation]:
+        """Yields the current generation, then advances the block and yields each generation after
+        it.
+
+        The driver only advances when the next generation is requested, so a slow consumer holds
+        back the simulation rather than letting generations pile up. Each generation is a view
+        that is only valid until the next one is requested; ``Generation.detach`` keeps a copy.
+
+        Args:
+            count: Optional. The number of generations to advance. Defaults to ``None``, which
+                advances until the consumer stops.
+        """
+        yield self.current()
+
+        advanced = 0
+        while count is None or advanced < count:
+            self.next_generation()
+            advanced += 1
+            yield self.current()
+
+    def run(self, generations: int) -> Generator[Generation]:
+        """Yields the current generation and the next ``generations`` generations.
+
+        This is ``iter_generations`` with a limit.
+        """
+        return self.iter_generations(generations)
 
     def reset(self):
         """Sets the generation count to 0 and invokes ``populate``."""
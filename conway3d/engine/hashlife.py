@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from .kernels import count_neighbors
+from ..datamodel import IVector
+
+_BASE_LEVEL = 2
+"""The level of the smallest node whose future is computed directly: a 4x4x4 cube."""
+
+
+class _Node:
+    """A cube of 2**level cells on each side.
+
+    Level 0 nodes are single cells. Every other node has 8 children, one for each octant, indexed
+    by ``(z << 2) | (y << 1) | x`` where each axis is 0 for the lower half and 1 for the upper half.
+    Nodes are canonical: two nodes with the same cells are the same object.
+    """
+    __slots__ = ('level', 'children', 'population', '__weakref__')
+
+    def __init__(self, level: int, children: tuple[_Node, ...] | None, population: int):
+        self.level = level
+        self.children = children
+        self.population = population
+
+
+class HashLife:
+    """A HashLife universe for two-state, outer-totalistic rules.
+
+    The universe is an unbounded octree of canonical nodes. The future of each node is memoized,
+    so a pattern that repeats in space or time is only simulated once, and ``jump`` can advance
+    the universe by 2**k generations in one call.
+
+    The universe is centered on (0, 0, 0) and grows as the pattern does. Neighbors must be within
+    1 cell on each axis, and a dead cell with no neighbors must stay dead.
+    """
+    __slots__ = (
+        '_offsets', '_survive', '_birth', '_cache_size', '_nodes', '_empty', '_results', '_cells',
+        '_root', '_generation')
+
+    def __init__(self,
+        offsets: Sequence[IVector],
+        survive_table: np.ndarray,
+        birth_table: np.ndarray,
+        cache_size: int = 1 << 18
+    ):
+        """
+        Args:
+            offsets: The (x, y, z) offsets from a cell to each of its neighbors.
+            survive_table: A boolean array, indexed by neighbor count, for cells that stay alive.
+            birth_table: A boolean array, indexed by neighbor count, for cells that become alive.
+            cache_size: Optional. The number of memoized results to keep. The least recently used
+                results are evicted first.
+        """
+        if any(abs(c) > 1 for offset in offsets for c in offset):
+            raise ValueError('HashLife only supports neighbors within 1 cell on each axis.')
+
+        if birth_table[0]:
+            raise ValueError('HashLife does not support rules with birth on 0 neighbors.')
+
+        self._offsets = list(offsets)
+        self._survive = np.asarray(survive_table, dtype=bool)
+        self._birth = np.asarray(birth_table, dtype=bool)
+        self._cache_size = cache_size
+        self._nodes: WeakValueDictionary[tuple[_Node, ...], _Node] = WeakValueDictionary()
+        self._results: OrderedDict[tuple[_Node, int], _Node] = OrderedDict()
+        self._cells = (_Node(0, None, 0), _Node(0, None, 1))
+        self._empty = [self._cells[0]]
+        self._root = self._empty_node(_BASE_LEVEL + 1)
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """The number of generations the universe has been advanced."""
+        return self._generation
+
+    @property
+    def population(self) -> int:
+        """The number of live cells in the universe."""
+        return self._root.population
+
+    @property
+    def level(self) -> int:
+        """The level of the root node. The universe spans 2**level cells on each side."""
+        return self._root.level
+
+    @property
+    def cache_size(self) -> int:
+        """The number of memoized results to keep."""
+        return self._cache_size
+
+    @property
+    def cached(self) -> int:
+        """The number of memoized results currently kept."""
+        return len(self._results)
+
+    def clear_cache(self) -> None:
+        """Forgets every memoized result. Nodes that are no longer used are freed."""
+        self._results.clear()
+
+    def load(self, alive: np.ndarray, origin: IVector = (0, 0, 0)) -> None:
+        """Replaces the universe with the live cells of a (z, y, x) array and resets the
+        generation count to 0.
+
+        Args:
+            alive: A (z, y, x) array that is ``True`` for live cells.
+            origin: Optional. The (x, y, z) location in the universe of ``alive[0, 0, 0]``.
+        """
+        z, y, x = np.nonzero(alive)
+        ox, oy, oz = origin
+        coords = np.stack((x + ox, y + oy, z + oz), axis=1).astype(np.int64)
+        extent = int(max(np.abs(coords).max(initial=0), np.abs(coords + 1).max(initial=0)))
+        level = max(_BASE_LEVEL + 1, extent.bit_length() + 1)
+        half = 1 << (level - 1)
+
+        self._root = self._build(level, coords + half)
+        self._generation = 0
+
+    def read(self, origin: IVector, size: IVector) -> np.ndarray:
+        """Returns the cells of a region of the universe.
+
+        Args:
+            origin: The (x, y, z) location of the first cell of the region.
+            size: The (x, y, z) dimensions of the region.
+
+        Returns:
+            A (z, y, x) boolean array that is ``True`` for live cells.
+        """
+        sx, sy, sz = size
+        out = np.zeros((sz, sy, sx), dtype=bool)
+        half = 1 << (self._root.level - 1)
+        ox, oy, oz = origin
+        self._paint(self._root, (-half - ox, -half - oy, -half - oz), out)
+
+        return out
+
+    def jump(self, k: int) -> None:
+        """Advances the universe by 2**k generations."""
+        if k < 0:
+            raise ValueError('Jumps must be at least 1 generation.')
+
+        root = self._root
+        # The pattern must sit in the inner quarter of the root, with room to grow for 2**k
+        # generations, before the center half of the root can be advanced.
+        while root.level < k + _BASE_LEVEL + 1 or (
+                self._center(self._center(root)).population != root.population):
+            root = self._expand(root)
+
+        self._root = self._step(root, k)
+        self._generation += 1 << k
+
+    def advance(self, generations: int) -> None:
+        """Advances the universe by any number of generations with a ``jump`` for each set bit."""
+        if generations < 0:
+            raise ValueError('The universe cannot be advanced backwards.')
+
+        k = 0
+        while generations:
+            if generations & 1:
+                self.jump(k)
+            generations >>= 1
+            k += 1
+
+    def _node(self, children: tuple[_Node, ...]) -> _Node:
+        node = self._nodes.get(children)
+
+        if node is None:
+            node = _Node(
+                children[0].level + 1, children, sum(child.population for child in children))
+            self._nodes[children] = node
+
+        return node
+
+    def _empty_node(self, level: int) -> _Node:
+        while len(self._empty) <= level:
+            self._empty.append(self._node((self._empty[-1],) * 8))
+
+        return self._empty[level]
+
+    def _build(self, level: int, coords: np.ndarray) -> _Node:
+        """Builds a node from the (x, y, z) coordinates of its live cells, relative to its lowest
+        corner."""
+        if not len(coords):
+            return self._empty_node(level)
+
+        if level == 0:
+            return self._cells[1]
+
+        half = 1 << (level - 1)
+        upper = coords >= half
+        octants = (upper[:, 2].astype(np.intp) << 2) | (upper[:, 1] << 1) | upper[:, 0]
+        local = coords - upper * half
+
+        return self._node(tuple(self._build(level - 1, local[octants == i]) for i in range(8)))
+
+    def _paint(self, node: _Node, corner: IVector, out: np.ndarray) -> None:
+        """Sets the live cells of ``node`` in ``out``, where ``corner`` is the (x, y, z) index in
+        ``out`` of the node's lowest corner."""
+        if not node.population:
+            return
+
+        x, y, z = corner
+        side = 1 << node.level
+        sz, sy, sx = out.shape
+
+        if x >= sx or y >= sy or z >= sz or x + side <= 0 or y + side <= 0 or z + side <= 0:
+            return
+
+        if node.level == 0:
+            out[z, y, x] = True
+            return
+
+        half = side >> 1
+        for (i, child) in enumerate(node.children):
+            self._paint(child, (x + (i & 1) * half, y + (i >> 1 & 1) * half, z + (i >> 2) * half),
+                        out)
+
+    def _expand(self, node: _Node) -> _Node:
+        """Returns a node one level up with ``node`` at its center."""
+        empty = self._empty_node(node.level - 1)
+
+        return self._node(tuple(
+            self._node(tuple(child if j == 7 - i else empty for j in range(8)))
+            for (i, child) in enumerate(node.children)
+        ))
+
+    def _center(self, node: _Node) -> _Node:
+        """Returns the node one level down at the center of ``node``."""
+        return self._node(tuple(child.children[7 - i] for (i, child) in enumerate(node.children)))
+
+    def _grid(self, node: _Node) -> list[list[list[_Node]]]:
+        """Returns the grandchildren of ``node`` as a 4x4x4 [z][y][x] grid."""
+        grid = [[[None] * 4 for _ in range(4)] for _ in range(4)]
+
+        for (i, child) in enumerate(node.children):
+            for (j, grandchild) in enumerate(child.children):
+                x = (i & 1) * 2 + (j & 1)
+                y = (i >> 1 & 1) * 2 + (j >> 1 & 1)
+                z = (i >> 2) * 2 + (j >> 2)
+                grid[z][y][x] = grandchild
+
+        return grid
+
+    def _combine(self, grid: list[list[list[_Node]]], x: int, y: int, z: int) -> _Node:
+        """Returns the node made from the 2x2x2 block of ``grid`` starting at (x, y, z)."""
+        return self._node(tuple(
+            grid[z + (i >> 2)][y + (i >> 1 & 1)][x + (i & 1)] for i in range(8)))
+
+    def _step(self, node: _Node, k: int) -> _Node:
+        """Returns the center half of ``node`` advanced by 2**k generations.
+
+        ``k`` must be no more than ``node.level - 2``.
+        """
+        if not node.population:
+            return self._empty_node(node.level - 1)
+
+        key = (node, k)
+        result = self._results.get(key)
+
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if node.level == _BASE_LEVEL:
+            result = self._step_base(node)
+        else:
+            # Advance 27 overlapping sub-cubes to get a 3x3x3 grid of nodes a quarter of this one's
+            # size, then advance the 8 overlapping 2x2x2 blocks of that grid. When the jump is
+            # shorter than the largest this level allows, the first stage only takes centers.
+            grid = self._grid(node)
+            full = k == node.level - 2
+            inner = [[[
+                self._step(sub, k - 1) if full else self._center(sub)
+                for sub in (self._combine(grid, x, y, z) for x in range(3))]
+                for y in range(3)]
+                for z in range(3)]
+            rest = k - 1 if full else k
+            result = self._node(tuple(
+                self._step(self._combine(inner, i & 1, i >> 1 & 1, i >> 2), rest)
+                for i in range(8)))
+
+        self._results[key] = result
+        if len(self._results) > self._cache_size:
+            self._results.popitem(last=False)
+
+        return result
+
+    def _step_base(self, node: _Node) -> _Node:
+        """Advances the center 2x2x2 cells of a 4x4x4 node by one generation."""
+        cells = np.zeros((4, 4, 4), dtype=bool)
+        self._paint(node, (0, 0, 0), cells)
+        counts = count_neighbors(cells, self._offsets)[1:3, 1:3, 1:3]
+        alive = np.where(cells[1:3, 1:3, 1:3], self._survive[counts], self._birth[counts])
+
+        return self._node(tuple(
+            self._cells[int(alive[i >> 2, i >> 1 & 1, i & 1])] for i in range(8)))
@@ -0,0 +1,76 @@
+import numpy as np
+
+_COLUMNS = ('generation', 'population', 'births', 'deaths')
+
+
+class PopulationHistory:
+    """A compact per-generation record of population, births and deaths.
+
+    Rows are stored in a single ``int64`` array that doubles in size as it fills, so appending is
+    amortized O(1) and each column can be read as an array without copying.
+    """
+    __slots__ = ('_rows', '_length')
+
+    def __init__(self, capacity: int = 64):
+        """
+        Args:
+            capacity: Optional. The number of rows to allocate up front.
+        """
+        self._rows = np.zeros((max(1, capacity), len(_COLUMNS)), dtype=np.int64)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, generation: int, population: int, births: int, deaths: int) -> None:
+        """Adds a row for the given generation."""
+        if self._length == len(self._rows):
+            self._rows = np.concatenate((self._rows, np.zeros_like(self._rows)))
+
+        self._rows[self._length] = (generation, population, births, deaths)
+        self._length += 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        """Adds an (n, 4) array of (generation, population, births, deaths) rows."""
+        rows = np.asarray(rows, dtype=np.int64).reshape((-1, len(_COLUMNS)))
+        end = self._length + len(rows)
+
+        if end > len(self._rows):
+            grown = np.zeros((max(end, 2 * len(self._rows)), len(_COLUMNS)), dtype=np.int64)
+            grown[:self._length] = self._rows[:self._length]
+            self._rows = grown
+
+        self._rows[self._length:end] = rows
+        self._length = end
+
+    def clear(self) -> None:
+        """Removes every row."""
+        self._length = 0
+
+    def _column(self, name: str) -> np.ndarray:
+        return self._rows[:self._length, _COLUMNS.index(name)]
+
+    @property
+    def rows(self) -> np.ndarray:
+        """An (n, 4) array of (generation, population, births, deaths) rows."""
+        return self._rows[:self._length]
+
+    @property
+    def generations(self) -> np.ndarray:
+        """The generation of each row."""
+        return self._column('generation')
+
+    @property
+    def population(self) -> np.ndarray:
+        """The population at the end of each generation."""
+        return self._column('population')
+
+    @property
+    def births(self) -> np.ndarray:
+        """The number of empty cells that became populated in each generation."""
+        return self._column('births')
+
+    @property
+    def deaths(self) -> np.ndarray:
+        """The number of populated cells that became empty in each generation."""
+        return self._column('deaths')
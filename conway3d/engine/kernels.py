@@ -0,0 +1,131 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from .boundary import Boundary
+from ..datamodel import IVector, NeighborModel
+
+
+def neighbor_offsets(neighbors: NeighborModel) -> list[IVector] | None:
+    """Returns the offsets from any cell to its neighbors, or ``None`` if ``neighbors`` does not
+    declare them with an ``offsets`` attribute.
+
+    The neighbor models provided by ``conway3d.datamodel`` all declare their offsets.
+    """
+    offsets = getattr(neighbors, 'offsets', None)
+    return None if offsets is None else list(offsets)
+
+
+def neighbor_radius(offsets: Sequence[IVector]) -> int:
+    """Returns the largest distance along any axis from a cell to one of its neighbors."""
+    return max((abs(c) for offset in offsets for c in offset), default=0)
+
+
+def _is_box(offsets: Sequence[IVector], radius: int) -> bool:
+    """Returns ``True`` if ``offsets`` is every location within ``radius`` of the origin except the
+    origin itself."""
+    return (
+        (0, 0, 0) not in offsets
+        and len(set(offsets)) == len(offsets) == (2 * radius + 1) ** 3 - 1
+    )
+
+
+def count_neighbors(
+    occupied: np.ndarray,
+    offsets: Sequence[IVector],
+    boundary: Boundary = Boundary.FIXED
+) -> np.ndarray:
+    """Counts the occupied neighbors of every cell in a (z, y, x) grid.
+
+    With a ``TOROIDAL`` boundary the grid wraps around on every axis, otherwise cells outside the
+    grid are treated as unoccupied. A full cube of offsets (such as those from
+    ``cubic_neighbor_model``) is summed one axis at a time, any other set of offsets is summed one
+    shifted copy of the grid per offset.
+
+    Args:
+        occupied: A (z, y, x) boolean array that is ``True`` for cells that should be counted.
+        offsets: The (x, y, z) offsets from a cell to each of its neighbors.
+        boundary: Optional. The policy for neighbors outside the grid. Defaults to ``FIXED``.
+
+    Returns:
+        A (z, y, x) array with the neighbor count for each cell.
+    """
+    dtype = np.uint8 if len(offsets) < 256 else np.uint16
+    radius = neighbor_radius(offsets)
+    sz, sy, sx = occupied.shape
+
+    if radius == 0:
+        return np.zeros(occupied.shape, dtype=dtype)
+
+    mode = 'wrap' if boundary == Boundary.TOROIDAL else 'constant'
+    padded = np.pad(occupied.astype(dtype), radius, mode=mode)
+
+    if _is_box(offsets, radius):
+        width = 2 * radius + 1
+        # Box sum along x, then y, then z. Each pass shrinks the padded axis back to its size.
+        summed = padded
+        for axis in (2, 1, 0):
+            length = summed.shape[axis] - 2 * radius
+            index = [slice(None)] * 3
+            index[axis] = slice(0, length)
+            total = summed[tuple(index)].copy()
+            for i in range(1, width):
+                index[axis] = slice(i, i + length)
+                total += summed[tuple(index)]
+            summed = total
+
+        summed -= occupied
+        return summed
+
+    counts = np.zeros(occupied.shape, dtype=dtype)
+    for (dx, dy, dz) in offsets:
+        counts += padded[
+            radius + dz:radius + dz + sz,
+            radius + dy:radius + dy + sy,
+            radius + dx:radius + dx + sx
+        ]
+
+    return counts
+
+
+def scatter_counts(
+    live: np.ndarray,
+    offsets: Sequence[IVector],
+    shape: tuple[int, int, int],
+    boundary: Boundary = Boundary.FIXED
+) -> tuple[np.ndarray, np.ndarray]:
+    """Counts the live neighbors of every cell that has at least one, by scattering from the live
+    cells rather than gathering around every location.
+
+    The cost of this function grows with the number of live cells rather than with the size of the
+    grid. With a ``TOROIDAL`` boundary neighbors wrap around on every axis, otherwise neighbors
+    outside the grid are dropped. An ``UNBOUNDED`` grid is expected to have been grown so that no
+    live cell is within reach of its edge.
+
+    Args:
+        live: The sorted flat indices of the live cells in a (z, y, x) grid.
+        offsets: The (x, y, z) offsets from a cell to each of its neighbors.
+        shape: The (z, y, x) shape of the grid.
+        boundary: Optional. The policy for neighbors outside the grid. Defaults to ``FIXED``.
+
+    Returns:
+        A pair of arrays: the sorted flat indices of every cell with at least one live neighbor,
+        and the number of live neighbors each of those cells has.
+    """
+    z, y, x = np.unravel_index(live, shape)
+    sz, sy, sx = shape
+    scattered = []
+
+    for (dx, dy, dz) in offsets:
+        nx, ny, nz = x + dx, y + dy, z + dz
+
+        if boundary == Boundary.TOROIDAL:
+            scattered.append(((nz % sz) * sy + (ny % sy)) * sx + (nx % sx))
+        else:
+            inside = (0 <= nx) & (nx < sx) & (0 <= ny) & (ny < sy) & (0 <= nz) & (nz < sz)
+            scattered.append(((nz * sy + ny) * sx + nx)[inside])
+
+    if not scattered:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    return np.unique(np.concatenate(scattered), return_counts=True)
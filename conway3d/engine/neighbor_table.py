@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .boundary import Boundary
+from ..datamodel import IVector, NeighborModel
+
+
+class NeighborTable:
+    """The neighbors of every cell in a block, compiled from a ``NeighborModel``.
+
+    The table is stored in compressed sparse row form: the flat indices (in ``CellBlock.__iter__``
+    order) of the neighbors of cell ``i`` are ``indices[indptr[i]:indptr[i + 1]]``. Boundary
+    handling is applied when the table is compiled, so counting neighbors is a single gather over
+    the precomputed indices no matter how the neighbor model is defined.
+    """
+    __slots__ = ('_size', '_boundary', '_indptr', '_indices')
+
+    def __init__(self, size: IVector, indptr: np.ndarray, indices: np.ndarray, boundary: Boundary):
+        """
+        Args:
+            size: The (x, y, z) dimensions of the cell block the table describes.
+            indptr: The ``int32`` offsets into ``indices`` for each cell, plus a final end offset.
+            indices: The ``int32`` flat indices of the neighbors of every cell.
+            boundary: The boundary policy that was applied when the table was compiled.
+        """
+        self._size = size
+        self._indptr = indptr
+        self._indices = indices
+        self._boundary = boundary
+
+    @classmethod
+    def compile(
+        cls,
+        neighbors: NeighborModel,
+        size: IVector,
+        boundary: Boundary = Boundary.FIXED
+    ) -> NeighborTable:
+        """Calls ``neighbors`` once for every cell in a block of ``size`` and records the results.
+
+        Neighbors outside the block wrap around with a ``TOROIDAL`` boundary and are dropped
+        otherwise. Duplicate neighbors of a cell are only recorded once.
+        """
+        sx, sy, sz = size
+        toroidal = boundary == Boundary.TOROIDAL
+        indptr = np.zeros(sx * sy * sz + 1, dtype=np.int32)
+        indices = []
+        i = 0
+
+        for z in range(sz):
+            for y in range(sy):
+                for x in range(sx):
+                    row = {}
+                    for (nx, ny, nz) in neighbors((x, y, z)):
+                        if toroidal:
+                            nx, ny, nz = nx % sx, ny % sy, nz % sz
+                        elif not ((0 <= nx < sx) and (0 <= ny < sy) and (0 <= nz < sz)):
+                            continue
+                        row[(nz * sy + ny) * sx + nx] = None
+
+                    indices.extend(row)
+                    i += 1
+                    indptr[i] = len(indices)
+
+        return cls(size, indptr, np.array(indices, dtype=np.int32), boundary)
+
+    @property
+    def size(self) -> IVector:
+        """The (x, y, z) dimensions of the cell block the table describes."""
+        return self._size
+
+    @property
+    def boundary(self) -> Boundary:
+        """The boundary policy that was applied when the table was compiled."""
+        return self._boundary
+
+    @property
+    def indptr(self) -> np.ndarray:
+        """The offsets into ``indices`` for each cell, plus a final end offset."""
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        """The flat indices of the neighbors of every cell."""
+        return self._indices
+
+    def neighbors_of(self, index: int) -> np.ndarray:
+        """Returns the flat indices of the neighbors of the cell at flat ``index``."""
+        return self._indices[self._indptr[index]:self._indptr[index + 1]]
+
+    def count(self, occupied: np.ndarray) -> np.ndarray:
+        """Counts the occupied neighbors of every cell.
+
+        Args:
+            occupied: A (z, y, x) boolean array that is ``True`` for cells that should be counted.
+
+        Returns:
+            A (z, y, x) array with the neighbor count for each cell.
+        """
+        gathered = occupied.reshape(-1)[self._indices]
+        totals = np.zeros(len(gathered) + 1, dtype=np.int32)
+        np.cumsum(gathered, out=totals[1:])
+        counts = totals[self._indptr[1:]] - totals[self._indptr[:-1]]
+
+        return counts.reshape(occupied.shape)
@@ -0,0 +1,90 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class SlabExecutor:
+    """Splits whole-grid work into slabs along the z axis and runs them in a thread pool.
+
+    The slabs are views into arrays shared by every worker, so nothing is copied or pickled
+    between threads. NumPy releases the GIL inside its array loops, which lets the slabs of a large
+    grid run on separate cores.
+    """
+    __slots__ = ('_workers', '_pool')
+
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers: The number of threads to run slabs on.
+        """
+        if workers < 1:
+            raise ValueError('A SlabExecutor needs at least one worker.')
+
+        self._workers = workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def workers(self) -> int:
+        """The number of threads slabs are run on."""
+        return self._workers
+
+    def slabs(self, depth: int) -> list[tuple[int, int]]:
+        """Returns the (start, stop) z range of each slab for a grid ``depth`` cells deep."""
+        count = max(1, min(self._workers, depth))
+        bounds = np.linspace(0, depth, count + 1).astype(int).tolist()
+
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def map(self, fn: Callable[[int, int], None], depth: int) -> None:
+        """Calls ``fn(start, stop)`` for each slab of a grid ``depth`` cells deep and waits for
+        every call to finish.
+
+        ``fn`` is expected to write its results into a shared output array. Exceptions raised by
+        ``fn`` are raised again here.
+        """
+        slabs = self.slabs(depth)
+
+        if len(slabs) == 1:
+            fn(*slabs[0])
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self._workers, thread_name_prefix='conway3d-slab')
+
+        for future in [self._pool.submit(fn, start, stop) for (start, stop) in slabs]:
+            future.result()
+
+    def close(self) -> None:
+        """Shuts down the thread pool. It is started again if ``map`` is called afterwards."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def halo_slab(
+    array: np.ndarray,
+    start: int,
+    stop: int,
+    radius: int,
+    toroidal: bool
+) -> tuple[np.ndarray, int]:
+    """Returns the rows of a z slab plus up to ``radius`` rows of halo on each side.
+
+    Halo rows wrap around the z axis when ``toroidal`` is ``True`` and are clipped at the edges of
+    the grid otherwise.
+
+    Returns:
+        The slab with its halo, and the index within it of row ``start``.
+    """
+    if toroidal:
+        return array[np.arange(start - radius, stop + radius) % array.shape[0]], radius
+
+    low = max(0, start - radius)
+    return array[low:min(array.shape[0], stop + radius)], start - low
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Generator, Iterable, Iterator
+from queue import Empty, Full, Queue
+
+import numpy as np
+
+from .cycles import Cycle
+from ..datamodel import CellBlock, DenseCellBlock, IVector, PackedCellBlock, unpack_bits
+
+Stage = Callable[[Iterable['Generation']], Iterable['Generation']]
+"""A pipeline stage: takes a stream of generations and returns a stream of generations."""
+
+
+class Generation:
+    """A read-only view of one generation of a driver's cell block.
+
+    Generations yielded by ``CellDriver.iter_generations`` share the driver's arrays instead of
+    copying them, so they are only valid until the next generation is requested. Call ``detach``
+    to keep one for longer.
+    """
+    __slots__ = ('_number', '_population', '_births', '_deaths', '_changed', '_cycle', '_cells',
+                 '_array', '_detached')
+
+    def __init__(self,
+        number: int,
+        population: int,
+        births: int,
+        deaths: int,
+        changed: np.ndarray | None,
+        cycle: Cycle | None,
+        cells: CellBlock,
+        detached: bool = False
+    ):
+        """
+        Args:
+            number: The generation count of the driver.
+            population: The number of cells that are not empty.
+            births: The number of empty cells that became populated in this generation.
+            deaths: The number of populated cells that became empty in this generation.
+            changed: The flat indices of the cells that changed in this generation, or ``None``
+                if every cell should be treated as changed.
+            cycle: The cycle the driver had detected by this generation, if any.
+            cells: The cell block. Its array is shared, not copied.
+            detached: Optional. Whether ``cells`` belongs to this generation alone.
+        """
+        self._number = number
+        self._population = population
+        self._births = births
+        self._deaths = deaths
+        self._changed = changed
+        self._cycle = cycle
+        self._cells = cells
+        self._detached = detached
+
+        if isinstance(cells, DenseCellBlock):
+            self._array = cells.array.view()
+        elif isinstance(cells, PackedCellBlock):
+            self._array = cells.words.view()
+        else:
+            self._array = None
+
+        if self._array is not None:
+            self._array.flags.writeable = False
+
+    def __repr__(self):
+        return f'Generation({self._number}, population={self._population})'
+
+    @property
+    def number(self) -> int:
+        """The generation count of the driver."""
+        return self._number
+
+    @property
+    def population(self) -> int:
+        """The number of cells that are not empty."""
+        return self._population
+
+    @property
+    def births(self) -> int:
+        """The number of empty cells that became populated in this generation."""
+        return self._births
+
+    @property
+    def deaths(self) -> int:
+        """The number of populated cells that became empty in this generation."""
+        return self._deaths
+
+    @property
+    def changed(self) -> np.ndarray | None:
+        """The sorted flat indices of the cells that changed in this generation, or ``None`` if
+        every cell should be treated as changed."""
+        return self._changed
+
+    @property
+    def cycle(self) -> Cycle | None:
+        """The cycle the driver had detected by this generation, if any."""
+        return self._cycle
+
+    @property
+    def size(self) -> IVector:
+        """The (x, y, z) dimensions of the cell block."""
+        return self._cells.size
+
+    @property
+    def cells(self) -> CellBlock:
+        """The cell block. Unless the generation is ``detached``, this is the driver's own block
+        and must not be modified."""
+        return self._cells
+
+    @property
+    def array(self) -> np.ndarray | None:
+        """A read-only view of the state ordinals of a ``DenseCellBlock``, or the packed words of
+        a ``PackedCellBlock``. Other cell blocks have no array."""
+        return self._array
+
+    @property
+    def detached(self) -> bool:
+        """Whether the generation owns its cells, and stays valid after the driver advances."""
+        return self._detached
+
+    def ordinals(self) -> np.ndarray:
+        """Returns the (z, y, x) ``uint8`` array of state ordinals.
+
+        For a ``DenseCellBlock`` this is the read-only ``array`` itself, and a ``PackedCellBlock``
+        is unpacked.
+        """
+        if isinstance(self._cells, DenseCellBlock):
+            return self._array
+
+        if isinstance(self._cells, PackedCellBlock):
+            return unpack_bits(self._array, self._cells.size[0])
+
+        raise TypeError('Only DenseCellBlock and PackedCellBlock have state ordinals.')
+
+    def detach(self) -> Generation:
+        """Returns a copy of this generation that owns its cells.
+
+        Array-backed blocks copy only their array. Generations that are already detached are
+        returned as they are.
+        """
+        if self._detached:
+            return self
+
+        return Generation(
+            self._number, self._population, self._births, self._deaths, self._changed, self._cycle,
+            self._cells.copy(), detached=True)
+
+
+def tap(generations: Iterable[Generation],
+        consumer: Callable[[Generation], None]) -> Generator[Generation]:
+    """Passes each generation to ``consumer`` before yielding it on.
+
+    The consumer runs before the next generation is requested, so it can read generations that are
+    not detached.
+    """
+    for generation in generations:
+        consumer(generation)
+        yield generation
+
+
+def pipeline(source: Iterable[Generation], *stages: Stage) -> Iterator[Generation]:
+    """Chains ``stages`` onto ``source``, each taking the stream returned by the one before it.
+
+    Every stage pulls generations from the one before it, so generations are produced only as fast
+    as the last stage consumes them and none are buffered unless a stage does so itself.
+    """
+    stream = source
+    for stage in stages:
+        stream = stage(stream)
+
+    return iter(stream)
+
+
+def drain(generations: Iterable[Generation]) -> Generation | None:
+    """Consumes a stream of generations.
+
+    Returns:
+        The last generation, or ``None`` if there were none. It is only valid until the driver
+        advances again, unless it is detached.
+    """
+    last = None
+    for last in generations:
+        pass
+
+    return last
+
+
+_DONE = object()
+
+
+def prefetch(generations: Iterable[Generation], depth: int = 2) -> Generator[Generation]:
+    """Produces generations on a background thread, up to ``depth`` ahead of the consumer.
+
+    Each generation is detached before it is queued. The producer blocks while the queue is full,
+    so a slow consumer holds back the simulation instead of letting memory grow. Stages before
+    this one run on the background thread, so this suits a consumer that spends its time outside
+    Python, such as compressing or writing to disk, while the next generations are computed.
+
+    Errors raised by the producer are raised to the consumer. Closing this generator stops the
+    producer.
+    """
+    if depth < 1:
+        raise ValueError('Prefetch depth must be at least 1.')
+
+    queue: Queue = Queue(depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.05)
+                return True
+            except Full:
+                pass
+
+        return False
+
+    def produce():
+        try:
+            for generation in generations:
+                # Stop before the next generation is requested, so that the source does not
+                # advance past the last one queued.
+                if not put(generation.detach()) or stop.is_set():
+                    return
+        except BaseException as error:
+            put(error)
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, name='prefetch', daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = queue.get()
+
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer that is waiting on a full queue.
+        try:
+            while True:
+                queue.get_nowait()
+        except Empty:
+            pass
+
+        thread.join()
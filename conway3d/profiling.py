@@ -0,0 +1,300 @@
+"""Named timers and counters for finding where a simulation or animation spends its time.
+
+Instrumented code calls ``span``, ``count`` and ``set_generation``, or is decorated with
+``instrumented``. They do nothing until a ``Profiler`` is enabled, and while disabled each one
+costs a single check of a module global. Enable one with ``profile``:
+
+    with profiling.profile() as profiler:
+        driver.populate()
+        for _ in range(10):
+            driver.next_generation()
+
+    profiler.write_chrome_trace('trace.json')
+
+Every span and counter is tagged with the generation the driver had reached, so the totals can be
+broken down per generation with ``Profiler.by_generation``.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+_profiler: Profiler | None = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('_profiler', '_name', '_start', '_nested')
+
+    def __init__(self, profiler: Profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        stack = self._profiler._stack()
+        # A span inside one with the same name, such as an override calling ``super()``, is
+        # only timed once.
+        self._nested = bool(stack) and stack[-1] == self._name
+        stack.append(self._name)
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *args):
+        end = time.perf_counter_ns()
+        self._profiler._stack().pop()
+
+        if not self._nested:
+            self._profiler._record(self._name, self._start, end - self._start)
+
+        return False
+
+
+class Profiler:
+    """Records timed spans and counters.
+
+    Spans and counters may be recorded from any thread. Each is tagged with the current generation
+    and the thread it ran on.
+    """
+    __slots__ = ('_origin', '_generation', '_events', '_counters', '_local')
+
+    def __init__(self):
+        self._origin = time.perf_counter_ns()
+        self._generation = 0
+        self._events: list[tuple[str, int, int, int, int]] = []
+        self._counters: list[tuple[str, int, int, float]] = []
+        self._local = threading.local()
+
+    @property
+    def generation(self) -> int:
+        """The generation that new spans and counters are tagged with."""
+        return self._generation
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        """Every span recorded, in the order they ended."""
+        return [
+            {'name': name, 'generation': generation, 'start_us': start / 1e3,
+             'duration_us': duration / 1e3, 'thread': thread}
+            for (name, generation, start, duration, thread) in self._events
+        ]
+
+    @property
+    def counters(self) -> list[dict[str, Any]]:
+        """Every counter increment recorded, in order."""
+        return [
+            {'name': name, 'generation': generation, 'time_us': at / 1e3, 'value': value}
+            for (name, generation, at, value) in self._counters
+        ]
+
+    def span(self, name: str) -> _Span:
+        """Returns a context manager that times the code it wraps."""
+        return _Span(self, name)
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Adds ``value`` to a counter."""
+        self._counters.append(
+            (name, self._generation, time.perf_counter_ns() - self._origin, value))
+
+    def set_generation(self, generation: int) -> None:
+        """Tags the spans and counters recorded from now on with ``generation``."""
+        self._generation = generation
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Returns the totals for each span and counter name.
+
+        Spans have a ``count`` and the ``total_ms``, ``mean_ms`` and ``max_ms`` of their
+        durations. Counters have a ``count`` of increments and the ``total`` of their values.
+        """
+        spans: dict[str, dict[str, float]] = {}
+        for (name, _, _, duration, _) in self._events:
+            entry = spans.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += duration / 1e6
+            entry['max_ms'] = max(entry['max_ms'], duration / 1e6)
+
+        for entry in spans.values():
+            entry['mean_ms'] = entry['total_ms'] / entry['count']
+
+        for (name, _, _, value) in self._counters:
+            entry = spans.setdefault(name, {'count': 0, 'total': 0})
+            entry['count'] += 1
+            entry['total'] += value
+
+        return spans
+
+    def by_generation(self) -> dict[int, dict[str, float]]:
+        """Returns, for each generation, the total milliseconds of each span name and the total
+        of each counter."""
+        totals: dict[int, dict[str, float]] = {}
+
+        for (name, generation, _, duration, _) in self._events:
+            row = totals.setdefault(generation, {})
+            row[name] = row.get(name, 0.0) + duration / 1e6
+
+        for (name, generation, _, value) in self._counters:
+            row = totals.setdefault(generation, {})
+            row[name] = row.get(name, 0) + value
+
+        return dict(sorted(totals.items()))
+
+    def write_json(self, path: str | Path) -> None:
+        """Writes the summary, the per-generation totals, and every span and counter to a JSON
+        file."""
+        report = {
+            'summary': self.summary(),
+            'generations': {str(g): row for (g, row) in self.by_generation().items()},
+            'events': self.events,
+            'counters': self.counters,
+        }
+        Path(path).write_text(json.dumps(report, indent=2) + '\n')
+
+    def write_csv(self, path: str | Path) -> None:
+        """Writes every span and counter to a CSV file, one per row."""
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(('kind', 'name', 'generation', 'start_us', 'duration_us', 'value',
+                             'thread'))
+
+            for event in self.events:
+                writer.writerow(('span', event['name'], event['generation'], event['start_us'],
+                                 event['duration_us'], '', event['thread']))
+
+            for counter in self.counters:
+                writer.writerow(('counter', counter['name'], counter['generation'],
+                                 counter['time_us'], '', counter['value'], ''))
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Returns the spans and counters in the Chrome trace event format, which
+        ``chrome://tracing`` and Perfetto can open."""
+        pid = os.getpid()
+        events = [
+            {'name': name, 'ph': 'X', 'ts': start / 1e3, 'dur': duration / 1e3, 'pid': pid,
+             'tid': thread, 'args': {'generation': generation}}
+            for (name, generation, start, duration, thread) in self._events
+        ]
+
+        # Counter events plot the running total of each counter.
+        running: dict[str, float] = {}
+        for (name, generation, at, value) in self._counters:
+            running[name] = running.get(name, 0) + value
+            events.append({'name': name, 'ph': 'C', 'ts': at / 1e3, 'pid': pid,
+                           'args': {name: running[name]}})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        """Writes the spans and counters to a Chrome trace event file."""
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+    def write(self, path: str | Path, format: str = 'chrome') -> None:
+        """Writes the profile as ``chrome``, ``json`` or ``csv``."""
+        writers = {'chrome': self.write_chrome_trace, 'json': self.write_json,
+                   'csv': self.write_csv}
+
+        if format not in writers:
+            raise ValueError(f'Unknown profile format {format!r}.')
+
+        writers[format](path)
+
+    def _stack(self) -> list[str]:
+        local = self._local
+        if not hasattr(local, 'stack'):
+            local.stack = []
+
+        return local.stack
+
+    def _record(self, name: str, start: int, duration: int) -> None:
+        self._events.append(
+            (name, self._generation, start - self._origin, duration, threading.get_ident()))
+
+
+def active() -> Profiler | None:
+    """Returns the enabled profiler, if any."""
+    return _profiler
+
+
+def enable(profiler: Profiler | None = None) -> Profiler:
+    """Starts recording to ``profiler``, or to a new one."""
+    global _profiler
+    _profiler = profiler or Profiler()
+
+    return _profiler
+
+
+def disable() -> Profiler | None:
+    """Stops recording and returns the profiler that was enabled."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+
+    return profiler
+
+
+@contextmanager
+def profile(profiler: Profiler | None = None) -> Generator[Profiler]:
+    """Records to ``profiler``, or to a new one, for the duration of a ``with`` block."""
+    global _profiler
+    previous = _profiler
+    try:
+        yield enable(profiler)
+    finally:
+        _profiler = previous
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """Returns a context manager that times the code it wraps while profiling is enabled."""
+    profiler = _profiler
+    return _NULL_SPAN if profiler is None else profiler.span(name)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Adds ``value`` to a counter while profiling is enabled."""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.count(name, value)
+
+
+def set_generation(generation: int) -> None:
+    """Tags the spans and counters recorded from now on with ``generation`` while profiling is
+    enabled."""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.set_generation(generation)
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """Decorates a function so that each call is timed as a span named ``name`` while profiling
+    is enabled."""
+    def decorate(function: F) -> F:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return function(*args, **kwargs)
+
+            with profiler.span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
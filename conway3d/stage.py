@@ -1,9 +1,16 @@
+from collections.abc import Sequence
+from typing import Any
+
 import bpy
 
-from . import Configuration
+from . import Configuration, profiling
 from .blendutil import deselect_all, find_3d_view
-from .conway import ConwayCellView, UncertainConwayDriver
-from .datamodel import CellBlock
+from .conway import (ConwayCellView, ConwayInstancedView, ConwayRule, UncertainConwayDriver,
+                     cell_states)
+from .datamodel import DenseCellBlock
+from .engine import Boundary, CellDriver, SlabExecutor
+from .trajectory import TrajectoryReader
+from .visuals import BlockView, StateTimeline, stream_cell_keys
 
 C = bpy.context
 D = bpy.data
@@ -40,18 +47,134 @@ FRAMES = 200
 
 
 def create_animation():
-    driver = UncertainConwayDriver(CellBlock(CONFIG.grid_size), uncertainty=0.05)
-    cell_view = ConwayCellView(driver.cells, CONFIG.block_name, CONFIG.cell_size,
-                               CONFIG.cell_padding)
+    if CONFIG.profile is None:
+        return _create_animation()
+
+    with profiling.profile() as profiler:
+        _create_animation()
+
+    profiler.write(CONFIG.profile, CONFIG.profile_format)
+
+
+def make_driver(executor: SlabExecutor | None = None) -> UncertainConwayDriver:
+    """Creates the driver and cell block described by ``CONFIG``.
+
+    An ``uncertainty`` of 0 makes the driver deterministic, so the animation stops simulating as
+    soon as the grid settles into a cycle.
+
+    Args:
+        executor: Optional. Steps each generation in parallel slabs. Defaults to ``None``.
+    """
+    rule = ConwayRule.parse(CONFIG.rule)
+
+    return UncertainConwayDriver(
+        DenseCellBlock(CONFIG.grid_size, cell_states(rule.states)),
+        uncertainty=CONFIG.uncertainty, rule=rule, boundary=Boundary(CONFIG.boundary),
+        executor=executor, seed=CONFIG.seed)
+
+
+def _create_animation():
+    executor = SlabExecutor(CONFIG.workers) if CONFIG.workers > 1 else None
+
+    try:
+        driver = make_driver(executor)
+        view_type = ConwayInstancedView if CONFIG.instanced else ConwayCellView
+        cell_view = view_type(
+            driver.cells, CONFIG.block_name, CONFIG.cell_size, CONFIG.cell_padding)
+
+        setup_renderer()
+        setup_scene()
+        setup_animation(0, FRAMES)
+
+        driver.populate()
+        frames = range(0, FRAMES, 10)
+
+        if CONFIG.bake:
+            cell_view.bake(record_animation(driver, frames, tuple(driver.state_type)))
+            return
+
+        cell_view.update()
+
+        for (i, frame) in enumerate(frames):
+            with profiling.span('stage.frame'):
+                with profiling.span('stage.frame_set'):
+                    bpy.context.scene.frame_set(frame)
+                cell_view.update(driver.changed)
+
+                if driver.cycle is not None:
+                    fill_from_cycle(driver, cell_view, frames[i + 1:])
+                    break
+
+                driver.next_generation()
+    finally:
+        if executor is not None:
+            executor.close()
+
+
+def import_animation(path: str, frame_step: int = 10):
+    """Builds the scene and animates it from a trajectory file written by ``python -m conway3d``.
+
+    Generations are read one at a time, so files with far more generations than fit in memory can
+    be imported. The instanced view reads each generation from the file when its frame is shown,
+    and the object per cell view is keyed from the changes between consecutive generations.
+
+    Args:
+        path: The trajectory file to load.
+        frame_step: Optional. The number of frames between generations. Defaults to 10.
+    """
+    with TrajectoryReader(path) as reader:
+        cells = DenseCellBlock(reader.size, cell_states(reader.states))
+        view_type = ConwayInstancedView if CONFIG.instanced else ConwayCellView
+        cell_view = view_type(cells, CONFIG.block_name, CONFIG.cell_size, CONFIG.cell_padding)
+
+        setup_renderer()
+        setup_scene()
+        setup_animation(0, max(0, len(reader) - 1) * frame_step)
+
+        if isinstance(cell_view, ConwayInstancedView):
+            cell_view.play_trajectory(path, frame_step, cells.states)
+        else:
+            generations = ((i * frame_step, ordinals) for (i, ordinals) in enumerate(reader))
+            cell_view.bake_keys(cells.states, stream_cell_keys(generations))
+
+
+def record_animation(
+    driver: CellDriver,
+    frames: Sequence[int],
+    states: Sequence[Any]
+) -> StateTimeline:
+    """Runs the simulation ahead of time and records the states of its cells on each frame.
+
+    Once the driver settles into a cycle, the remaining frames are recorded from the cached cycle
+    instead of being simulated.
+    """
+    timeline = StateTimeline(states)
+
+    for (i, (frame, generation)) in enumerate(zip(frames, driver.iter_generations())):
+        timeline.record(frame, generation.cells)
+
+        if generation.cycle is not None:
+            if not generation.cycle.still_life:
+                states = driver.cycle_states()
+                for (j, later) in enumerate(frames[i + 1:], 1):
+                    timeline.record(later, states[j % len(states)])
+            break
+
+    return timeline
+
+
+def fill_from_cycle(driver: CellDriver, cell_view: BlockView, frames: Sequence[int]):
+    """Keyframes the remaining frames of an animation from the cycle its driver has settled into,
+    without simulating any further generations.
 
-    setup_renderer()
-    setup_scene()
-    setup_animation(0, FRAMES)
+    A still life needs no more keyframes because the view already holds its final state.
+    """
+    if driver.cycle.still_life:
+        return
 
-    driver.populate()
-    cell_view.update()
+    states = driver.cycle_states()
 
-    for frame in range(0, FRAMES, 10):
+    for (i, frame) in enumerate(frames, 1):
         bpy.context.scene.frame_set(frame)
+        driver.cells.update(states[i % len(states)])
         cell_view.update()
-        driver.next_generation()
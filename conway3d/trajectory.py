@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+
+from .datamodel import CellBlock, DenseCellBlock, IVector, PackedCellBlock
+
+MAGIC = b'C3DT'
+"""The first bytes of every trajectory file."""
+
+INDEX_MAGIC = b'C3DI'
+"""The last bytes of a trajectory file that was closed with an index of its generations."""
+
+VERSION = 2
+"""The version of the trajectory format written by ``TrajectoryWriter``."""
+
+KEYFRAME_INTERVAL = 32
+"""The default number of generations between full snapshots."""
+
+KEYFRAME = 0
+"""The kind of a generation stored as a full snapshot."""
+
+DELTA = 1
+"""The kind of a generation stored as the difference from the one before it."""
+
+_PREAMBLE = struct.Struct('<4sHI')
+_FRAME = struct.Struct('<QIB')
+_FOOTER = struct.Struct('<Q4s')
+_INDEX = np.dtype([('offset', '<u8'), ('size', '<u4'), ('kind', 'u1')])
+
+
+def cell_ordinals(cells: CellBlock) -> np.ndarray:
+    """Returns the (z, y, x) ``uint8`` array of state ordinals of a ``DenseCellBlock`` or a
+    ``PackedCellBlock``."""
+    if isinstance(cells, DenseCellBlock):
+        return cells.array
+
+    if isinstance(cells, PackedCellBlock):
+        return cells.unpack()
+
+    raise TypeError('Only DenseCellBlock and PackedCellBlock can be written to a trajectory.')
+
+
+class TrajectoryWriter:
+    """Streams the generations of a cell block to a trajectory file.
+
+    The file starts with a JSON header that holds the size of the block, the number of states, the
+    keyframe interval and any metadata given, such as the rule and seed of the run. Every
+    ``keyframe_interval`` generations are stored as a compressed snapshot of the state ordinal of
+    every cell, and the generations between them as the compressed XOR of each generation with the
+    one before it. Two-state blocks are stored one bit per cell. Since most cells keep their state
+    from one generation to the next, the deltas are mostly runs of zeros and compress to very
+    little.
+
+    Closing the writer appends an index of every generation, so readers can find any of them
+    without scanning the file.
+    """
+    __slots__ = ('_file', '_size', '_states', '_interval', '_previous', '_index')
+
+    def __init__(self,
+        path: str | Path,
+        size: IVector,
+        states: int,
+        metadata: dict[str, Any] | None = None,
+        keyframe_interval: int = KEYFRAME_INTERVAL
+    ):
+        """
+        Args:
+            path: The file to write. It is replaced if it exists.
+            size: The (x, y, z) dimensions of the cell block.
+            states: The number of states a cell can be in.
+            metadata: Optional. Values to store in the header. They must be JSON serializable.
+            keyframe_interval: Optional. The number of generations between full snapshots. Reading
+                a generation decodes at most this many deltas. Defaults to ``KEYFRAME_INTERVAL``.
+        """
+        if keyframe_interval < 1:
+            raise ValueError('The keyframe interval must be at least 1.')
+
+        header = json.dumps({
+            'size': list(size), 'states': states, 'keyframe_interval': keyframe_interval,
+            'metadata': metadata or {}
+        }).encode()
+
+        self._file: BinaryIO = open(path, 'wb')
+        self._size = tuple(size)
+        self._states = states
+        self._interval = keyframe_interval
+        self._previous: np.ndarray | None = None
+        self._index: list[tuple[int, int, int]] = []
+        self._file.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        self._file.write(header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def write(self, ordinals: np.ndarray) -> None:
+        """Appends the next generation from a (z, y, x) array of state ordinals."""
+        sx, sy, sz = self._size
+
+        if ordinals.shape != (sz, sy, sx):
+            raise ValueError('Generation does not match the size of the trajectory.')
+
+        generation = len(self._index)
+        encoded = _encode(ordinals, self._states)
+
+        if generation % self._interval == 0:
+            kind, payload = KEYFRAME, encoded
+        else:
+            kind, payload = DELTA, encoded ^ self._previous
+
+        data = zlib.compress(payload.tobytes())
+        self._file.write(_FRAME.pack(generation, len(data), kind))
+        self._index.append((self._file.tell(), len(data), kind))
+        self._file.write(data)
+        self._previous = encoded
+
+    def write_cells(self, cells: CellBlock) -> None:
+        """Appends the next generation from a ``DenseCellBlock`` or a ``PackedCellBlock``."""
+        self.write(cell_ordinals(cells))
+
+    def close(self) -> None:
+        """Writes the index and closes the file."""
+        if self._file.closed:
+            return
+
+        offset = self._file.tell()
+        self._file.write(np.array(self._index, dtype=_INDEX).tobytes())
+        self._file.write(_FOOTER.pack(offset, INDEX_MAGIC))
+        self._file.close()
+
+
+class TrajectoryReader:
+    """Reads the generations of a trajectory file written by ``TrajectoryWriter``.
+
+    The file is memory-mapped, so only the generations that are read are loaded. Reading a
+    generation decodes the keyframe before it and the deltas up to it, or continues from the last
+    generation read when that is closer, so reading generations in order costs one delta each.
+
+    Files that are still being written, or were never closed, have no index and are scanned once
+    instead.
+    """
+    __slots__ = ('_file', '_map', '_size', '_states', '_interval', '_metadata', '_index',
+                 '_last', '_last_encoded')
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: The file to read.
+        """
+        self._file = open(path, 'rb')
+
+        # A run interrupted before its header was written leaves an empty or short file, which
+        # cannot be mapped or unpacked.
+        if os.fstat(self._file.fileno()).st_size < _PREAMBLE.size:
+            self._file.close()
+            raise ValueError(f'{path} is not a conway3d trajectory.')
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._map
+        magic, version, length = _PREAMBLE.unpack_from(data)
+        start = _PREAMBLE.size + length
+
+        if magic != MAGIC or start > len(data):
+            self.close()
+            raise ValueError(f'{path} is not a conway3d trajectory.')
+        if version != VERSION:
+            self.close()
+            raise ValueError(f'Unsupported trajectory version {version}.')
+
+        header = json.loads(data[_PREAMBLE.size:start])
+        self._size = tuple(header['size'])
+        self._states = header['states']
+        self._interval = header['keyframe_interval']
+        self._metadata = header['metadata']
+        self._index = self._read_index(start)
+        self._last = -1
+        self._last_encoded: np.ndarray | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Generator[np.ndarray]:
+        for generation in range(len(self)):
+            yield self.read(generation)
+
+    @property
+    def size(self) -> IVector:
+        """The (x, y, z) dimensions of the cell block."""
+        return self._size
+
+    @property
+    def states(self) -> int:
+        """The number of states a cell can be in."""
+        return self._states
+
+    @property
+    def keyframe_interval(self) -> int:
+        """The number of generations between full snapshots."""
+        return self._interval
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """The metadata stored in the header."""
+        return self._metadata
+
+    def read(self, generation: int) -> np.ndarray:
+        """Returns the (z, y, x) ``uint8`` array of state ordinals for a generation."""
+        if not 0 <= generation < len(self._index):
+            raise IndexError(f'Generation {generation} is not in the trajectory.')
+
+        keyframe = generation - generation % self._interval
+
+        if keyframe <= self._last <= generation:
+            current, encoded = self._last, self._last_encoded
+        else:
+            current, encoded = keyframe, self._payload(keyframe)
+
+        while current < generation:
+            current += 1
+            encoded = encoded ^ self._payload(current)
+
+        self._last, self._last_encoded = generation, encoded
+
+        return _decode(encoded, self._size, self._states)
+
+    def read_cells(self, generation: int, cells: CellBlock) -> None:
+        """Writes a generation into a ``DenseCellBlock`` or a ``PackedCellBlock`` of the same
+        size."""
+        ordinals = self.read(generation)
+
+        if isinstance(cells, PackedCellBlock):
+            cells.pack(ordinals)
+        else:
+            cell_ordinals(cells)[...] = ordinals
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self._map.close()
+        self._file.close()
+
+    def _payload(self, generation: int) -> np.ndarray:
+        offset, size, _ = self._index[generation]
+        data = zlib.decompress(self._map[offset:offset + size])
+
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def _read_index(self, start: int) -> list[tuple[int, int, int]]:
+        data = self._map
+
+        if len(data) >= start + _FOOTER.size:
+            offset, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+            if magic == INDEX_MAGIC:
+                entries = np.frombuffer(data[offset:len(data) - _FOOTER.size], dtype=_INDEX)
+                return entries.tolist()
+
+        index = []
+        offset = start
+        while offset + _FRAME.size <= len(data):
+            _, size, kind = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            if offset + size > len(data):
+                break
+            index.append((offset, size, kind))
+            offset += size
+
+        return index
+
+
+def _encode(ordinals: np.ndarray, states: int) -> np.ndarray:
+    if states == 2:
+        return np.packbits(ordinals.ravel())
+
+    # Copied, since the writer keeps the previous generation and callers may reuse their array.
+    return np.array(ordinals, dtype=np.uint8).ravel()
+
+
+def _decode(encoded: np.ndarray, size: IVector, states: int) -> np.ndarray:
+    sx, sy, sz = size
+
+    if states == 2:
+        return np.unpackbits(encoded, count=sx * sy * sz).reshape((sz, sy, sx))
+
+    return encoded.reshape((sz, sy, sx)).copy()
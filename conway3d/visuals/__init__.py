@@ -1 +1,10 @@
-from .cell_block_view import CellBlockView
+from .timeline import StateTimeline, stream_cell_keys
+
+try:
+    from .cell_block_view import BlockView, CellBlockView
+    from .instanced_view import (InstancedCellBlockView, make_instance_nodes, register,
+                                 slot_attribute, unregister)
+except ModuleNotFoundError as error:
+    # Blender's modules are only available inside Blender. The timeline works without them.
+    if error.name not in ('bpy', 'mathutils'):
+        raise
@@ -1,19 +1,26 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
 from typing import Any, Generic
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 from ..blendutil import set_active_layer_collection
+from .timeline import StateTimeline
 from ..datamodel import CellBlock, IVector, T_state
+from ..profiling import count, instrumented
 
 C = bpy.context
 D = bpy.data
 
 
-class CellBlockView(ABC, Generic[T_state]):
-    __slots__ = (
-        '_cells', '_block_name', '_cell_size', '_padding', '_collection', '_meshes')
+class BlockView(ABC, Generic[T_state]):
+    """Shows a cell block in a collection of its own.
+
+    Subclasses choose how the cells are represented, such as an object per cell or a single
+    object for the whole block, and how they are animated.
+    """
+    __slots__ = ('_cells', '_block_name', '_cell_size', '_padding', '_collection')
 
     def __init__(self,
         cells: CellBlock[T_state],
@@ -25,7 +32,6 @@ class CellBlockView(ABC, Generic[T_state]):
         self._block_name = block_name
         self._cell_size = size
         self._padding = padding
-        self._meshes: dict[IVector, Any] = {}
 
         # Create a collection for the cell block and set it active
         self._collection = D.collections.new(block_name)
@@ -35,33 +41,20 @@ class CellBlockView(ABC, Generic[T_state]):
         # Create the individual cells
         self.make_meshes()
 
-    def make_meshes(self):
-        """Creates a mesh for each cell in the cell block.
+    def locations(self) -> np.ndarray:
+        """Returns the location in Blender space of every cell, in the order the cell block
+        iterates over them.
 
-        Cells are added to the currently active layer collection.
+        Returns:
+            An (n, 3) array of (x, y, z) locations. The block is centered on the origin.
         """
         sx, sy, sz = self._cells.size
         box = self._cell_size + (self._padding * 2)
-        center = Vector((
-            (sx * box) / 2,
-            (sy * box) / 2,
-            (sz * box) / 2
-        ))
-        offset = Vector((
-            (box / 2) - center.x,
-            (box / 2) - center.y,
-            (box / 2) - center.z
-        ))
-
-        for xyz in self._cells:
-            grid_x, grid_y, grid_z = xyz
-            x = (grid_x * box) + offset.x
-            y = (grid_y * box) + offset.y
-            z = (grid_z * box) + offset.z
-            self.add_cell_view(self._cell_size, Vector((x, y, z)))
-            cube = C.object
-            cube.name = self._cells.name_of(xyz)
-            self._meshes[xyz] = cube
+        z, y, x = np.indices((sz, sy, sx), dtype=np.float64).reshape(3, -1)
+        grid = np.stack((x, y, z), axis=1)
+        extent = np.array((sx, sy, sz), dtype=np.float64)
+
+        return (grid + 0.5) * box - (extent * box) / 2
 
     @property
     def cells(self) -> CellBlock[T_state]:
@@ -75,24 +68,147 @@ class CellBlockView(ABC, Generic[T_state]):
     def collection(self) -> Any:
         return self._collection
 
+    @abstractmethod
+    def make_meshes(self):
+        """Creates the Blender objects that represent the cell block."""
+
+    @abstractmethod
+    def update(self, changed: np.ndarray | None = None):
+        """Update the cells to match the states of the backing cell block on the current frame.
+
+        Args:
+            changed: Optional. The flat indices, in the order the cell block iterates over its
+                cells, of the cells that changed since the previous update, such as
+                ``CellDriver.changed``. Defaults to ``None``, which updates every cell.
+        """
+
+    @abstractmethod
+    def bake(self, timeline: StateTimeline):
+        """Animates every cell from a timeline of states recorded ahead of time."""
+
+    @abstractmethod
+    def make_cell_mesh(self, size: float) -> Any:
+        """Creates the mesh datablock shared by the objects that represent grid cells.
+
+        Args:
+            size: The size of the mesh in Blender units.
+
+        Returns:
+            A reference to the new mesh.
+        """
+
+
+class CellBlockView(BlockView[T_state]):
+    """Shows each cell of a cell block as an object of its own, animated with keyframes."""
+    __slots__ = ('_meshes', '_frame')
+
+    def __init__(self,
+        cells: CellBlock[T_state],
+        block_name: str,
+        size: float,
+        padding: float
+    ):
+        self._meshes: dict[IVector, Any] = {}
+        self._frame: int | None = None
+        super().__init__(cells, block_name, size, padding)
+
+    @instrumented('view.make_meshes')
+    def make_meshes(self):
+        """Creates an object for each cell in the cell block.
+
+        Every object shares one mesh from ``make_cell_mesh`` and is created directly in
+        ``bpy.data``, then linked to the block's collection, so no operators run and the
+        dependency graph is only updated once.
+        """
+        mesh = self.make_cell_mesh(self._cell_size)
+        objects = D.objects
+
+        for (xyz, location) in zip(self._cells, self.locations().tolist()):
+            cube = objects.new(self._cells.name_of(xyz), mesh)
+            cube.location = location
+            self._meshes[xyz] = cube
+
+        link = self._collection.objects.link
+        for cube in self._meshes.values():
+            link(cube)
+
     @property
     def meshes(self) -> dict[IVector, Any]:
         return self._meshes
 
-    def update(self):
-        """Update the cells to match the states of the backing cell block."""
-        for (xyz, mesh) in self._meshes.items():
-            state = self._cells[xyz]
-            self.update_cell_view(mesh, state)
+    @instrumented('view.update')
+    def update(self, changed: np.ndarray | None = None):
+        """Update the cells to match the states of the backing cell block.
+
+        When ``changed`` is given, only those cells are updated. Each of them is first held at its
+        previous state on the frame of the previous update, so that it does not drift towards
+        its new state over the frames in between.
+
+        Args:
+            changed: Optional. The flat indices, in the order the cell block iterates over its
+                cells, of the cells that changed since the previous update, such as
+                ``CellDriver.changed``. Defaults to ``None``, which updates every cell.
+        """
+        frame = C.scene.frame_current
+
+        if changed is None or self._frame is None:
+            for (xyz, mesh) in self._meshes.items():
+                state = self._cells[xyz]
+                self.update_cell_view(mesh, state)
+
+            count('view.cells_updated', len(self._meshes))
+        else:
+            cells = self._cells
+            sx, sy, sz = cells.size
+            z, y, x = np.unravel_index(changed, (sz, sy, sx))
+            hold = self._frame if self._frame < frame else None
+
+            for xyz in zip(x.tolist(), y.tolist(), z.tolist()):
+                mesh = self._meshes[xyz]
+                if hold is not None:
+                    self.hold_cell_view(mesh, hold)
+                self.update_cell_view(mesh, cells[xyz])
+
+            count('view.cells_updated', len(changed))
+            if hold is not None:
+                count('view.cells_held', len(changed))
+
+        self._frame = frame
+
+    def bake(self, timeline: StateTimeline):
+        """Animates every cell from a timeline of states recorded ahead of time.
+
+        Each cell is keyframed once with every key it needs, rather than a frame at a time, so no
+        frame needs to be set while baking.
+        """
+        self.bake_keys(timeline.states, timeline.cell_keys())
+
+    @instrumented('view.bake')
+    def bake_keys(
+        self,
+        states: Sequence[T_state],
+        keys: Iterable[tuple[int, np.ndarray, np.ndarray]]
+    ) -> None:
+        """Animates every cell from the keys of ``StateTimeline.cell_keys`` or
+        ``stream_cell_keys``.
+
+        Args:
+            states: The state for each code.
+            keys: The index of each cell, the frames of its keys and the codes of its state on
+                each one.
+        """
+        meshes = list(self._meshes.values())
+
+        for (cell, frames, codes) in keys:
+            self.bake_cell_view(meshes[cell], frames, [states[code] for code in codes.tolist()])
 
     @abstractmethod
-    def add_cell_view(self, size: float, location: Vector) -> None:
-        """Adds a Blender object to the active layer collection that will
-        represent a grid cell.
+    def hold_cell_view(self, cell_view: Any, frame: int) -> None:
+        """Keyframes the given Blender object at ``frame`` with its current appearance.
 
         Args:
-            size: The size of the object in Blender units.
-            location: The location of the object in Blender space.
+            cell_view: The Blender object to hold.
+            frame: The frame to insert the keyframe on.
         """
 
     @abstractmethod
@@ -103,3 +219,13 @@ class CellBlockView(ABC, Generic[T_state]):
             cell_view: The Blender object to adjust.
             state: The state to inform the adjustment.
         """
+
+    @abstractmethod
+    def bake_cell_view(self, cell_view: Any, frames: np.ndarray, states: list[T_state]) -> None:
+        """Keyframes the given Blender object on each of ``frames`` with the matching state.
+
+        Args:
+            cell_view: The Blender object to animate.
+            frames: The frames to insert keyframes on, in ascending order.
+            states: The state for each frame.
+        """
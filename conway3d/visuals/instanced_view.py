@@ -0,0 +1,360 @@
+import os
+from collections.abc import Mapping, Sequence
+from hashlib import blake2b
+from typing import Any
+
+import bpy
+import numpy as np
+
+from ..blendutil import bake_fcurves
+from .cell_block_view import BlockView
+from .timeline import StateTimeline
+from ..datamodel import CellBlock, T_state
+from ..profiling import instrumented
+from ..trajectory import TrajectoryReader
+
+C = bpy.context
+D = bpy.data
+
+SCALE_ATTRIBUTE = 'cell_scale'
+"""The prefix of the per-point attributes that hold the scale of each cell's instance. The scales
+recorded in slot ``n`` are in the attribute ``cell_scale_n``."""
+
+SLOT_INPUT = 'Slot'
+"""The name of the node group input that selects the slot of the scales to show."""
+
+
+TRAJECTORY_PROPERTY = 'conway3d_trajectory'
+"""The mesh property that holds the path of the trajectory file an instanced view plays."""
+
+STEP_PROPERTY = 'conway3d_frame_step'
+"""The mesh property that holds the number of frames between the generations of a trajectory."""
+
+SCALES_PROPERTY = 'conway3d_scales'
+"""The mesh property that holds the scale of the cell mesh for each state ordinal of a
+trajectory."""
+
+SHOWN_PROPERTY = 'conway3d_shown'
+"""The mesh property that holds the generation of a trajectory that is shown."""
+
+_readers: dict[str, TrajectoryReader] = {}
+"""The open trajectory files, by path."""
+
+
+def slot_attribute(slot: int) -> str:
+    """Returns the name of the point attribute that holds the scales recorded in ``slot``."""
+    return f'{SCALE_ATTRIBUTE}_{slot}'
+
+
+def _new_socket(group: Any, name: str, in_out: str, socket_type: str) -> str:
+    """Adds a socket to a node group's interface in Blender 4.0 and later, or to its inputs or
+    outputs in earlier versions.
+
+    Returns:
+        The identifier of the new socket, which names its value on a Geometry Nodes modifier.
+    """
+    if hasattr(group, 'interface'):
+        socket = group.interface.new_socket(name=name, in_out=in_out, socket_type=socket_type)
+    elif in_out == 'INPUT':
+        socket = group.inputs.new(socket_type, name)
+    else:
+        socket = group.outputs.new(socket_type, name)
+
+    return socket.identifier
+
+
+def make_instance_nodes(name: str, instance: Any) -> tuple[Any, str]:
+    """Creates a Geometry Nodes group that places a copy of ``instance`` on every point of its
+    input geometry, scaled by the point attribute of the slot given by its ``SLOT_INPUT``.
+
+    Args:
+        name: The name of the new node group.
+        instance: The object whose geometry is instanced.
+
+    Returns:
+        A reference to the new node group, and the identifier of its ``SLOT_INPUT``.
+    """
+    group = D.node_groups.new(name, 'GeometryNodeTree')
+    _new_socket(group, 'Geometry', 'INPUT', 'NodeSocketGeometry')
+    slot_input = _new_socket(group, SLOT_INPUT, 'INPUT', 'NodeSocketInt')
+    _new_socket(group, 'Geometry', 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = group.nodes
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+    info = nodes.new('GeometryNodeObjectInfo')
+    info.inputs['Object'].default_value = instance
+    slot = nodes.new('FunctionNodeValueToString')
+    attribute_name = nodes.new('FunctionNodeReplaceString')
+    attribute_name.inputs['String'].default_value = slot_attribute('#')
+    attribute_name.inputs['Find'].default_value = '#'
+    scale = nodes.new('GeometryNodeInputNamedAttribute')
+    scale.data_type = 'FLOAT'
+    on_points = nodes.new('GeometryNodeInstanceOnPoints')
+
+    # Named Attribute has one output per data type in some versions; only the active one is enabled.
+    attribute = next(s for s in scale.outputs if s.name == 'Attribute' and s.enabled)
+
+    links = group.links
+    links.new(group_in.outputs[SLOT_INPUT], slot.inputs['Value'])
+    links.new(slot.outputs['String'], attribute_name.inputs['Replace'])
+    links.new(attribute_name.outputs['String'], scale.inputs['Name'])
+    links.new(group_in.outputs['Geometry'], on_points.inputs['Points'])
+    links.new(info.outputs['Geometry'], on_points.inputs['Instance'])
+    links.new(attribute, on_points.inputs['Scale'])
+    links.new(on_points.outputs['Instances'], group_out.inputs['Geometry'])
+
+    return group, slot_input
+
+
+def show_trajectories(scene: Any, *args) -> None:
+    """Frame change handler that shows the generation for the scene's frame on the mesh of every
+    instanced view that plays a trajectory file.
+
+    Generations before the first and after the last frame of the trajectory hold the first and the
+    last generation.
+    """
+    frame = scene.frame_current
+
+    for mesh in D.meshes:
+        if TRAJECTORY_PROPERTY in mesh:
+            _show_generation(mesh, frame)
+
+
+def register() -> None:
+    """Adds ``show_trajectories`` to the frame change handlers, once.
+
+    The handler is kept when another file is loaded, but a new Blender session has to register it
+    before it plays a saved trajectory, for example with
+    ``blender -b scene.blend --python-expr "import conway3d; conway3d.visuals.register()" -a``.
+    """
+    handlers = bpy.app.handlers.frame_change_pre
+
+    if show_trajectories not in handlers:
+        handlers.append(bpy.app.handlers.persistent(show_trajectories))
+
+
+def unregister() -> None:
+    """Removes ``show_trajectories`` from the frame change handlers and closes the trajectory
+    files it opened."""
+    handlers = bpy.app.handlers.frame_change_pre
+
+    while show_trajectories in handlers:
+        handlers.remove(show_trajectories)
+
+    for reader in _readers.values():
+        reader.close()
+    _readers.clear()
+
+
+def _show_generation(mesh: Any, frame: int) -> None:
+    path = mesh[TRAJECTORY_PROPERTY]
+    reader = _readers.get(path)
+
+    if reader is None:
+        reader = _readers[path] = TrajectoryReader(path)
+
+    generation = min(max(frame, 0) // mesh[STEP_PROPERTY], len(reader) - 1)
+
+    if mesh.get(SHOWN_PROPERTY) == generation:
+        return
+
+    scales = np.asarray(mesh[SCALES_PROPERTY], dtype=np.float32)
+    mesh.attributes[slot_attribute(0)].data.foreach_set(
+        'value', scales[reader.read(generation).ravel()])
+    mesh[SHOWN_PROPERTY] = generation
+    mesh.update()
+
+
+class InstancedCellBlockView(BlockView[T_state]):
+    """Represents a whole cell block with a single object.
+
+    The object's mesh has one point per cell, and a Geometry Nodes modifier instances the cell mesh
+    on every point. Each cell's state is written to a per-point scale attribute with one
+    ``foreach_set`` call, so updating a generation costs one buffer write instead of a Python call
+    per cell, and blocks far larger than one object per cell allows can be shown.
+
+    Mesh attributes cannot be keyframed, so the scales recorded for each frame are kept in a point
+    attribute of their own, a slot, and the modifier's slot input is keyframed instead. Everything
+    the animation needs is saved in the blend file, and it plays and renders without any Python
+    running, including on machines that render the file from the command line.
+
+    Every slot holds a float for every cell, 4 bytes each, which is 8 MiB per slot for a 128^3
+    block. Frames whose states were already recorded, such as those of a still life or a repeating
+    cycle, share the slot of the earlier frame, and at most ``max_slots`` distinct slots are kept.
+    A trajectory file too long to record is played with ``play_trajectory`` instead, which reads
+    each generation from the file when its frame is shown.
+    """
+    __slots__ = ('_scale_of', '_encoder', '_scales', '_object', '_instance', '_modifier',
+                 '_slot_input', '_slots', '_slot_of')
+
+    max_slots: int = 256
+    """The most distinct slots kept in the mesh. At 8 MiB a slot for a 128^3 block, the limit is
+    2 GiB of mesh data in memory and in the blend file."""
+
+    def __init__(self,
+        cells: CellBlock[T_state],
+        block_name: str,
+        size: float,
+        padding: float,
+        scales: Mapping[T_state, float]
+    ):
+        """
+        Args:
+            scales: The scale of the cell mesh for each state.
+        """
+        self._scale_of = dict(scales)
+        self._encoder = StateTimeline(list(scales))
+        self._scales = np.array(list(scales.values()), dtype=np.float32)
+        self._slots: dict[int, int] = {}
+        self._slot_of: dict[bytes, int] = {}
+        super().__init__(cells, block_name, size, padding)
+
+    @property
+    def object(self) -> Any:
+        """The object that represents the whole cell block."""
+        return self._object
+
+    @instrumented('view.make_meshes')
+    def make_meshes(self):
+        """Creates the point cloud object for the cell block and the hidden object that holds the
+        instanced cell mesh."""
+        name = self._block_name
+        collection = self._collection
+
+        self._instance = D.objects.new(f'{name}-Cell', self.make_cell_mesh(self._cell_size))
+        self._instance.hide_viewport = True
+        self._instance.hide_render = True
+        collection.objects.link(self._instance)
+
+        locations = self.locations().astype(np.float32)
+        mesh = D.meshes.new(name)
+        mesh.vertices.add(len(locations))
+        mesh.vertices.foreach_set('co', locations.ravel())
+        mesh.update()
+
+        self._object = D.objects.new(name, mesh)
+        self._modifier = self._object.modifiers.new(name, 'NODES')
+        self._modifier.node_group, self._slot_input = make_instance_nodes(name, self._instance)
+        collection.objects.link(self._object)
+
+    @instrumented('view.update')
+    def update(self, changed: np.ndarray | None = None):
+        """Records the states of the backing cell block for the current frame and shows them.
+
+        Args:
+            changed: Optional. The flat indices of the cells that changed since the previous
+                update. Nothing is recorded when this is empty, since the states recorded for an
+                earlier frame still apply.
+        """
+        if changed is not None and not len(changed) and self._slots:
+            return
+
+        self.record(C.scene.frame_current, self._scales[self._encoder.encode(self._cells)])
+        self._key_slots()
+
+    @instrumented('view.bake')
+    def bake(self, timeline: StateTimeline):
+        """Shows the states from a timeline recorded ahead of time, replacing the states recorded
+        by ``update``."""
+        self.clear()
+        scales = np.array([self._scale_of[state] for state in timeline.states], dtype=np.float32)
+
+        for frame in timeline.frames:
+            self.record(frame, scales[timeline.codes_at(frame)])
+
+        self._key_slots()
+
+    @instrumented('view.bake')
+    def play_trajectory(self, path: str, frame_step: int, states: Sequence[T_state]) -> None:
+        """Shows the generations of a trajectory file, reading each one from the file when its
+        frame is shown, and replacing the states recorded by ``update`` or ``bake``.
+
+        The path, not the generations, is saved in the blend file. See ``register`` for playing it
+        in another session.
+
+        Args:
+            path: The trajectory file to play.
+            frame_step: The number of frames between generations.
+            states: The state for each ordinal in the file.
+        """
+        self.clear()
+        self.write_scales(0, np.zeros(self._cells.capacity, dtype=np.float32))
+
+        mesh = self._object.data
+        mesh[TRAJECTORY_PROPERTY] = os.path.abspath(path)
+        mesh[STEP_PROPERTY] = frame_step
+        mesh[SCALES_PROPERTY] = [self._scale_of[state] for state in states]
+
+        register()
+        show_trajectories(C.scene)
+
+    def record(self, frame: int, scales: np.ndarray) -> int:
+        """Records the scale of every cell for ``frame``, in the slot of an earlier frame with the
+        same scales or in a new one.
+
+        The slot is not keyframed until ``_key_slots`` is called.
+
+        Returns:
+            The slot of the frame.
+
+        Raises:
+            ValueError: If a new slot is needed and ``max_slots`` are already in use.
+        """
+        digest = blake2b(scales.tobytes(), digest_size=16).digest()
+        slot = self._slot_of.get(digest)
+
+        if slot is None:
+            if len(self._slot_of) >= self.max_slots:
+                raise ValueError(
+                    f'{type(self).__name__} keeps at most {self.max_slots} distinct frames; use '
+                    'play_trajectory or the object per cell view for longer animations.')
+            slot = self._slot_of[digest] = len(self._slot_of)
+            self.write_scales(slot, scales)
+
+        self._slots[frame] = slot
+        return slot
+
+    def write_scales(self, slot: int, scales: np.ndarray) -> None:
+        """Writes the scale of every cell into the point attribute of ``slot``, creating it if
+        needed."""
+        mesh = self._object.data
+        name = slot_attribute(slot)
+        attribute = mesh.attributes.get(name) or mesh.attributes.new(name, 'FLOAT', 'POINT')
+        attribute.data.foreach_set('value', scales)
+        mesh.update()
+
+    def clear(self) -> None:
+        """Removes every recorded slot, the keyframes that select them and any trajectory file
+        being played."""
+        mesh = self._object.data
+
+        for slot in range(max(len(self._slot_of), 1)):
+            attribute = mesh.attributes.get(slot_attribute(slot))
+            if attribute is not None:
+                mesh.attributes.remove(attribute)
+
+        for name in (TRAJECTORY_PROPERTY, STEP_PROPERTY, SCALES_PROPERTY, SHOWN_PROPERTY):
+            if name in mesh:
+                del mesh[name]
+
+        animation = self._object.animation_data
+        if animation is not None and animation.action is not None:
+            fcurve = animation.action.fcurves.find(self._slot_path())
+            if fcurve is not None:
+                animation.action.fcurves.remove(fcurve)
+
+        self._modifier[self._slot_input] = 0
+        self._slots.clear()
+        self._slot_of.clear()
+
+    def _key_slots(self) -> None:
+        """Keyframes the modifier's slot input to select the slot recorded for each frame. A slot
+        holds until the next recorded frame."""
+        frames = np.array(sorted(self._slots), dtype=np.float32)
+        slots = np.array([self._slots[frame] for frame in sorted(self._slots)], dtype=np.float32)
+        bake_fcurves(self._object, self._slot_path(), frames, slots[:, np.newaxis], 'CONSTANT')
+
+    def _slot_path(self) -> str:
+        """Returns the path of the modifier's slot input from the object."""
+        return f'modifiers["{self._modifier.name}"]["{self._slot_input}"]'
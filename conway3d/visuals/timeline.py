@@ -0,0 +1,147 @@
+from bisect import bisect_right
+from collections.abc import Generator, Iterable, Sequence
+
+import numpy as np
+
+from ..datamodel import CellBlock, DenseCellBlock, PackedCellBlock, T_state
+
+
+class StateTimeline:
+    """The states of every cell in a block, recorded on a series of animation frames.
+
+    States are stored as ``uint8`` codes, the index of each state in ``states``, with one array
+    per recorded frame. A cell keeps the states recorded for a frame until the next recorded frame.
+    """
+    __slots__ = ('_states', '_lookup', '_frames', '_codes')
+
+    def __init__(self, states: Sequence[T_state]):
+        """
+        Args:
+            states: Every state a cell can be in.
+        """
+        self._states = tuple(states)
+        self._lookup = {state: i for (i, state) in enumerate(self._states)}
+        self._frames: list[int] = []
+        self._codes: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def states(self) -> tuple[T_state, ...]:
+        """Every state a cell can be in, indexed by code."""
+        return self._states
+
+    @property
+    def frames(self) -> list[int]:
+        """The recorded frames in ascending order."""
+        return self._frames
+
+    def encode(self, cells: CellBlock[T_state]) -> np.ndarray:
+        """Returns the code of every cell's state, in the order the cell block iterates over
+        them."""
+        lookup = self._lookup
+
+        if isinstance(cells, (DenseCellBlock, PackedCellBlock)):
+            ordinals = cells.array if isinstance(cells, DenseCellBlock) else cells.unpack()
+            codes = np.array([lookup[state] for state in cells.states], dtype=np.uint8)
+            return codes[ordinals.ravel()]
+
+        return np.fromiter(
+            (lookup[state] for state in cells.values()), dtype=np.uint8, count=cells.capacity)
+
+    def record(self, frame: int, cells: CellBlock[T_state]) -> np.ndarray:
+        """Records the states of every cell on ``frame``, replacing any states already recorded
+        for it.
+
+        Returns:
+            The codes that were recorded.
+        """
+        codes = self.encode(cells)
+        i = bisect_right(self._frames, frame)
+
+        if i and self._frames[i - 1] == frame:
+            self._codes[i - 1] = codes
+        else:
+            self._frames.insert(i, frame)
+            self._codes.insert(i, codes)
+
+        return codes
+
+    def codes_at(self, frame: int) -> np.ndarray | None:
+        """Returns the codes in effect on ``frame``, or ``None`` if it is before the first recorded
+        frame."""
+        i = bisect_right(self._frames, frame)
+        return self._codes[i - 1] if i else None
+
+    def cell_keys(self) -> Generator[tuple[int, np.ndarray, np.ndarray]]:
+        """Yields the keyframes needed to animate each cell, as ``stream_cell_keys`` does for the
+        recorded frames."""
+        yield from stream_cell_keys(zip(self._frames, self._codes))
+
+
+def stream_cell_keys(
+    generations: Iterable[tuple[int, np.ndarray]]
+) -> Generator[tuple[int, np.ndarray, np.ndarray]]:
+    """Yields the keyframes needed to animate each cell from a series of recorded frames.
+
+    A cell gets a key on the first frame, and for each change of state a key on the frame of the
+    change, plus a key holding its previous state on the frame before it, so that it does not
+    drift towards its new state over the frames in between.
+
+    Only two frames are held at a time, so a long series, such as the generations read from a
+    trajectory file, needs memory for the keys rather than for every frame of every cell.
+
+    Args:
+        generations: The frame and the codes of every cell's state on it, in ascending order of
+            frame.
+
+    Yields:
+        The index of each cell, the frames of its keys and the codes of its state on each one.
+    """
+    frames: list[int] = []
+    cells: list[np.ndarray] = []
+    rows: list[np.ndarray] = []
+    codes: list[np.ndarray] = []
+    previous: np.ndarray | None = None
+
+    for (row, (frame, current)) in enumerate(generations):
+        current = np.asarray(current).ravel()
+        frames.append(frame)
+
+        if previous is None:
+            changed = np.arange(len(current), dtype=np.intp)
+        else:
+            changed = np.flatnonzero(current != previous)
+            cells.append(changed)
+            rows.append(np.full(len(changed), row - 1, dtype=np.intp))
+            codes.append(previous[changed])
+
+        cells.append(changed)
+        rows.append(np.full(len(changed), row, dtype=np.intp))
+        codes.append(current[changed])
+        previous = current
+
+    if not frames:
+        return
+
+    cells = np.concatenate(cells)
+    rows = np.concatenate(rows)
+    codes = np.concatenate(codes)
+
+    # Sorted by cell, then row, a hold key repeats the key of a change on the frame before it.
+    order = np.lexsort((rows, cells))
+    cells, rows, codes = cells[order], rows[order], codes[order]
+    unique = np.ones(len(cells), dtype=bool)
+    unique[1:] = (cells[1:] != cells[:-1]) | (rows[1:] != rows[:-1])
+    cells, rows, codes = cells[unique], rows[unique], codes[unique]
+
+    frames = np.array(frames)
+    bounds = np.flatnonzero(np.diff(cells)) + 1
+
+    starts = np.r_[0, bounds]
+
+    for (cell, start, end) in zip(
+        cells[starts].tolist(), starts.tolist(), np.r_[bounds, len(cells)].tolist()
+    ):
+        yield cell, frames[rows[start:end]], codes[start:end]
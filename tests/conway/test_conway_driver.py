@@ -0,0 +1,401 @@
+from random import Random
+
+import numpy as np
+import pytest
+
+from conway3d.conway import (BasicConwayDriver, ConwayCellState, SparseConwayDriver,
+                            UncertainConwayDriver, cell_states)
+from conway3d.datamodel import (CellBlock, DenseCellBlock, IVector, PackedCellBlock,
+                                cubic_neighbor_model)
+from conway3d.engine import Boundary, SlabExecutor, count_neighbors, neighbor_offsets
+
+
+def random_blocks(size: IVector, seed: int) -> tuple[CellBlock, DenseCellBlock]:
+    rng = Random(seed)
+    cells = CellBlock(size)
+    dense = DenseCellBlock(size, ConwayCellState)
+
+    for xyz in cells:
+        state = ConwayCellState.ALIVE if rng.random() < 0.3 else ConwayCellState.DEAD
+        cells[xyz] = state
+        dense[xyz] = state
+
+    return cells, dense
+
+
+@pytest.mark.parametrize('size', [(5, 5, 5), (7, 4, 3), (1, 6, 6)])
+def test_count_neighbors(size: IVector):
+    cells, dense = random_blocks(size, 1)
+    driver = BasicConwayDriver(cells)
+    counts = count_neighbors(
+        dense.array != ConwayCellState.DEAD.value, neighbor_offsets(cubic_neighbor_model))
+
+    for (x, y, z) in cells:
+        assert counts[z, y, x] == driver.get_neighbor_count((x, y, z))
+
+
+@pytest.mark.parametrize('size, seed', [((6, 6, 6), 1), ((8, 5, 7), 2), ((10, 10, 10), 3)])
+def test_batched_generation_parity(size: IVector, seed: int):
+    cells, dense = random_blocks(size, seed)
+    driver = BasicConwayDriver(cells)
+    dense_driver = BasicConwayDriver(dense)
+
+    for _ in range(5):
+        driver.next_generation()
+        dense_driver.next_generation()
+
+        assert list(dense.values()) == list(cells.values())
+
+    assert dense_driver.generation == driver.generation == 5
+
+
+def test_uncertain_without_uncertainty_matches_basic():
+    _, dense = random_blocks((8, 8, 8), 4)
+    other = dense.copy()
+    basic = BasicConwayDriver(dense)
+    uncertain = UncertainConwayDriver(other, uncertainty=0)
+
+    for _ in range(3):
+        basic.next_generation()
+        uncertain.next_generation()
+
+    assert np.array_equal(dense.array, other.array)
+
+
+@pytest.mark.parametrize('rule', ['4555', '5766', '1-3/1,3/2/N', '13-26/13-14,17-19/2/M'])
+def test_rule_parity(rule: str):
+    cells, dense = random_blocks((7, 6, 5), 5)
+    driver = BasicConwayDriver(cells, rule=rule)
+    dense_driver = BasicConwayDriver(dense, rule=rule)
+
+    for _ in range(3):
+        driver.next_generation()
+        dense_driver.next_generation()
+
+        assert list(dense.values()) == list(cells.values())
+
+
+@pytest.mark.parametrize('rule', ['4-6/6/2/M', '0-2/1/2/N', '5766'])
+def test_sparse_parity(rule: str):
+    cells, dense = random_blocks((9, 7, 8), 6)
+    sparse_cells = cells.copy()
+    sparse_dense = dense.copy()
+    basic = BasicConwayDriver(dense, rule=rule)
+    sparse = SparseConwayDriver(sparse_dense, rule=rule)
+    sparse_dict = SparseConwayDriver(sparse_cells, rule=rule)
+
+    for _ in range(4):
+        basic.next_generation()
+        sparse.next_generation()
+        sparse_dict.next_generation()
+
+        assert np.array_equal(dense.array, sparse_dense.array)
+        assert list(sparse_cells.values()) == list(dense.values())
+        assert sparse.population == sparse_dict.population == basic.population
+
+
+def test_sparse_rejects_birth_on_zero():
+    with pytest.raises(ValueError):
+        SparseConwayDriver(DenseCellBlock((4, 4, 4), ConwayCellState), rule='/0/2/M')
+
+
+@pytest.mark.parametrize('rule', ['4-6/6/2/M', '1-3/1,3/2/N'])
+def test_toroidal_parity(rule: str):
+    cells, dense = random_blocks((6, 5, 4), 7)
+    sparse_dense = dense.copy()
+    driver = BasicConwayDriver(cells, rule=rule, boundary=Boundary.TOROIDAL)
+    dense_driver = BasicConwayDriver(dense, rule=rule, boundary=Boundary.TOROIDAL)
+    sparse = SparseConwayDriver(sparse_dense, rule=rule, boundary=Boundary.TOROIDAL)
+
+    for _ in range(3):
+        driver.next_generation()
+        dense_driver.next_generation()
+        sparse.next_generation()
+
+        assert list(dense.values()) == list(cells.values())
+        assert np.array_equal(dense.array, sparse_dense.array)
+
+
+def test_toroidal_wraps():
+    cells = DenseCellBlock((5, 5, 5), ConwayCellState)
+    cells[(0, 0, 0)] = ConwayCellState.ALIVE
+    driver = BasicConwayDriver(cells, boundary=Boundary.TOROIDAL)
+
+    assert set(driver.get_neighbor_locations((0, 0, 0))) >= {(4, 4, 4), (1, 0, 4), (4, 0, 0)}
+    assert driver.get_neighbor_count((4, 4, 4)) == 1
+
+
+def test_unbounded_matches_large_fixed_block():
+    rule = '2-6/3/2/M'
+    small = DenseCellBlock((4, 4, 4), ConwayCellState)
+    large = DenseCellBlock((40, 40, 40), ConwayCellState)
+    pattern = [(1, 1, 1), (2, 1, 1), (1, 2, 1), (2, 2, 2), (0, 1, 2), (3, 3, 3)]
+
+    for (x, y, z) in pattern:
+        small[(x, y, z)] = ConwayCellState.ALIVE
+        large[(x + 18, y + 18, z + 18)] = ConwayCellState.ALIVE
+
+    unbounded = SparseConwayDriver(small, rule=rule, boundary=Boundary.UNBOUNDED)
+    fixed = SparseConwayDriver(large, rule=rule)
+
+    for _ in range(4):
+        unbounded.next_generation()
+        fixed.next_generation()
+
+    assert unbounded.population == fixed.population > 0
+    ox, oy, oz = unbounded.origin
+    live = {
+        (x - ox + 18, y - oy + 18, z - oz + 18)
+        for (x, y, z) in small if small[(x, y, z)] == ConwayCellState.ALIVE
+    }
+    assert live == {xyz for xyz in large if large[xyz] == ConwayCellState.ALIVE}
+
+
+@pytest.mark.parametrize('driver_type', [BasicConwayDriver, UncertainConwayDriver])
+def test_unbounded_requires_sparse(driver_type):
+    with pytest.raises(ValueError):
+        driver_type(DenseCellBlock((4, 4, 4), ConwayCellState), boundary=Boundary.UNBOUNDED)
+
+
+@pytest.mark.parametrize('size', [(5, 6, 7), (64, 4, 3), (67, 3, 4)])
+@pytest.mark.parametrize('rule', ['4-6/6/2/M', '1-3/1,3/2/N', '0-5/2,25-26/2/M'])
+@pytest.mark.parametrize('boundary', [Boundary.FIXED, Boundary.TOROIDAL])
+def test_packed_parity(size: IVector, rule: str, boundary: Boundary):
+    _, dense = random_blocks(size, 8)
+    packed = PackedCellBlock(size, ConwayCellState)
+    packed.update(dense)
+    dense_driver = BasicConwayDriver(dense, rule=rule, boundary=boundary)
+    packed_driver = BasicConwayDriver(packed, rule=rule, boundary=boundary)
+
+    for _ in range(3):
+        dense_driver.next_generation()
+        packed_driver.next_generation()
+
+        assert np.array_equal(packed.unpack(), dense.array)
+
+
+@pytest.mark.parametrize('block_type', [DenseCellBlock, PackedCellBlock])
+@pytest.mark.parametrize('boundary', [Boundary.FIXED, Boundary.TOROIDAL])
+@pytest.mark.parametrize('workers', [2, 3, 16])
+def test_parallel_parity(block_type, boundary: Boundary, workers: int):
+    _, dense = random_blocks((9, 8, 11), 9)
+    cells = block_type(dense.size, ConwayCellState)
+    cells.update(dense)
+    serial = BasicConwayDriver(dense, boundary=boundary)
+
+    with SlabExecutor(workers) as executor:
+        parallel = BasicConwayDriver(cells, boundary=boundary, executor=executor)
+
+        for _ in range(3):
+            serial.next_generation()
+            parallel.next_generation()
+
+            assert list(cells.values()) == list(dense.values())
+
+
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_populate_is_seeded(block_type):
+    size = (6, 5, 4)
+    expected = DenseCellBlock(size, ConwayCellState)
+    BasicConwayDriver(expected, seed=11).populate()
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    BasicConwayDriver(cells, seed=11).populate()
+
+    assert list(cells.values()) == list(expected.values())
+    assert 0 < expected.array.sum() < expected.capacity
+
+
+@pytest.mark.parametrize('workers', [None, 2, 5])
+def test_uncertain_is_reproducible(workers: int | None):
+    size = (7, 6, 8)
+    cells = CellBlock(size)
+    dense = DenseCellBlock(size, ConwayCellState)
+    scalar = UncertainConwayDriver(cells, uncertainty=0.2, seed=5)
+    executor = SlabExecutor(workers) if workers else None
+    batched = UncertainConwayDriver(dense, uncertainty=0.2, seed=5, executor=executor)
+    scalar.populate()
+    batched.populate()
+
+    for _ in range(3):
+        scalar.next_generation()
+        batched.next_generation()
+
+        assert list(cells.values()) == list(dense.values())
+
+
+@pytest.mark.parametrize('driver_type', [BasicConwayDriver, SparseConwayDriver])
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_population_history(driver_type, block_type):
+    size = (7, 6, 5)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    driver = driver_type(cells, probability=0.3, rule='2-6/5/2/M', seed=8)
+    driver.populate()
+    previous = {xyz: cells[xyz] for xyz in cells}
+
+    for generation in range(1, 5):
+        driver.next_generation()
+        current = {xyz: cells[xyz] for xyz in cells}
+        alive = ConwayCellState.ALIVE
+        births = sum(1 for xyz in cells if current[xyz] == alive and previous[xyz] != alive)
+        deaths = sum(1 for xyz in cells if current[xyz] != alive and previous[xyz] == alive)
+        population = sum(1 for state in current.values() if state == alive)
+
+        assert driver.population == population
+        assert driver.history.rows[-1].tolist() == [generation, population, births, deaths]
+        previous = current
+
+    assert driver.history.generations.tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('driver_type', [BasicConwayDriver, SparseConwayDriver])
+@pytest.mark.parametrize('block_type', [DenseCellBlock, PackedCellBlock])
+def test_cycle_detection(driver_type, block_type):
+    cells = block_type((8, 8, 8), ConwayCellState)
+    driver = driver_type(cells, probability=0.2, rule='4-6/6/2/M', seed=11)
+    driver.populate()
+    snapshots = [cells.copy()]
+
+    while driver.cycle is None and driver.generation < 200:
+        driver.next_generation()
+        snapshots.append(cells.copy())
+
+    cycle = driver.cycle
+    assert cycle is not None
+    assert cycle.start + cycle.period == driver.generation
+    assert list(snapshots[cycle.start].values()) == list(cells.values())
+
+    for (offset, state) in enumerate(driver.cycle_states()):
+        expected = snapshots[cycle.phase_of(driver.generation - cycle.period + offset)]
+        assert list(state.values()) == list(expected.values())
+
+
+def test_extinction_is_detected():
+    driver = BasicConwayDriver(DenseCellBlock((4, 4, 4), ConwayCellState), probability=0)
+    driver.populate()
+    driver.next_generation()
+
+    assert driver.cycle.still_life
+    assert driver.cycle.extinct
+
+
+def test_uncertain_cycles_are_not_detected():
+    driver = UncertainConwayDriver(DenseCellBlock((4, 4, 4), ConwayCellState), probability=0,
+                                   uncertainty=0.5, seed=3)
+    driver.populate()
+
+    for _ in range(5):
+        driver.next_generation()
+
+    assert driver.cycle is None
+
+
+@pytest.mark.parametrize('driver_type', [BasicConwayDriver, SparseConwayDriver])
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_changed_cells(driver_type, block_type):
+    size = (6, 5, 4)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    driver = driver_type(cells, probability=0.3, rule='2-6/5/2/M', seed=4)
+    driver.populate()
+
+    assert driver.changed is None
+
+    for _ in range(3):
+        previous = list(cells.values())
+        driver.next_generation()
+        expected = [i for (i, (a, b)) in enumerate(zip(previous, cells.values())) if a != b]
+
+        assert driver.changed.tolist() == expected
+
+
+def test_cell_states():
+    states = cell_states(5)
+
+    assert cell_states(2) is ConwayCellState
+    assert cell_states(5) is states
+    assert [state.name for state in states] == ['DEAD', 'ALIVE', 'DECAY_1', 'DECAY_2', 'DECAY_3']
+    assert [state.value for state in states] == list(range(5))
+
+    with pytest.raises(ValueError):
+        cell_states(257)
+
+
+def random_decay_blocks(size: IVector, states: int, seed: int) -> tuple[CellBlock, DenseCellBlock]:
+    rng = Random(seed)
+    state_type = tuple(cell_states(states))
+    cells = CellBlock(size)
+    dense = DenseCellBlock(size, cell_states(states))
+
+    for xyz in cells:
+        state = state_type[rng.randrange(states)] if rng.random() < 0.4 else state_type[0]
+        cells[xyz] = state
+        dense[xyz] = state
+
+    return cells, dense
+
+
+@pytest.mark.parametrize('rule', ['4/4/5/M', '2-3/1-2/4/N', '13-26/13-14,17-19/10/M'])
+@pytest.mark.parametrize('driver_type, options', [
+    (BasicConwayDriver, {}),
+    (UncertainConwayDriver, {'uncertainty': 0.1, 'seed': 3}),
+])
+def test_decay_parity(rule: str, driver_type, options: dict):
+    cells, dense = random_decay_blocks((7, 6, 5), int(rule.split('/')[2]), 5)
+    driver = driver_type(cells, rule=rule, **options)
+    dense_driver = driver_type(dense, rule=rule, executor=SlabExecutor(2), **options)
+
+    for _ in range(4):
+        driver.next_generation()
+        dense_driver.next_generation()
+
+        assert list(dense.values()) == list(cells.values())
+        assert dense_driver.population == driver.population == dense_driver.count_population()
+        assert np.array_equal(dense_driver.changed, driver.changed)
+
+
+def test_decaying_cell_dies():
+    states = cell_states(5)
+    cells = DenseCellBlock((3, 3, 3), states)
+    cells[(1, 1, 1)] = states.ALIVE
+    driver = BasicConwayDriver(cells, rule='4/4/5/M')
+    driver.start_history()
+    seen = []
+
+    for _ in range(4):
+        driver.next_generation()
+        seen.append(cells[(1, 1, 1)])
+
+    assert seen == [states.DECAY_1, states.DECAY_2, states.DECAY_3, states.DEAD]
+    assert driver.history.population.tolist() == [1, 1, 1, 1, 0]
+    assert driver.history.deaths.tolist() == [0, 0, 0, 0, 1]
+
+
+def test_decaying_cells_are_not_neighbors():
+    states = cell_states(3)
+    cells = DenseCellBlock((3, 3, 3), states)
+    for xyz in [(0, 0, 0), (1, 0, 0), (2, 0, 0)]:
+        cells[xyz] = states.DECAY_1
+
+    # A dead cell with three decaying neighbors is not born under B3.
+    driver = BasicConwayDriver(cells, rule='/3/3/M')
+    driver.next_generation()
+
+    assert driver.population == 0
+
+
+def test_sparse_rejects_decay():
+    with pytest.raises(ValueError):
+        SparseConwayDriver(DenseCellBlock((4, 4, 4), cell_states(5)), rule='4/4/5/M')
+
+
+@pytest.mark.parametrize('driver_type, options', [
+    (BasicConwayDriver, {}), (BasicConwayDriver, {'rule': '4/4/5/M'}),
+    (UncertainConwayDriver, {'uncertainty': 0.5, 'seed': 1}),
+])
+def test_unpopulated_cell_block(driver_type, options):
+    cells = CellBlock((4, 4, 4))
+    driver = driver_type(cells, **options)
+
+    driver.next_generation()
+
+    assert driver.generation == 1
+    assert all(state is not None for state in cells.values())
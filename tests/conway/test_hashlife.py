@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from conway3d.conway import ConwayCellState, ConwayHashLife, SparseConwayDriver
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from conway3d.engine import Boundary
+
+
+@pytest.mark.parametrize('rule, cache_size', [
+    ('4-6/6/2/M', 1 << 18), ('2-6/5/2/M', 1 << 18), ('0-6/1,3/2/N', 1 << 18), ('4-6/6/2/M', 64)
+])
+def test_matches_unbounded_driver(rule: str, cache_size: int):
+    cells = DenseCellBlock((6, 6, 6), ConwayCellState)
+    driver = SparseConwayDriver(cells, probability=0.35, rule=rule, boundary=Boundary.UNBOUNDED,
+                                seed=5)
+    driver.populate()
+    universe = ConwayHashLife(rule, cache_size)
+    universe.load_cells(cells)
+
+    for generations in (1, 2, 5, 8):
+        for _ in range(generations):
+            driver.next_generation()
+        universe.advance(generations)
+
+        ox, oy, oz = driver.origin
+        assert np.array_equal(universe.read((-ox, -oy, -oz), cells.size),
+                              cells.array == ConwayCellState.ALIVE.value)
+        assert universe.population == driver.population
+        assert universe.generation == driver.generation
+
+    assert universe.cached <= cache_size
+
+
+def test_jump():
+    rng = np.random.default_rng(2)
+    stepped = ConwayHashLife()
+    jumped = ConwayHashLife()
+    alive = rng.random((8, 8, 8)) < 0.3
+    stepped.load(alive, (-4, -4, -4))
+    jumped.load(alive, (-4, -4, -4))
+
+    for _ in range(16):
+        stepped.jump(0)
+    jumped.jump(4)
+
+    assert jumped.generation == 16
+    assert np.array_equal(stepped.read((-20, -20, -20), (40, 40, 40)),
+                          jumped.read((-20, -20, -20), (40, 40, 40)))
+
+
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_materialize(block_type):
+    size = (5, 6, 7)
+    source = DenseCellBlock(size, ConwayCellState)
+    source.array[...] = np.random.default_rng(3).random((7, 6, 5)) < 0.4
+    universe = ConwayHashLife()
+    universe.load_cells(source, (-2, 3, -9))
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    universe.materialize(cells, (-2, 3, -9))
+
+    assert list(cells.values()) == list(source.values())
+
+
+def test_rejects_birth_on_zero():
+    with pytest.raises(ValueError):
+        ConwayHashLife('4/0,6/2/M')
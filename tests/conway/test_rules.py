@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from conway3d.conway import BASIC_RULE, BasicConwayDriver, ConwayCellState, ConwayRule
+from conway3d.datamodel import DenseCellBlock, cubic_neighbor_model, simple_neighbor_model
+
+
+@pytest.mark.parametrize(
+    'notation, survive, birth, states, neighborhood',
+    [
+        ('4-6/6/2/M', {4, 5, 6}, {6}, 2, 'M'),
+        ('4555', {4, 5}, {5}, 2, 'M'),
+        ('5766', {5, 6, 7}, {6}, 2, 'M'),
+        ('13-26/13-14,17-19/2/M', set(range(13, 27)), {13, 14, 17, 18, 19}, 2, 'M'),
+        ('/1,3/2/n', set(), {1, 3}, 2, 'N'),
+        ('2,6,9/4,6,8-9/10/M', {2, 6, 9}, {4, 6, 8, 9}, 10, 'M'),
+    ]
+)
+def test_parse(notation: str, survive: set, birth: set, states: int, neighborhood: str):
+    rule = ConwayRule.parse(notation)
+
+    assert rule.survive == survive
+    assert rule.birth == birth
+    assert rule.states == states
+    assert rule.neighborhood == neighborhood
+    assert ConwayRule.parse(str(rule)) == rule
+
+
+@pytest.mark.parametrize('notation', ['4-6/6/2', '4-6/6/2/X', '4-6/27/2/M', '4-6/7/2/N', 'a/1/2/M',
+                                      '4/4/1/M', '4/4/257/M'])
+def test_parse_invalid(notation: str):
+    with pytest.raises(ValueError):
+        ConwayRule.parse(notation)
+
+
+def test_tables():
+    assert BASIC_RULE.neighbors is cubic_neighbor_model
+    assert ConwayRule.parse('1/1/2/N').neighbors is simple_neighbor_model
+    assert np.flatnonzero(BASIC_RULE.survive_table).tolist() == [4, 5, 6]
+    assert np.flatnonzero(BASIC_RULE.birth_table).tolist() == [6]
+    assert len(BASIC_RULE.survive_table) == 27
+
+
+def test_transition_table():
+    table = ConwayRule.parse('4/4/5/M').transition_table
+
+    assert table.shape == (5, 27)
+    assert table.dtype == np.uint8
+    # Dead cells are born on 4, live cells survive on 4 and decay otherwise, and decaying cells
+    # advance whatever their neighbors.
+    assert table[:, 4].tolist() == [1, 1, 3, 4, 0]
+    assert table[:, 3].tolist() == [0, 2, 3, 4, 0]
+    assert not table.flags.writeable
+
+
+def test_two_state_transition_table():
+    table = BASIC_RULE.transition_table
+
+    assert np.array_equal(table[0], BASIC_RULE.birth_table)
+    assert np.array_equal(table[1], BASIC_RULE.survive_table)
+
+
+def test_driver_requires_matching_states():
+    with pytest.raises(ValueError):
+        BasicConwayDriver(DenseCellBlock((4, 4, 4), ConwayCellState), rule='4/4/5/M')
@@ -1,6 +1,7 @@
 import pytest
 
-from conway3d.datamodel import CellBlock, IVector
+from conway3d.datamodel import CellBlock, DenseCellBlock, IVector, PackedCellBlock
+from ..mocks import MockState
 
 """
 Test functions use this test (x,y,z) data:
@@ -64,3 +65,41 @@ class TestCellBlock:
     def test_iter(self, size: IVector, locations):
         cells = CellBlock(size)
         assert set([xyz for xyz in cells]) == set(locations)
+
+
+@pytest.mark.parametrize('make_block', [
+    lambda size: CellBlock(size),
+    lambda size: DenseCellBlock(size, MockState),
+    lambda size: PackedCellBlock(size, MockState),
+])
+def test_stage_and_swap(make_block):
+    cells = make_block((70, 3, 2))
+    for xyz in cells:
+        cells[xyz] = MockState.EMPTY
+
+    changes = []
+    cells.observe(lambda xyz, old, new: changes.append((xyz, old, new)))
+    full = {(0, 0, 0), (64, 1, 0), (69, 2, 1)}
+
+    for xyz in cells:
+        cells.stage(xyz, MockState.FULL if xyz in full else MockState.EMPTY)
+
+    assert all(cells[xyz] == MockState.EMPTY for xyz in full)
+    cells.swap()
+
+    assert sorted(changes) == sorted((xyz, MockState.EMPTY, MockState.FULL) for xyz in full)
+    assert {xyz for xyz in cells if cells[xyz] == MockState.FULL} == full
+
+    # The old states are reused as the back buffer.
+    changes.clear()
+    for xyz in cells:
+        cells.stage(xyz, MockState.EMPTY)
+    cells.swap()
+
+    assert sorted(changes) == sorted((xyz, MockState.FULL, MockState.EMPTY) for xyz in full)
+    assert all(state == MockState.EMPTY for state in cells.values())
+
+
+def test_stage_outside_block():
+    with pytest.raises(KeyError):
+        CellBlock((2, 2, 2)).stage((2, 0, 0), MockState.FULL)
@@ -0,0 +1,80 @@
+import pytest
+
+from conway3d.datamodel import CellBlock, DenseCellBlock, IVector
+from ..mocks import MockState
+
+
+class TestDenseCellBlock:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self._size = (4, 3, 2)
+        self._cells = DenseCellBlock(self._size, MockState)
+
+    def test_initial_state(self):
+        assert set(self._cells.values()) == {MockState.EMPTY}
+
+    @pytest.mark.parametrize(
+        'location',
+        [(0, 0, 0), (3, 0, 0), (0, 2, 0), (0, 0, 1), (3, 2, 1)]
+    )
+    def test_set_get(self, location: IVector):
+        self._cells[location] = MockState.FULL
+        assert self._cells[location] == MockState.FULL
+
+        x, y, z = location
+        assert self._cells.array[z, y, x] == 1
+        assert self._cells.array.sum() == 1
+
+    @pytest.mark.parametrize('location', [(-1, 0, 0), (4, 0, 0), (0, 3, 0), (0, 0, 2)])
+    def test_out_of_bounds(self, location: IVector):
+        with pytest.raises(KeyError):
+            self._cells[location] = MockState.FULL
+
+        with pytest.raises(KeyError):
+            _ = self._cells[location]
+
+    def test_array_layout(self):
+        assert self._cells.array.shape == (2, 3, 4)
+        assert self._cells.array.flags.c_contiguous
+
+        for (i, xyz) in enumerate(self._cells):
+            if i % 2:
+                self._cells[xyz] = MockState.FULL
+
+        assert self._cells.array.ravel().tolist() == [i % 2 for i in range(self._cells.capacity)]
+
+    def test_copy(self):
+        self._cells[(1, 1, 1)] = MockState.FULL
+        other = self._cells.copy()
+        other[(1, 1, 1)] = MockState.EMPTY
+
+        assert isinstance(other, DenseCellBlock)
+        assert self._cells[(1, 1, 1)] == MockState.FULL
+        assert other[(1, 1, 1)] == MockState.EMPTY
+
+    def test_update_from_cell_block(self):
+        cells = CellBlock(self._size)
+        for xyz in cells:
+            cells[xyz] = MockState.FULL if xyz[0] == 2 else MockState.EMPTY
+
+        self._cells.update(cells)
+
+        assert list(self._cells.values()) == list(cells.values())
+
+    def test_name_of(self):
+        assert self._cells.name_of((3, 2, 1)) == 'Cell-010203'
+
+    @pytest.mark.parametrize('size, offset', [((6, 5, 4), (1, 2, 1)), ((2, 2, 2), (-1, 0, -1))])
+    def test_resize_matches_cell_block(self, size: IVector, offset: IVector):
+        cells = CellBlock(self._size)
+        for (i, xyz) in enumerate(cells):
+            state = MockState.FULL if i % 3 else MockState.EMPTY
+            cells[xyz] = state
+            self._cells[xyz] = state
+
+        cells.resize(size, offset, MockState.EMPTY)
+        self._cells.resize(size, offset)
+
+        assert self._cells.size == size
+        assert self._cells.array.shape == tuple(reversed(size))
+        assert list(self._cells.values()) == list(cells.values())
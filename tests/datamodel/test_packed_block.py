@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from conway3d.datamodel import CellBlock, IVector, PackedCellBlock, pack_bits, unpack_bits
+from ..mocks import MockState
+
+
+@pytest.mark.parametrize('shape', [(2, 3, 5), (1, 2, 64), (3, 2, 130)])
+def test_pack_round_trip(shape: tuple[int, int, int]):
+    bits = np.random.default_rng(2).random(shape) < 0.5
+    words = pack_bits(bits)
+
+    assert words.dtype == np.uint64
+    assert words.shape == shape[:2] + (-(-shape[2] // 64),)
+    assert np.array_equal(unpack_bits(words, shape[2]), bits)
+
+
+class TestPackedCellBlock:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self._size = (70, 3, 2)
+        self._cells = PackedCellBlock(self._size, MockState)
+
+    @pytest.mark.parametrize('location', [(0, 0, 0), (63, 1, 0), (64, 2, 1), (69, 2, 1)])
+    def test_set_get(self, location: IVector):
+        self._cells[location] = MockState.FULL
+        assert self._cells[location] == MockState.FULL
+        assert sum(1 for state in self._cells.values() if state == MockState.FULL) == 1
+
+        self._cells[location] = MockState.EMPTY
+        assert not self._cells.words.any()
+
+    def test_values_order(self):
+        cells = CellBlock(self._size)
+        for (i, xyz) in enumerate(cells):
+            state = MockState.FULL if i % 7 == 0 else MockState.EMPTY
+            cells[xyz] = state
+
+        self._cells.update(cells)
+
+        assert list(self._cells.values()) == list(cells.values())
+
+    def test_resize(self):
+        self._cells[(69, 2, 1)] = MockState.FULL
+        self._cells.resize((140, 4, 3), (1, 1, 1))
+
+        assert self._cells.words.shape == (3, 4, 3)
+        assert self._cells[(70, 3, 2)] == MockState.FULL
+        assert self._cells.unpack().sum() == 1
@@ -0,0 +1,57 @@
+import pytest
+
+from conway3d.conway import ConwayCellState
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from conway3d.engine import Cycle, CycleDetector, digest_cells
+
+
+def test_detector_finds_repeat():
+    detector = CycleDetector(4)
+
+    for (generation, digest) in enumerate([b'a', b'b', b'c']):
+        assert detector.record(generation, digest) is None
+
+    assert detector.record(3, b'b') == 1
+
+
+def test_detector_forgets_old_generations():
+    detector = CycleDetector(2)
+
+    for (generation, digest) in enumerate([b'a', b'b', b'c']):
+        detector.record(generation, digest)
+
+    assert len(detector) == 2
+    assert detector.record(3, b'a') is None
+
+
+def test_cycle_phase():
+    cycle = Cycle(5, 3, 10)
+
+    assert [cycle.phase_of(g) for g in (2, 5, 7, 8, 12)] == [2, 5, 7, 5, 6]
+    assert not cycle.still_life
+    assert not cycle.extinct
+    assert Cycle(4, 1, 0).extinct
+
+
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_digest_follows_states(block_type):
+    size = (3, 4, 5)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+
+    for xyz in cells:
+        cells[xyz] = ConwayCellState.DEAD
+
+    empty = digest_cells(cells)
+    cells[(1, 2, 3)] = ConwayCellState.ALIVE
+
+    assert digest_cells(cells) != empty
+    assert digest_cells(cells.copy()) == digest_cells(cells)
+
+
+def test_detector_entries():
+    detector = CycleDetector(2)
+
+    for (generation, digest) in enumerate([b'a', b'b', b'c']):
+        detector.record(generation, digest)
+
+    assert detector.entries == [(1, b'b'), (2, b'c')]
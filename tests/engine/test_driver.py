@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
 
-from conway3d.datamodel import CellBlock, IVector, cubic_neighbor_model
-from ..mocks.mock_driver import MockDriver
+from conway3d.datamodel import (CellBlock, DenseCellBlock, IVector, PackedCellBlock,
+                                cubic_neighbor_model)
+from conway3d.engine import Boundary, CellDriver, SlabExecutor
+from ..mocks import MockDriver, MockState, skewed_neighbor_model
 
 class TestDriver:
     @pytest.fixture(autouse=True)
@@ -53,3 +56,160 @@ class TestDriver:
         driver.populate()
 
         assert driver.density == expected
+
+
+@pytest.mark.parametrize('size', [(4, 4, 4), (3, 3, 3), (3, 4, 5)])
+def test_dense_block_matches_cell_block(size: IVector):
+    cells = CellBlock(size)
+    driver = MockDriver(cells)
+    driver.populate()
+
+    dense = DenseCellBlock(size, MockState)
+    dense_driver = MockDriver(dense)
+    dense_driver.populate()
+
+    assert dense_driver.population == driver.population
+    assert list(dense.values()) == list(cells.values())
+    assert all(
+        dense_driver.get_neighbor_count(xyz) == driver.get_neighbor_count(xyz) for xyz in cells
+    )
+
+
+def test_custom_neighbor_model():
+    size = (5, 4, 3)
+    cells = DenseCellBlock(size, MockState)
+    driver = MockDriver(cells, skewed_neighbor_model)
+    driver.populate()
+    counts = driver.count_neighbors(cells.array == MockState.FULL.value)
+
+    for (x, y, z) in cells:
+        assert set(driver.get_neighbor_locations((x, y, z))) == {
+            xyz for xyz in skewed_neighbor_model((x, y, z)) if xyz in cells}
+        assert counts[z, y, x] == driver.get_neighbor_count((x, y, z))
+
+
+def test_neighbor_query_does_not_compile_table():
+    cells = DenseCellBlock((64, 64, 64), MockState)
+    driver = MockDriver(cells)
+
+    assert set(driver.get_neighbor_locations((0, 0, 0))) == {
+        xyz for xyz in cubic_neighbor_model((0, 0, 0)) if xyz in cells}
+    assert driver.get_neighbor_count((0, 0, 0)) == 0
+    assert driver._table is None
+
+
+def test_per_cell_step_compiles_table_for_models_without_offsets():
+    cells = CellBlock((5, 4, 3))
+    driver = MockDriver(cells, skewed_neighbor_model)
+    driver.populate()
+    expected = {xyz: driver.get_neighbor_locations(xyz) for xyz in cells}
+
+    assert driver._table is None
+    driver.next_generation()
+
+    assert driver._table is not None
+    assert all(driver.get_neighbor_locations(xyz) == expected[xyz] for xyz in cells)
+
+
+class ShiftDriver(MockDriver):
+    """Moves every cell one step along x, wrapping around, so each next state depends on a
+    neighbor's current state."""
+
+    def next_state(self, location: IVector, cells: CellBlock) -> MockState:
+        x, y, z = location
+        return cells[((x - 1) % cells.size[0], y, z)]
+
+
+@pytest.mark.parametrize('make_block', [
+    lambda size: CellBlock(size),
+    lambda size: DenseCellBlock(size, MockState),
+])
+def test_next_generation_double_buffers(make_block, monkeypatch: pytest.MonkeyPatch):
+    size = (5, 3, 2)
+    cells = make_block(size)
+    driver = ShiftDriver(cells)
+    driver.populate()
+    before = {xyz: cells[xyz] for xyz in cells}
+    population = driver.population
+    monkeypatch.setattr(type(cells), 'copy', lambda self: pytest.fail('The block was copied.'))
+
+    for generation in range(1, 4):
+        driver.next_generation()
+
+        assert driver.cells is cells
+        assert driver.population == population
+        assert all(
+            cells[xyz] == before[((xyz[0] - generation) % size[0], xyz[1], xyz[2])]
+            for xyz in cells
+        )
+
+    # Births, deaths and changed cells are still reported through the observer.
+    assert driver.history.births[-1] > 0
+    assert driver.changed.size == driver.history.births[-1] + driver.history.deaths[-1]
+
+
+class ParityDriver(MockDriver):
+    """Fills every cell with an odd number of neighbors, one cell at a time."""
+
+    def next_state(self, location: IVector, cells: CellBlock) -> MockState:
+        odd = self.get_neighbor_count(location, cells) % 2
+        return MockState.FULL if odd else MockState.EMPTY
+
+
+class BatchParityDriver(ParityDriver):
+    """``ParityDriver`` with a batch hook that counts the cells it steps."""
+
+    def __init__(self, cells: CellBlock, executor: SlabExecutor | None = None):
+        CellDriver.__init__(self, cells, cubic_neighbor_model, MockState.EMPTY, Boundary.FIXED,
+                            executor)
+        self.batched = 0
+
+    def next_states(self, counts: np.ndarray, states: np.ndarray, start: int = 0) -> np.ndarray:
+        self.batched += states.size
+        return (counts % 2).astype(np.uint8)
+
+
+def seed_cells(cells: CellBlock, driver: CellDriver):
+    rng = np.random.default_rng(3)
+    for xyz in cells:
+        cells[xyz] = MockState.FULL if rng.random() < 0.3 else MockState.EMPTY
+
+    driver.start_history()
+
+
+@pytest.mark.parametrize('make_block', [
+    lambda size: DenseCellBlock(size, MockState),
+    lambda size: PackedCellBlock(size, MockState),
+])
+@pytest.mark.parametrize('workers', [None, 2])
+def test_next_states_matches_next_state(make_block, workers: int | None):
+    size = (6, 5, 4)
+    expected = CellBlock(size)
+    reference = ParityDriver(expected)
+    seed_cells(expected, reference)
+
+    cells = make_block(size)
+    executor = None if workers is None else SlabExecutor(workers)
+    driver = BatchParityDriver(cells, executor)
+    seed_cells(cells, driver)
+
+    for _ in range(3):
+        reference.next_generation()
+        driver.next_generation()
+
+        assert list(cells.values()) == list(expected.values())
+        assert driver.population == reference.population
+        assert np.array_equal(driver.changed, reference.changed)
+        assert driver.history.births[-1] == reference.history.births[-1]
+
+    assert driver.batched == 3 * cells.capacity
+
+
+def test_next_states_falls_back_to_next_state():
+    cells = CellBlock((4, 4, 4))
+    driver = BatchParityDriver(cells)
+    seed_cells(cells, driver)
+    driver.next_generation()
+
+    assert driver.batched == 0
+    assert driver.generation == 1
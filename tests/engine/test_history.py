@@ -0,0 +1,36 @@
+import numpy as np
+
+from conway3d.engine import PopulationHistory
+
+
+def test_append_grows():
+    history = PopulationHistory(capacity=2)
+
+    for generation in range(5):
+        history.append(generation, generation * 10, generation, 1)
+
+    assert len(history) == 5
+    assert history.rows.shape == (5, 4)
+    assert history.generations.tolist() == [0, 1, 2, 3, 4]
+    assert history.population.tolist() == [0, 10, 20, 30, 40]
+    assert history.births.tolist() == [0, 1, 2, 3, 4]
+    assert np.all(history.deaths == 1)
+
+
+def test_clear():
+    history = PopulationHistory()
+    history.append(0, 5, 0, 0)
+    history.clear()
+
+    assert len(history) == 0
+    assert history.rows.shape == (0, 4)
+
+
+def test_extend_grows():
+    history = PopulationHistory(capacity=2)
+    history.append(0, 5, 0, 0)
+    history.extend(np.array([[1, 6, 2, 1], [2, 4, 0, 2], [3, 4, 1, 1]]))
+
+    assert len(history) == 4
+    assert history.generations.tolist() == [0, 1, 2, 3]
+    assert history.population.tolist() == [5, 6, 4, 4]
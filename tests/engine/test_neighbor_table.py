@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from conway3d.datamodel import (IVector, cubic_neighbor_model, simple_neighbor_model,
+                                von_neumann_neighbor_model)
+from conway3d.engine import Boundary, NeighborTable, count_neighbors, neighbor_offsets
+from ..mocks import skewed_neighbor_model
+
+
+def brute_force_neighbors(model, size: IVector, boundary: Boundary) -> list[set[int]]:
+    sx, sy, sz = size
+    rows = []
+    for z in range(sz):
+        for y in range(sy):
+            for x in range(sx):
+                row = set()
+                for (nx, ny, nz) in model((x, y, z)):
+                    if boundary == Boundary.TOROIDAL:
+                        nx, ny, nz = nx % sx, ny % sy, nz % sz
+                    elif not ((0 <= nx < sx) and (0 <= ny < sy) and (0 <= nz < sz)):
+                        continue
+                    row.add((nz * sy + ny) * sx + nx)
+                rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('model', [cubic_neighbor_model, simple_neighbor_model,
+                                   skewed_neighbor_model])
+@pytest.mark.parametrize('boundary', [Boundary.FIXED, Boundary.TOROIDAL])
+def test_compile(model, boundary: Boundary):
+    size = (5, 4, 3)
+    table = NeighborTable.compile(model, size, boundary)
+    expected = brute_force_neighbors(model, size, boundary)
+
+    assert table.indptr.dtype == table.indices.dtype == np.int32
+    assert [set(table.neighbors_of(i).tolist()) for i in range(len(expected))] == expected
+
+
+@pytest.mark.parametrize('model', [cubic_neighbor_model, von_neumann_neighbor_model(2)])
+@pytest.mark.parametrize('boundary', [Boundary.FIXED, Boundary.TOROIDAL])
+def test_count_matches_stencil(model, boundary: Boundary):
+    size = (7, 6, 5)
+    occupied = np.random.default_rng(1).random((5, 6, 7)) < 0.4
+    table = NeighborTable.compile(model, size, boundary)
+
+    assert np.array_equal(
+        table.count(occupied), count_neighbors(occupied, neighbor_offsets(model), boundary))
+
+
+def test_von_neumann_radius():
+    assert set(neighbor_offsets(von_neumann_neighbor_model(1))) == set(
+        simple_neighbor_model((0, 0, 0)))
+    assert len(neighbor_offsets(von_neumann_neighbor_model(2))) == 24
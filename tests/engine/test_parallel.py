@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from conway3d.engine import SlabExecutor, halo_slab
+
+
+@pytest.mark.parametrize('workers, depth', [(1, 5), (3, 10), (4, 2), (8, 8)])
+def test_slabs_cover_depth(workers: int, depth: int):
+    slabs = SlabExecutor(workers).slabs(depth)
+
+    assert len(slabs) == min(workers, depth)
+    assert slabs[0][0] == 0 and slabs[-1][1] == depth
+    assert all(a[1] == b[0] for (a, b) in zip(slabs, slabs[1:]))
+
+
+def test_map_runs_every_slab():
+    seen = np.zeros(10, dtype=int)
+
+    def fill(start: int, stop: int):
+        seen[start:stop] += 1
+
+    with SlabExecutor(3) as executor:
+        executor.map(fill, 10)
+
+    assert seen.tolist() == [1] * 10
+
+
+@pytest.mark.parametrize(
+    'start, stop, toroidal, rows, row',
+    [
+        (0, 2, False, [0, 1, 2], 0),
+        (2, 4, False, [1, 2, 3, 4], 1),
+        (4, 6, False, [3, 4, 5], 1),
+        (0, 2, True, [5, 0, 1, 2], 1),
+        (4, 6, True, [3, 4, 5, 0], 1),
+    ]
+)
+def test_halo_slab(start: int, stop: int, toroidal: bool, rows: list[int], row: int):
+    array = np.arange(6)
+    halo, index = halo_slab(array, start, stop, 1, toroidal)
+
+    assert halo.tolist() == rows
+    assert index == row
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from conway3d.engine import CounterRandom
+
+
+@pytest.mark.parametrize('seed, generation, stream', [(0, 0, 0), (42, 7, 1), (2 ** 64 - 1, 3, 5)])
+def test_scalar_matches_array(seed: int, generation: int, stream: int):
+    rng = CounterRandom(seed)
+    values = rng.random(generation, np.arange(200), stream)
+
+    assert values.dtype == np.float64
+    assert values.tolist() == [rng.random_at(generation, i, stream) for i in range(200)]
+
+
+def test_partition_independent():
+    rng = CounterRandom(9)
+    whole = rng.random(4, np.arange(1000))
+    parts = np.concatenate([rng.random(4, np.arange(a, b)) for (a, b) in [(0, 3), (3, 600),
+                                                                            (600, 1000)]])
+
+    assert np.array_equal(whole, parts)
+
+
+def test_keys_change_values():
+    rng = CounterRandom(1)
+    base = rng.random(0, np.arange(100))
+
+    assert np.array_equal(base, CounterRandom(1).random(0, np.arange(100)))
+    assert not np.array_equal(base, CounterRandom(2).random(0, np.arange(100)))
+    assert not np.array_equal(base, rng.random(1, np.arange(100)))
+    assert not np.array_equal(base, rng.random(0, np.arange(100), 1))
+
+
+def test_distribution():
+    values = CounterRandom(3).random(0, np.arange(100_000))
+
+    assert values.min() >= 0.0 and values.max() < 1.0
+    assert abs(values.mean() - 0.5) < 0.01
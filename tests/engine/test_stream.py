@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+import pytest
+
+from conway3d.conway import BasicConwayDriver, ConwayCellState
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from conway3d.engine import drain, pipeline, prefetch, tap
+
+
+def make_driver(block_type=DenseCellBlock) -> BasicConwayDriver:
+    size = (8, 7, 6)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    driver = BasicConwayDriver(cells, probability=0.3, rule='2-6/5/2/M', seed=8)
+    driver.populate()
+
+    return driver
+
+
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_matches_next_generation(block_type):
+    expected = make_driver(block_type)
+    generations = [generation.detach() for generation in make_driver(block_type).run(5)]
+
+    assert [generation.number for generation in generations] == [0, 1, 2, 3, 4, 5]
+
+    for generation in generations:
+        assert list(generation.cells.values()) == list(expected.cells.values())
+        assert generation.population == expected.population
+        assert generation.births == expected.history.births[-1]
+        assert generation.deaths == expected.history.deaths[-1]
+        expected.next_generation()
+
+
+@pytest.mark.parametrize('block_type', [DenseCellBlock, PackedCellBlock])
+def test_views_are_shared_and_read_only(block_type):
+    driver = make_driver(block_type)
+    generation = next(driver.iter_generations())
+    storage = driver.cells.array if block_type is DenseCellBlock else driver.cells.words
+
+    assert np.shares_memory(generation.array, storage)
+    assert not generation.array.flags.writeable
+    assert generation.ordinals().shape == (6, 7, 8)
+
+    detached = generation.detach()
+    assert detached.detached
+    assert not np.shares_memory(detached.array, storage)
+
+
+def test_is_lazy():
+    driver = make_driver()
+    seen = []
+    stream = pipeline(driver.iter_generations(), lambda generations: tap(generations, seen.append))
+
+    for (i, generation) in zip(range(3), stream):
+        assert driver.generation == generation.number == i
+
+    assert [generation.number for generation in seen] == [0, 1, 2]
+
+
+def test_prefetch_matches_serial():
+    expected = [generation.ordinals().copy() for generation in make_driver().run(10)]
+    actual = [generation.ordinals() for generation in prefetch(make_driver().run(10), depth=3)]
+
+    assert len(actual) == len(expected)
+    assert all(np.array_equal(a, b) for (a, b) in zip(actual, expected))
+
+
+def test_prefetch_applies_backpressure():
+    driver = make_driver()
+    produced = threading.Semaphore(0)
+    stream = prefetch(tap(driver.iter_generations(), lambda _: produced.release()), depth=2)
+
+    assert next(stream).number == 0
+    # After the first generation, the producer fills the queue and holds one more while it waits.
+    for _ in range(4):
+        assert produced.acquire(timeout=5)
+    assert not produced.acquire(timeout=0.2)
+
+    stream.close()
+    assert driver.generation <= 3
+
+
+def test_prefetch_raises_errors():
+    def failing(generations):
+        for generation in generations:
+            if generation.number == 2:
+                raise RuntimeError('stage failed')
+            yield generation
+
+    with pytest.raises(RuntimeError):
+        drain(prefetch(failing(make_driver().iter_generations())))
+
+
+def test_drain():
+    driver = make_driver()
+
+    assert drain(driver.run(4)).number == 4
+    assert driver.generation == 4
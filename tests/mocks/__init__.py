@@ -1 +1,2 @@
 from .mock_driver import MockState, MockDriver
+from .mock_neighbors import skewed_neighbor_model
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from conway3d.datamodel import CellBlock, IVector, cubic_neighbor_model
+from conway3d.datamodel import CellBlock, IVector, NeighborModel, cubic_neighbor_model
 from conway3d.engine import CellDriver
 
 
@@ -11,8 +11,11 @@ class MockState(Enum):
 
 class MockDriver(CellDriver):
 
-    def __init__(self, cells: CellBlock[MockState]):
-        super().__init__(cells, cubic_neighbor_model, MockState.EMPTY)
+    def __init__(self,
+        cells: CellBlock[MockState],
+        neighbors: NeighborModel = cubic_neighbor_model
+    ):
+        super().__init__(cells, neighbors, MockState.EMPTY)
 
     def first_state(self, location: IVector, cells: CellBlock) -> MockState:
         """Even locations ((0, 0, 0), (2, 0, 0),...) are ``EMPTY``, odd
@@ -0,0 +1,7 @@
+from conway3d.datamodel import IVector
+
+
+def skewed_neighbor_model(location: IVector) -> list[IVector]:
+    """A model that is not translation invariant: cells see further along x as x grows."""
+    x, y, z = location
+    return [(x - 1, y, z), (x + 1 + x % 2, y, z), (x, y + 1, z), (x, y, z - 1)]
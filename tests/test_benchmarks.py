@@ -0,0 +1,38 @@
+from benchmarks.harness import Case, compare, measure, run_cases
+
+
+def counting_case(name: str = 'count') -> Case:
+    def setup():
+        calls = []
+
+        def step():
+            calls.append(bytearray(1024))
+            return {'calls': len(calls)}
+
+        return step
+
+    return Case('test', name, {'size': 4}, setup)
+
+
+def test_measure():
+    result = measure(counting_case(), steps=5, budget=10)
+
+    assert result['key'] == 'test.count[size=4]'
+    assert result['steps'] == 5
+    assert result['rate'] > 0
+    assert result['p50_ms'] <= result['p99_ms'] <= result['max_ms']
+    assert result['peak_memory'] >= 2 * 1024
+    # The warm-up step is not counted in the mean.
+    assert result['calls'] == 4
+
+
+def test_compare():
+    baseline = run_cases([counting_case('a'), counting_case('b')], steps=3, budget=1)
+    current = run_cases([counting_case('a'), counting_case('c')], steps=3, budget=1)
+    current['results'][0]['rate'] = baseline['results'][0]['rate'] * 0.5
+
+    rows = compare(baseline, current, threshold=0.1)
+
+    assert [row['key'] for row in rows] == ['test.a[size=4]']
+    assert rows[0]['regressed']
+    assert not compare(baseline, baseline)[0]['regressed']
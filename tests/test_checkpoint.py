@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from conway3d.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from conway3d.conway import (BasicConwayDriver, ConwayCellState, SparseConwayDriver,
+                            UncertainConwayDriver)
+from conway3d.datamodel import DenseCellBlock, PackedCellBlock
+from conway3d.engine import Boundary
+
+
+def make_driver(driver_type, block_type, seed: int):
+    cells = block_type((8, 7, 6), ConwayCellState)
+    options = dict(probability=0.2, rule='4-6/6/2/M', seed=seed)
+
+    if driver_type is UncertainConwayDriver:
+        return driver_type(cells, uncertainty=0.05, **options)
+    if driver_type is SparseConwayDriver:
+        return driver_type(cells, boundary=Boundary.UNBOUNDED, **options)
+
+    return driver_type(cells, **options)
+
+
+@pytest.mark.parametrize('driver_type, block_type', [
+    (BasicConwayDriver, DenseCellBlock), (BasicConwayDriver, PackedCellBlock),
+    (SparseConwayDriver, DenseCellBlock), (UncertainConwayDriver, DenseCellBlock),
+    (UncertainConwayDriver, PackedCellBlock),
+])
+def test_resume_matches_uninterrupted_run(tmp_path, driver_type, block_type):
+    driver = make_driver(driver_type, block_type, seed=5)
+    driver.populate()
+    for _ in range(6):
+        driver.next_generation()
+
+    path = tmp_path / 'run.ckpt'
+    save_checkpoint(path, driver.snapshot())
+    resumed = make_driver(driver_type, block_type, seed=99)
+    resumed.restore(load_checkpoint(path))
+
+    assert resumed.generation == 6
+    assert resumed.seed == 5
+    assert resumed.population == driver.population
+    assert resumed.changed is None
+
+    for _ in range(30):
+        driver.next_generation()
+        resumed.next_generation()
+
+    assert resumed.cells.size == driver.cells.size
+    assert list(resumed.cells.values()) == list(driver.cells.values())
+    assert np.array_equal(resumed.history.rows, driver.history.rows)
+    assert resumed.cycle == driver.cycle
+    assert resumed.parameters() == driver.parameters()
+
+
+def test_restore_rejects_other_drivers():
+    basic = make_driver(BasicConwayDriver, DenseCellBlock, seed=1)
+    basic.populate()
+    snapshot = basic.snapshot()
+
+    with pytest.raises(ValueError):
+        make_driver(SparseConwayDriver, DenseCellBlock, seed=1).restore(snapshot)
+
+    with pytest.raises(ValueError):
+        BasicConwayDriver(DenseCellBlock((8, 7, 6), ConwayCellState), rule='5/5/2/M').restore(
+            snapshot)
+
+
+def test_checkpointer(tmp_path):
+    driver = make_driver(BasicConwayDriver, DenseCellBlock, seed=2)
+    driver.populate()
+    path = tmp_path / 'run.ckpt'
+
+    with Checkpointer(driver, path, interval=4) as checkpointer:
+        started = []
+        for _ in range(10):
+            driver.next_generation()
+            started.append(checkpointer.update())
+
+        checkpointer.flush()
+        assert started == [False, False, False, True, False, False, False, True, False, False]
+        assert checkpointer.written == 8
+
+    assert load_checkpoint(path)['generation'] == 8
+    assert [p.name for p in tmp_path.iterdir()] == ['run.ckpt']
+
+
+def test_checkpointer_raises_errors(tmp_path):
+    driver = make_driver(BasicConwayDriver, DenseCellBlock, seed=2)
+    driver.populate()
+    checkpointer = Checkpointer(driver, tmp_path / 'missing' / 'run.ckpt', interval=1)
+    checkpointer.save()
+
+    with pytest.raises(FileNotFoundError):
+        checkpointer.flush()
+
+    checkpointer.close()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conway3d.cli import main, parse_rule, parse_size
+from conway3d.conway import BasicConwayDriver, ConwayCellState, cell_states
+from conway3d.datamodel import DenseCellBlock
+from conway3d.trajectory import TrajectoryReader
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.mark.parametrize('text, expected', [('8', (8, 8, 8)), ('4x5x6', (4, 5, 6))])
+def test_parse_size(text: str, expected):
+    assert parse_size(text) == expected
+
+
+@pytest.mark.parametrize('text', ['4/4/1/M', '4/4/2/Q', '4/4'])
+def test_parse_rule_rejects(text: str):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_rule(text)
+
+
+def test_invalid_rule_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main([str(tmp_path / 'run.c3dt'), '--rule', '4/4/2/Q'])
+
+    assert exit.value.code == 2
+    assert 'Invalid rule' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('option', [['--block', 'packed'], ['--driver', 'sparse']])
+def test_decay_rule_needs_dense_driver(tmp_path, capsys, option):
+    with pytest.raises(SystemExit) as exit:
+        main([str(tmp_path / 'run.c3dt'), '--rule', '4/4/6/M', *option])
+
+    assert exit.value.code == 2
+    assert 'only supports two-state rules' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('block', ['dense', 'packed'])
+def test_matches_driver(tmp_path, block: str):
+    path = tmp_path / 'run.c3dt'
+    main([str(path), '--size', '6x5x4', '--rule', '2-6/5/2/M', '--seed', '3', '--generations',
+          '4', '--block', block, '--quiet'])
+
+    driver = BasicConwayDriver(DenseCellBlock((6, 5, 4), ConwayCellState), rule='2-6/5/2/M',
+                               seed=3)
+    driver.populate()
+
+    with TrajectoryReader(path) as reader:
+        assert len(reader) == 5
+        assert reader.metadata['seed'] == 3
+        assert reader.metadata['rule'] == '2-6/5/2/M'
+
+        for ordinals in reader:
+            assert np.array_equal(ordinals, driver.cells.array)
+            driver.next_generation()
+
+
+def test_decay_rule(tmp_path):
+    path = tmp_path / 'run.c3dt'
+    main([str(path), '--size', '5', '--rule', '4/4/6/M', '--seed', '2', '--generations', '3',
+          '--quiet'])
+
+    driver = BasicConwayDriver(DenseCellBlock((5, 5, 5), cell_states(6)), rule='4/4/6/M', seed=2)
+    driver.populate()
+
+    with TrajectoryReader(path) as reader:
+        assert reader.states == 6
+
+        for ordinals in reader:
+            assert np.array_equal(ordinals, driver.cells.array)
+            driver.next_generation()
+
+    assert driver.cells.array.max() > 1
+
+
+def test_runs_without_blender(tmp_path):
+    path = tmp_path / 'run.c3dt'
+    # Blocking Blender's modules makes importing them fail, as it does outside Blender.
+    script = ("import sys, runpy; sys.modules['bpy'] = sys.modules['mathutils'] = None; "
+              "sys.argv = ['conway3d'] + sys.argv[1:]; "
+              "runpy.run_module('conway3d', run_name='__main__')")
+    subprocess.run([sys.executable, '-c', script, str(path), '-g', '2', '-w', '2', '-q'],
+                   cwd=ROOT, check=True)
+
+    with TrajectoryReader(path) as reader:
+        assert len(reader) == 3
+
+
+def test_resume(tmp_path):
+    options = ['--size', '6x5x4', '--rule', '2-6/5/2/M', '--seed', '3', '--quiet']
+    main([str(tmp_path / 'full.c3dt'), '--generations', '9'] + options)
+    main([str(tmp_path / 'first.c3dt'), '--generations', '4', '--checkpoint',
+          str(tmp_path / 'run.ckpt'), '--checkpoint-interval', '2'] + options)
+    main([str(tmp_path / 'rest.c3dt'), '--generations', '9', '--resume',
+          str(tmp_path / 'run.ckpt')] + options)
+
+    with TrajectoryReader(tmp_path / 'full.c3dt') as full:
+        with TrajectoryReader(tmp_path / 'rest.c3dt') as rest:
+            assert len(rest) == 6
+            assert rest.metadata['first_generation'] == 4
+
+            for (generation, ordinals) in enumerate(rest, start=4):
+                assert np.array_equal(ordinals, full.read(generation))
+
+
+def test_checkpoint_skips_the_starting_generation(tmp_path):
+    options = ['--size', '4', '--seed', '3', '--quiet', '--checkpoint-interval', '2']
+    checkpoint = tmp_path / 'run.ckpt'
+
+    main([str(tmp_path / 'none.c3dt'), '--generations', '0', '--checkpoint', str(checkpoint)]
+         + options)
+    assert not checkpoint.exists()
+
+    main([str(tmp_path / 'first.c3dt'), '--generations', '2', '--checkpoint', str(checkpoint)]
+         + options)
+    saved = checkpoint.stat().st_mtime_ns
+
+    main([str(tmp_path / 'rest.c3dt'), '--generations', '3', '--resume', str(checkpoint),
+          '--checkpoint', str(checkpoint)] + options)
+    assert checkpoint.stat().st_mtime_ns == saved
+
+
+def test_small_toroidal_grid_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main([str(tmp_path / 'run.c3dt'), '--size', '2x2x2', '--boundary', 'toroidal'])
+
+    assert exit.value.code == 2
+    assert 'at least 3 cells wide' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('option', [['--rule', '4/4/2/N'], ['--driver', 'uncertain']])
+def test_resume_mismatched_checkpoint(tmp_path, capsys, option):
+    options = ['--size', '4', '--seed', '3', '--quiet']
+    checkpoint = tmp_path / 'run.ckpt'
+    main([str(tmp_path / 'first.c3dt'), '--generations', '2', '--checkpoint', str(checkpoint),
+          '--checkpoint-interval', '2'] + options)
+
+    status = main([str(tmp_path / 'rest.c3dt'), '--resume', str(checkpoint)] + options + option)
+
+    assert status == 2
+    assert capsys.readouterr().err.startswith('python -m conway3d: error: cannot resume')
+
+
+def test_profile(tmp_path):
+    main([str(tmp_path / 'run.c3dt'), '--size', '4', '--generations', '3', '--quiet',
+          '--profile', str(tmp_path / 'trace.json')])
+
+    names = {event['name'] for event in
+             json.loads((tmp_path / 'trace.json').read_text())['traceEvents']}
+    assert {'driver.populate', 'driver.next_generation', 'cli.write'} <= names
@@ -0,0 +1,102 @@
+import csv
+import json
+
+import pytest
+
+from conway3d import profiling
+from conway3d.conway import BasicConwayDriver, ConwayCellState, SparseConwayDriver
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+
+
+def run_driver(driver_type=BasicConwayDriver, block_type=DenseCellBlock, generations: int = 3):
+    size = (6, 5, 4)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    driver = driver_type(cells, probability=0.3, rule='2-6/5/2/M', seed=4)
+    driver.populate()
+
+    for _ in range(generations):
+        driver.next_generation()
+
+    return driver
+
+
+def test_disabled_records_nothing():
+    profiler = profiling.Profiler()
+    run_driver()
+
+    assert profiling.active() is None
+    assert profiler.events == []
+    assert profiling.span('anything') is profiling.span('else')
+
+
+@pytest.mark.parametrize('driver_type, block_type', [
+    (BasicConwayDriver, DenseCellBlock), (BasicConwayDriver, CellBlock),
+    (SparseConwayDriver, DenseCellBlock),
+])
+def test_driver_spans(driver_type, block_type):
+    with profiling.profile() as profiler:
+        run_driver(driver_type, block_type)
+
+    assert profiling.active() is None
+    summary = profiler.summary()
+    # Overrides that call super() are only timed once.
+    assert summary['driver.populate']['count'] == 1
+    assert summary['driver.next_generation']['count'] == 3
+    assert summary['driver.changed']['count'] == 3
+
+    generations = profiler.by_generation()
+    assert list(generations) == [0, 1, 2, 3]
+    assert all('driver.next_generation' in generations[g] for g in (1, 2, 3))
+
+
+@pytest.mark.parametrize('driver_type, block_type', [
+    (BasicConwayDriver, DenseCellBlock), (BasicConwayDriver, PackedCellBlock),
+    (BasicConwayDriver, CellBlock), (SparseConwayDriver, DenseCellBlock),
+])
+def test_inner_spans_share_the_step_generation(driver_type, block_type):
+    with profiling.profile() as profiler:
+        run_driver(driver_type, block_type)
+
+    steps = [e for e in profiler.events if e['name'] == 'driver.next_generation']
+    assert [step['generation'] for step in steps] == [1, 2, 3]
+
+    for event in profiler.events:
+        for step in steps:
+            end = step['start_us'] + step['duration_us']
+            if event is not step and step['start_us'] <= event['start_us'] <= end:
+                assert event['generation'] == step['generation'], event['name']
+
+
+def test_nested_profiles_restore_the_outer_one():
+    with profiling.profile() as outer:
+        with profiling.profile() as inner:
+            profiling.count('inner')
+        profiling.count('outer')
+
+    assert [c['name'] for c in inner.counters] == ['inner']
+    assert [c['name'] for c in outer.counters] == ['outer']
+
+
+def test_exports(tmp_path):
+    with profiling.profile() as profiler:
+        run_driver()
+
+    profiler.write(tmp_path / 'trace.json')
+    trace = json.loads((tmp_path / 'trace.json').read_text())
+    phases = {event['ph'] for event in trace['traceEvents']}
+    assert phases == {'X', 'C'}
+    assert all(event['dur'] >= 0 for event in trace['traceEvents'] if event['ph'] == 'X')
+
+    profiler.write(tmp_path / 'profile.json', 'json')
+    report = json.loads((tmp_path / 'profile.json').read_text())
+    assert report['summary']['driver.next_generation']['count'] == 3
+    assert set(report['generations']) == {'0', '1', '2', '3'}
+
+    profiler.write(tmp_path / 'profile.csv', 'csv')
+    with open(tmp_path / 'profile.csv', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert {row['kind'] for row in rows} == {'span', 'counter'}
+    assert len(rows) == len(profiler.events) + len(profiler.counters)
+
+    with pytest.raises(ValueError):
+        profiler.write(tmp_path / 'profile.txt', 'txt')
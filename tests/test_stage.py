@@ -0,0 +1,41 @@
+import pytest
+
+from conway3d import Configuration
+from conway3d.stage import make_driver, record_animation
+
+
+@pytest.mark.parametrize('uncertainty, deterministic', [(0, True), (0.05, False)])
+def test_make_driver_uncertainty(monkeypatch, uncertainty, deterministic):
+    monkeypatch.setattr(Configuration, 'uncertainty', uncertainty)
+    driver = make_driver()
+
+    assert driver.deterministic is deterministic
+    assert driver.cells.size == Configuration.grid_size
+
+
+def test_record_animation_stops_at_cycle(monkeypatch):
+    monkeypatch.setattr(Configuration, 'uncertainty', 0)
+    monkeypatch.setattr(Configuration, 'seed', 3)
+    driver = make_driver()
+    driver.populate()
+    frames = range(0, 2000, 10)
+
+    timeline = record_animation(driver, frames, tuple(driver.state_type))
+
+    assert driver.cycle is not None
+    assert driver.generation < len(frames) - 1
+    assert timeline.frames[0] == 0
+
+
+@pytest.mark.parametrize('boundary', ['fixed', 'toroidal'])
+def test_make_driver_boundary(monkeypatch, boundary):
+    monkeypatch.setattr(Configuration, 'boundary', boundary)
+
+    assert make_driver().boundary.value == boundary
+
+
+def test_make_driver_rejects_unbounded(monkeypatch):
+    monkeypatch.setattr(Configuration, 'boundary', 'unbounded')
+
+    with pytest.raises(ValueError):
+        make_driver()
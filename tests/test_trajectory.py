@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+
+from conway3d.conway import ConwayCellState
+from conway3d.datamodel import DenseCellBlock, PackedCellBlock
+from conway3d.trajectory import DELTA, KEYFRAME, TrajectoryReader, TrajectoryWriter
+
+
+def random_generations(states: int, count: int = 11) -> list[np.ndarray]:
+    rng = np.random.default_rng(1)
+    generations = [rng.integers(0, states, (4, 5, 6), dtype=np.uint8)]
+
+    for _ in range(count - 1):
+        flip = rng.random((4, 5, 6)) < 0.1
+        changed = rng.integers(0, states, (4, 5, 6), dtype=np.uint8)
+        generations.append(np.where(flip, changed, generations[-1]).astype(np.uint8))
+
+    return generations
+
+
+def write(path, generations: list[np.ndarray], states: int, interval: int = 4):
+    with TrajectoryWriter(path, (6, 5, 4), states, {'rule': '4-6/6/2/M', 'seed': 7},
+                          interval) as writer:
+        for ordinals in generations:
+            writer.write(ordinals)
+
+
+@pytest.mark.parametrize('states', [2, 5])
+def test_round_trip(tmp_path, states: int):
+    generations = random_generations(states)
+    path = tmp_path / 'run.c3dt'
+    write(path, generations, states)
+
+    with TrajectoryReader(path) as reader:
+        assert len(reader) == 11
+        assert reader.size == (6, 5, 4)
+        assert reader.keyframe_interval == 4
+        assert reader.metadata == {'rule': '4-6/6/2/M', 'seed': 7}
+        assert all(np.array_equal(a, b) for (a, b) in zip(reader, generations))
+
+
+@pytest.mark.parametrize('states', [2, 5])
+def test_reused_array(tmp_path, states: int):
+    generations = random_generations(states)
+    path = tmp_path / 'run.c3dt'
+    array = np.empty_like(generations[0])
+
+    # Drivers update one array in place, so the writer must not keep a reference to it.
+    with TrajectoryWriter(path, (6, 5, 4), states) as writer:
+        for ordinals in generations:
+            array[...] = ordinals
+            writer.write(array)
+
+    with TrajectoryReader(path) as reader:
+        assert all(np.array_equal(a, b) for (a, b) in zip(reader, generations))
+
+
+def test_seek(tmp_path):
+    generations = random_generations(2)
+    path = tmp_path / 'run.c3dt'
+    write(path, generations, 2)
+
+    with TrajectoryReader(path) as reader:
+        for generation in [7, 3, 9, 10, 0, 8, 5]:
+            assert np.array_equal(reader.read(generation), generations[generation])
+
+        with pytest.raises(IndexError):
+            reader.read(11)
+
+
+def test_keyframes_and_deltas(tmp_path):
+    path = tmp_path / 'run.c3dt'
+    write(path, random_generations(2), 2)
+
+    with TrajectoryReader(path) as reader:
+        kinds = [kind for (_, _, kind) in reader._index]
+
+    assert kinds == [KEYFRAME, DELTA, DELTA, DELTA] * 2 + [KEYFRAME, DELTA, DELTA]
+
+
+def test_unindexed(tmp_path):
+    generations = random_generations(3)
+    path = tmp_path / 'run.c3dt'
+    write(path, generations, 3)
+
+    # Cut the index off, as if the writer had not been closed.
+    with TrajectoryReader(path) as reader:
+        end = reader._index[-1][0] + reader._index[-1][1]
+    path.write_bytes(path.read_bytes()[:end])
+
+    with TrajectoryReader(path) as reader:
+        assert len(reader) == 11
+        assert np.array_equal(reader.read(10), generations[10])
+
+
+@pytest.mark.parametrize('block_type', [DenseCellBlock, PackedCellBlock])
+def test_cells(tmp_path, block_type):
+    source = DenseCellBlock((70, 2, 3), ConwayCellState)
+    source.array[...] = np.random.default_rng(2).random((3, 2, 70)) < 0.5
+    path = tmp_path / 'run.c3dt'
+
+    with TrajectoryWriter(path, source.size, 2) as writer:
+        writer.write_cells(source)
+
+    cells = block_type(source.size, ConwayCellState)
+    with TrajectoryReader(path) as reader:
+        reader.read_cells(0, cells)
+
+    assert list(cells.values()) == list(source.values())
+
+
+def test_rejects_wrong_size(tmp_path):
+    with TrajectoryWriter(tmp_path / 'run.c3dt', (2, 2, 2), 2) as writer:
+        with pytest.raises(ValueError):
+            writer.write(np.zeros((2, 2, 3), dtype=np.uint8))
+
+
+@pytest.mark.parametrize('length', [0, 5, 12, 20])
+def test_rejects_empty_and_truncated_files(tmp_path, length: int):
+    path = tmp_path / 'run.c3dt'
+    with TrajectoryWriter(path, (2, 2, 2), 2) as writer:
+        writer.write(np.zeros((2, 2, 2), dtype=np.uint8))
+    path.write_bytes(path.read_bytes()[:length])
+
+    with pytest.raises(ValueError, match='is not a conway3d trajectory'):
+        TrajectoryReader(path)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'run.c3dt'
+    path.write_bytes(b'not a trajectory file')
+
+    with pytest.raises(ValueError, match='is not a conway3d trajectory'):
+        TrajectoryReader(path)
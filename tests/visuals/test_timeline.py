@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from conway3d.conway import ConwayCellState
+from conway3d.datamodel import CellBlock, DenseCellBlock, PackedCellBlock
+from conway3d.visuals import StateTimeline, stream_cell_keys
+
+DEAD = ConwayCellState.DEAD
+ALIVE = ConwayCellState.ALIVE
+
+
+@pytest.mark.parametrize('block_type', [CellBlock, DenseCellBlock, PackedCellBlock])
+def test_encode(block_type):
+    size = (3, 2, 2)
+    cells = CellBlock(size) if block_type is CellBlock else block_type(size, ConwayCellState)
+    for xyz in cells:
+        cells[xyz] = DEAD
+    cells[(2, 1, 0)] = ALIVE
+    timeline = StateTimeline((ALIVE, DEAD))
+
+    assert timeline.encode(cells).tolist() == [1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1]
+
+
+def test_codes_at():
+    cells = DenseCellBlock((2, 1, 1), ConwayCellState)
+    timeline = StateTimeline(ConwayCellState)
+    timeline.record(10, cells)
+    cells[(0, 0, 0)] = ALIVE
+    timeline.record(20, cells)
+    timeline.record(0, DenseCellBlock((2, 1, 1), ConwayCellState))
+
+    assert timeline.frames == [0, 10, 20]
+    assert timeline.codes_at(-1) is None
+    assert timeline.codes_at(15).tolist() == [0, 0]
+    assert timeline.codes_at(25).tolist() == [1, 0]
+
+
+def test_cell_keys():
+    cells = DenseCellBlock((3, 1, 1), ConwayCellState)
+    timeline = StateTimeline(ConwayCellState)
+    history = [(DEAD, DEAD, ALIVE), (DEAD, DEAD, DEAD), (DEAD, ALIVE, ALIVE), (DEAD, DEAD, ALIVE)]
+
+    for (frame, states) in enumerate(history):
+        for (x, state) in enumerate(states):
+            cells[(x, 0, 0)] = state
+        timeline.record(frame * 10, cells)
+
+    keys = {cell: (frames.tolist(), codes.tolist()) for (cell, frames, codes) in
+            timeline.cell_keys()}
+
+    assert keys == {
+        0: ([0], [0]),
+        1: ([0, 10, 20, 30], [0, 0, 1, 0]),
+        2: ([0, 10, 20], [1, 0, 1]),
+    }
+    assert all(isinstance(frames, np.ndarray) for (_, frames, _) in timeline.cell_keys())
+
+
+def test_stream_cell_keys():
+    rng = np.random.default_rng(7)
+    cells = DenseCellBlock((5, 4, 3), ConwayCellState)
+    timeline = StateTimeline(ConwayCellState)
+    generations = []
+
+    for frame in range(0, 200, 10):
+        cells.array[...] = rng.random(cells.array.shape) < 0.2
+        timeline.record(frame, cells)
+        generations.append((frame, cells.array.copy()))
+
+    streamed = [(cell, frames.tolist(), codes.tolist()) for (cell, frames, codes) in
+                stream_cell_keys(iter(generations))]
+    recorded = [(cell, frames.tolist(), codes.tolist()) for (cell, frames, codes) in
+                timeline.cell_keys()]
+
+    assert streamed == recorded
+    assert len(streamed) == cells.capacity
+    assert list(stream_cell_keys([])) == []